@@ -0,0 +1,85 @@
+"""Benchmark: building price upsert records row by row (iterrows) vs whole columns (frame_records).
+
+Converts one asset's daily OHLCV history per history length, the work
+``PriceFetcher._upsert_prices`` does per asset before the COPY.
+
+Usage (from backend/):
+    python -m benchmarks.bench_frame_records
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import TRADING_DAYS, gbm_prices
+from src.app.services.data_pipeline.base import PRICE_COLUMNS, frame_records
+from src.app.services.data_pipeline.staging import price_staging
+
+HISTORY_YEARS = (5, 20)
+REPEATS = 3
+
+
+def _best_of(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _ohlcv(n_days: int) -> pd.DataFrame:
+    """yfinance-shaped daily bars around a GBM close, with a few missing opens."""
+    close = gbm_prices(n_days, 1)["S0"]
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Open": close * rng.uniform(0.99, 1.01, n_days),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, n_days).astype(np.float64),
+    })
+    frame.loc[frame.index[::50], "Open"] = np.nan
+    return frame
+
+
+def _iterrows(asset_id: int, df: pd.DataFrame) -> list[tuple]:
+    """The previous row-by-row conversion."""
+    records = []
+    for idx, row in df.iterrows():
+        records.append((
+            asset_id,
+            idx.date() if hasattr(idx, "date") else idx,
+            float(row.get("Open", 0)) if pd.notna(row.get("Open")) else None,
+            float(row.get("High", 0)) if pd.notna(row.get("High")) else None,
+            float(row.get("Low", 0)) if pd.notna(row.get("Low")) else None,
+            float(row["Close"]),
+            float(row.get("Adj Close", row["Close"])) if pd.notna(row.get("Adj Close", None)) else None,
+            int(row.get("Volume", 0)) if pd.notna(row.get("Volume")) else None,
+        ))
+    return records
+
+
+def _vectorized(asset_id: int, df: pd.DataFrame) -> list[tuple]:
+    return frame_records(
+        df, price_staging.columns, PRICE_COLUMNS, constants={"asset_id": asset_id},
+        integers=("volume",), required="close",
+    )
+
+
+def main() -> None:
+    for years in HISTORY_YEARS:
+        df = _ohlcv(years * TRADING_DAYS)
+        assert _iterrows(7, df) == _vectorized(7, df)
+
+        rows_s = _best_of(lambda: _iterrows(7, df))
+        columns_s = _best_of(lambda: _vectorized(7, df))
+
+        print(f"years={years} rows={len(df)}")
+        print(f"  iterrows:      {rows_s * 1000:8.1f} ms")
+        print(f"  frame_records: {columns_s * 1000:8.1f} ms  ({rows_s / columns_s:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: LTTB downsampling of a 10k-point series vs the textbook loop.
+
+The pick in each bucket depends on the previous bucket's pick, so
+``lttb_indices`` still visits buckets one at a time: its cost is O(n) setup
+plus a roughly constant few microseconds per output point.
+
+Usage (from backend/):
+    python -m benchmarks.bench_lttb
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import gbm_prices
+from src.app.services.downsampling import lttb_indices
+
+N_POINTS = 10_000
+TARGETS = (250, 1000)
+REPEATS = 50
+
+
+def _best_of(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _loop_lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Textbook LTTB: bucket means and triangle areas computed bucket by bucket."""
+    n = len(y)
+    n_buckets = max_points - 2
+    edges = (np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    keep = [0]
+    a = 0
+    for b in range(n_buckets):
+        lo, hi = edges[b], edges[b + 1]
+        if b == n_buckets - 1:
+            cx, cy = x[-1], y[-1]
+        else:
+            cx, cy = x[hi:edges[b + 2]].mean(), y[hi:edges[b + 2]].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep.append(a)
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+def main() -> None:
+    prices = gbm_prices(N_POINTS, 1)["S0"]
+    x = np.arange(N_POINTS, dtype=np.float64)
+    y = prices.to_numpy()
+
+    print(f"points={N_POINTS}")
+    for max_points in TARGETS:
+        assert (lttb_indices(y, max_points, x) == _loop_lttb(x, y, max_points)).all()
+        loop_s = _best_of(lambda m=max_points: _loop_lttb(x, y, m), repeats=5)
+        vec_s = _best_of(lambda m=max_points: lttb_indices(y, m, x))
+        print(f"  max_points={max_points}")
+        print(f"    loop:       {loop_s * 1000:8.3f} ms")
+        print(f"    vectorized: {vec_s * 1000:8.3f} ms  ({vec_s / max_points * 1e6:.1f} µs/point)")
+        print(f"    speedup:    {loop_s / vec_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
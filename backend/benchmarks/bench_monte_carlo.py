@@ -0,0 +1,50 @@
+"""Benchmark: Monte Carlo projection throughput (paths per second).
+
+Usage (from backend/):
+    python -m benchmarks.bench_monte_carlo
+"""
+
+import time
+
+import numpy as np
+
+from src.app.services.monte_carlo import project_bootstrap, project_parametric
+
+HORIZON_YEARS = 30
+PATH_COUNTS = (10_000, 100_000)
+BLOCK_DAYS = (20, 5)
+HISTORY_DAYS = 10 * 252
+REPEATS = 3
+
+
+def _best_of(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    log_returns = np.random.default_rng(0).normal(0.0003, 0.01, HISTORY_DAYS)
+
+    print(f"horizon_years={HORIZON_YEARS} history_days={HISTORY_DAYS}")
+    for n_paths in PATH_COUNTS:
+        elapsed = _best_of(lambda n=n_paths: project_parametric(0.06, 0.15, 1_000_000, HORIZON_YEARS, n, 0))
+        print(
+            f"  parametric           paths={n_paths:<7d} {elapsed * 1000:8.2f} ms  "
+            f"{n_paths / elapsed:12,.0f} paths/s"
+        )
+        for block_days in BLOCK_DAYS:
+            elapsed = _best_of(
+                lambda n=n_paths, b=block_days: project_bootstrap(log_returns, b, 1_000_000, HORIZON_YEARS, n, 0),
+            )
+            print(
+                f"  bootstrap block={block_days:<4d} paths={n_paths:<7d} {elapsed * 1000:8.2f} ms  "
+                f"{n_paths / elapsed:12,.0f} paths/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""Benchmark suite: optimizer strategies and backtest stages on synthetic data.
+
+Times every ``PortfolioOptimizer`` strategy (via ``solve_portfolio``), the
+risk-model estimate they share, and ``Backtester._simulate`` /
+``_compute_metrics`` over a grid of universe sizes and history lengths.
+Prices are correlated GBM (see synthetic.py), so no database is needed.
+
+Results are written as JSON (default ``benchmarks/results/<commit>[-factor].json``)
+so runs on different commits can be compared:
+
+Usage (from backend/):
+    python -m benchmarks.suite                         # full grid
+    python -m benchmarks.suite --quick                 # small grid for a smoke run
+    python -m benchmarks.suite --assets 25 500 --years 1 5 --cases optimizer.hrp
+    python -m benchmarks.suite --covariance factor     # low-rank factor risk model
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+
+``--compare`` prints the ratio against a baseline file for every case both
+runs measured and exits with status 1 if any is slower than ``--threshold``.
+Compare runs from the same machine only.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import TRADING_DAYS, gbm_prices
+from src.app.core.config import settings
+from src.app.services.backtester import REBALANCE_DAYS, Backtester
+from src.app.services.portfolio_optimizer import STRATEGY_NAMES, solve_portfolio
+from src.app.services.risk_model import RiskModel, estimate_factor_risk_model, estimate_risk_model
+
+UNIVERSE_SIZES = (25, 100, 500, 1000, 2000)
+HISTORY_YEARS = (1, 5, 10, 20)
+QUICK_UNIVERSE_SIZES = (25, 100)
+QUICK_HISTORY_YEARS = (1, 5)
+REPEATS = 3
+# A case whose first run takes longer than this is not repeated
+BUDGET_SECONDS = 30.0
+REGRESSION_THRESHOLD = 1.25
+RISK_FREE_RATE = 0.04
+INITIAL_INVESTMENT = 1_000_000
+RESULTS_DIR = Path(__file__).parent / "results"
+COVARIANCE_METHODS = ("ledoit_wolf", "factor")
+
+
+class Inputs:
+    """Everything the cases for one (assets, years) grid point need, built once."""
+
+    def __init__(self, n_assets: int, years: int, seed: int, covariance: str = "ledoit_wolf"):
+        self.prices = gbm_prices(years * TRADING_DAYS, n_assets, seed=seed)
+        self.covariance = covariance
+        self.symbols = self.prices.columns.tolist()
+        self.weights = dict.fromkeys(self.symbols, 1.0 / n_assets)
+        self.backtester = Backtester(session=None)
+        self._risk_model: RiskModel | None = None
+        self._portfolio_values: pd.Series | None = None
+
+    @property
+    def risk_model(self) -> RiskModel:
+        if self._risk_model is None:
+            self._risk_model = self.estimate()
+        return self._risk_model
+
+    @property
+    def portfolio_values(self) -> pd.Series:
+        if self._portfolio_values is None:
+            self._portfolio_values = self.simulate()
+        return self._portfolio_values
+
+    def prepare(self, cases: list[str]) -> None:
+        """Build the shared inputs ``cases`` consume, so that cost stays out of their timings."""
+        if any(case.startswith("optimizer.") for case in cases):
+            _ = self.risk_model
+        if "backtest.compute_metrics" in cases:
+            _ = self.portfolio_values
+
+    def estimate(self) -> RiskModel:
+        prices = self.prices.to_numpy(dtype=np.float64)
+        if self.covariance == "factor":
+            return estimate_factor_risk_model(prices, self.symbols, settings.FACTOR_MODEL_FACTORS)
+        return estimate_risk_model(prices, self.symbols)
+
+    def simulate(self) -> pd.Series:
+        return self.backtester._simulate(self.prices, self.weights, INITIAL_INVESTMENT, REBALANCE_DAYS["monthly"])
+
+
+# ------------------------------------------------------------------ #
+#  Cases: name -> function(inputs) returning an optional note
+# ------------------------------------------------------------------ #
+
+
+def _estimate_risk_model(inputs: Inputs) -> None:
+    inputs.estimate()
+
+
+def _strategy_case(strategy: str) -> Callable[[Inputs], str | None]:
+    def run(inputs: Inputs) -> str | None:
+        used, _, _ = solve_portfolio(strategy, inputs.risk_model, RISK_FREE_RATE, None)
+        # solve_portfolio falls back to equal weight on failure; a fast fallback is not a speedup
+        return f"fell back to {used}" if used != strategy else None
+
+    return run
+
+
+def _simulate(inputs: Inputs) -> None:
+    inputs.simulate()
+
+
+def _compute_metrics(inputs: Inputs) -> None:
+    inputs.backtester._compute_metrics(inputs.portfolio_values, INITIAL_INVESTMENT)
+
+
+CASES: dict[str, Callable[[Inputs], str | None]] = {
+    "risk_model.estimate": _estimate_risk_model,
+    **{f"optimizer.{strategy}": _strategy_case(strategy) for strategy in STRATEGY_NAMES},
+    "backtest.simulate": _simulate,
+    "backtest.compute_metrics": _compute_metrics,
+}
+
+
+# ------------------------------------------------------------------ #
+#  Running
+# ------------------------------------------------------------------ #
+
+
+def _time(func: Callable[[], str | None], repeats: int, budget: float) -> tuple[list[float], str | None]:
+    timings = []
+    note = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        note = func()
+        timings.append(time.perf_counter() - start)
+        if timings[0] > budget:
+            break
+    return timings, note
+
+
+def run_suite(
+    universe_sizes: tuple[int, ...],
+    history_years: tuple[int, ...],
+    cases: list[str],
+    repeats: int = REPEATS,
+    budget: float = BUDGET_SECONDS,
+    seed: int = 0,
+    covariance: str = "ledoit_wolf",
+    log: Callable[[str], None] = print,
+) -> list[dict]:
+    """Time ``cases`` on every (assets, years) grid point; one record per case and point."""
+    records = []
+    for n_assets in universe_sizes:
+        for years in history_years:
+            inputs = Inputs(n_assets, years, seed, covariance)
+            inputs.prepare(cases)
+
+            for case in cases:
+                timings, note = _time(lambda c=case: CASES[c](inputs), repeats, budget)
+                record = {
+                    "case": case,
+                    "covariance": covariance,
+                    "assets": n_assets,
+                    "years": years,
+                    "days": len(inputs.prices),
+                    "best_s": min(timings),
+                    "median_s": statistics.median(timings),
+                    "runs": len(timings),
+                    "note": note,
+                }
+                records.append(record)
+                log(
+                    f"{case:28s} assets={n_assets:<5d} years={years:<3d} "
+                    f"{record['best_s'] * 1000:10.2f} ms{f'  ({note})' if note else ''}"
+                )
+    return records
+
+
+def _git_revision() -> tuple[str, bool]:
+    """(short commit hash, whether the work tree has uncommitted changes), or ("unknown", False)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+
+def build_report(records: list[dict], repeats: int, seed: int) -> dict:
+    commit, dirty = _git_revision()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "repeats": repeats,
+        "seed": seed,
+        "results": records,
+    }
+
+
+# ------------------------------------------------------------------ #
+#  Comparison
+# ------------------------------------------------------------------ #
+
+
+def compare(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list[dict]:
+    """Current/baseline best-time ratio for every (case, assets, years) in both reports."""
+    def key(record: dict) -> tuple:
+        return record["case"], record.get("covariance", "ledoit_wolf"), record["assets"], record["years"]
+
+    before = {key(r): r for r in baseline["results"]}
+    rows = []
+    for record in current["results"]:
+        previous = before.get(key(record))
+        if previous is None or previous["best_s"] <= 0:
+            continue
+        ratio = record["best_s"] / previous["best_s"]
+        rows.append({
+            "case": record["case"],
+            "assets": record["assets"],
+            "years": record["years"],
+            "baseline_s": previous["best_s"],
+            "current_s": record["best_s"],
+            "ratio": ratio,
+            "regression": ratio > threshold,
+        })
+    return rows
+
+
+def _print_comparison(rows: list[dict], baseline: dict, current: dict) -> None:
+    print(f"\nbaseline {baseline['commit']} -> current {current['commit']}{' (dirty)' if current['dirty'] else ''}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['case']:28s} assets={row['assets']:<5d} years={row['years']:<3d} "
+            f"{row['baseline_s'] * 1000:10.2f} -> {row['current_s'] * 1000:10.2f} ms  "
+            f"x{row['ratio']:.2f}{flag}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, nargs="+", help=f"universe sizes (default {UNIVERSE_SIZES})")
+    parser.add_argument("--years", type=int, nargs="+", help=f"history lengths in years (default {HISTORY_YEARS})")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--quick", action="store_true", help="small grid for a fast smoke run")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS, help="don't repeat cases slower than this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--covariance", choices=COVARIANCE_METHODS, default="ledoit_wolf")
+    parser.add_argument("--output", type=Path, help="JSON output path (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    universe_sizes = tuple(args.assets or (QUICK_UNIVERSE_SIZES if args.quick else UNIVERSE_SIZES))
+    history_years = tuple(args.years or (QUICK_HISTORY_YEARS if args.quick else HISTORY_YEARS))
+
+    records = run_suite(
+        universe_sizes, history_years, args.cases, args.repeats, args.budget, args.seed, args.covariance,
+    )
+    report = build_report(records, args.repeats, args.seed)
+
+    suffix = ("-dirty" if report["dirty"] else "") + ("-factor" if args.covariance == "factor" else "")
+    output = args.output or RESULTS_DIR / f"{report['commit']}{suffix}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        rows = compare(baseline, report, args.threshold)
+        _print_comparison(rows, baseline, report)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
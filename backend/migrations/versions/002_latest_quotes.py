@@ -0,0 +1,52 @@
+"""latest quotes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "latest_quotes",
+        sa.Column("asset_id", sa.BigInteger(), nullable=False),
+        sa.Column("close", sa.Numeric(18, 6), nullable=False),
+        sa.Column("previous_close", sa.Numeric(18, 6), nullable=True),
+        sa.Column("change_pct", sa.Float(), nullable=True),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("asset_id"),
+        sa.ForeignKeyConstraint(["asset_id"], ["assets.id"], ondelete="CASCADE"),
+    )
+
+    # Backfill from existing prices
+    op.execute(
+        """
+        INSERT INTO latest_quotes (asset_id, close, previous_close, change_pct, as_of)
+        SELECT asset_id, close, previous_close,
+               CASE WHEN previous_close > 0
+                    THEN ((close - previous_close) / previous_close)::double precision END,
+               date
+        FROM (
+            SELECT asset_id, date, close,
+                   LEAD(close) OVER (PARTITION BY asset_id ORDER BY date DESC) AS previous_close,
+                   ROW_NUMBER() OVER (PARTITION BY asset_id ORDER BY date DESC) AS rn
+            FROM asset_prices
+        ) ranked
+        WHERE rn = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("latest_quotes")
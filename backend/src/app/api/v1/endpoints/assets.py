@@ -2,11 +2,12 @@
 
 import math
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.core.database import get_db
-from src.app.crud.asset import get_asset_by_symbol, get_asset_prices, get_assets, get_latest_price, get_previous_price
+from src.app.crud.asset import get_asset_by_symbol, get_asset_prices, get_assets, get_latest_quotes
 from src.app.schemas.asset import (
     AssetPriceResponse,
     AssetPricesResponse,
@@ -14,6 +15,7 @@ from src.app.schemas.asset import (
     LatestPrice,
     PaginatedAssetResponse,
 )
+from src.app.services.downsampling import lttb_indices
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
@@ -32,16 +34,14 @@ async def list_assets(
     """Get paginated list of assets with optional filters."""
     assets, total = await get_assets(db, market=market, asset_type=asset_type, search=search, page=page, per_page=per_page)
 
+    quotes = await get_latest_quotes(db, [asset.id for asset in assets])
+
     items = []
     for asset in assets:
-        latest = await get_latest_price(db, asset.id)
+        quote = quotes.get(asset.id)
         latest_price = None
-        if latest:
-            prev = await get_previous_price(db, asset.id, latest.date)
-            change_pct = None
-            if prev and prev.close:
-                change_pct = float((latest.close - prev.close) / prev.close)
-            latest_price = LatestPrice(close=float(latest.close), date=latest.date, change_pct=change_pct)
+        if quote:
+            latest_price = LatestPrice(close=float(quote.close), date=quote.as_of, change_pct=quote.change_pct)
 
         items.append(
             AssetResponse(
@@ -71,6 +71,7 @@ async def get_prices(
     symbol: str,
     period: str = Query("1y", description="Period (1m/3m/6m/1y/3y/5y/max)"),
     interval: str = Query("daily", description="Interval (daily/weekly/monthly)"),
+    max_points: int | None = Query(None, ge=3, le=5000, description="Downsample to at most this many points (LTTB)"),
     db: AsyncSession = Depends(get_db),
 ):
     response.headers["Cache-Control"] = "public, max-age=3600"  # 1h
@@ -80,6 +81,10 @@ async def get_prices(
         raise HTTPException(status_code=404, detail=f"Asset {symbol} not found")
 
     prices = await get_asset_prices(db, asset.id, period=period, interval=interval)
+    if max_points is not None and len(prices) > max_points:
+        closes = np.fromiter((p.close for p in prices), dtype=np.float64, count=len(prices))
+        days = np.fromiter((p.date.toordinal() for p in prices), dtype=np.float64, count=len(prices))
+        prices = [prices[i] for i in lttb_indices(closes, max_points, days)]
 
     return AssetPricesResponse(
         symbol=symbol,
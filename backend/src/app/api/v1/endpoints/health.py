@@ -2,9 +2,11 @@
 
 from fastapi import APIRouter
 
+from src.app.services.compute_executor import compute_executor
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health_check():
-    return {"status": "ok", "service": "portfolio-advisor-api"}
+    return {"status": "ok", "service": "portfolio-advisor-api", "compute": compute_executor.stats()}
@@ -1,48 +1,73 @@
-"""Portfolio endpoints — generate, backtest, explain (all stateless)."""
+"""Portfolio endpoints — generate, compare, frontier, backtest, simulate, explain (all stateless)."""
 
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.app.core.database import get_db
-from src.app.schemas.backtest import BacktestRequest, BacktestResponse
+from src.app.core.cache import SingleFlight, canonical_key
+from src.app.core.database import get_db, get_session_factory
+from src.app.schemas.backtest import (
+    BacktestBatchRequest,
+    BacktestBatchResponse,
+    BacktestRequest,
+    BacktestResponse,
+)
 from src.app.schemas.portfolio import (
     ExplainRequest,
     ExplainResponse,
+    FrontierRequest,
+    FrontierResponse,
+    PortfolioCompareRequest,
+    PortfolioCompareResponse,
     PortfolioGenerateRequest,
     PortfolioResponse,
 )
+from src.app.schemas.simulation import SimulationRequest, SimulationResponse
 from src.app.services.ai_advisor import AIAdvisor
 from src.app.services.backtester import Backtester
+from src.app.services.compute_executor import ComputeTimeoutError
 from src.app.services.portfolio_optimizer import PortfolioOptimizer
+from src.app.services.simulator import PortfolioSimulator
 from src.app.services.usage_tracker import UsageTracker
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/portfolios", tags=["portfolios"])
 
+COMPUTE_BUSY_DETAIL = "サーバーが混雑しています。しばらく時間をおいて再度お試しください。"
+
+# Identical concurrent requests (e.g. every client loading the same screen)
+# share one DB load and solve per worker
+request_flights = SingleFlight()
+
+
+async def _coalesced(endpoint: str, request, compute, session_factory: async_sessionmaker):
+    """Run ``compute(session, request)`` once for all concurrent identical requests.
+
+    The shared call opens its own session from ``session_factory``: it may
+    outlive the request that started it while other identical requests are
+    still waiting on it.
+    """
+    async def run():
+        async with session_factory() as session:
+            return await compute(session, request)
+
+    return await request_flights.run(canonical_key(endpoint, request.model_dump(mode="json")), run)
+
 
 @router.post("/generate", response_model=PortfolioResponse)
 async def generate_portfolio(
     request: PortfolioGenerateRequest,
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     """Generate an optimised portfolio. Stateless — nothing is stored in DB."""
-    optimizer = PortfolioOptimizer(db)
     try:
-        result = await optimizer.optimize(
-            risk_score=request.risk_score,
-            risk_tolerance=request.risk_tolerance,
-            investment_horizon=request.investment_horizon,
-            strategy=request.strategy,
-            investment_amount=request.investment_amount,
-            currency=request.currency,
-            constraints=request.constraints.model_dump() if request.constraints else None,
-        )
-        return result
+        return await _coalesced("generate", request, _generate, session_factory)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
     except Exception as e:
         logger.exception("Portfolio generation failed")
         raise HTTPException(
@@ -51,23 +76,58 @@ async def generate_portfolio(
         ) from e
 
 
+@router.post("/compare", response_model=PortfolioCompareResponse)
+async def compare_portfolios(
+    request: PortfolioCompareRequest,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """Generate one portfolio per strategy over a single data load. Stateless."""
+    try:
+        return await _coalesced("compare", request, _compare, session_factory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
+    except Exception as e:
+        logger.exception("Portfolio comparison failed")
+        raise HTTPException(
+            status_code=500,
+            detail="ポートフォリオの生成に失敗しました。しばらく時間をおいて再度お試しください。",
+        ) from e
+
+
+@router.post("/frontier", response_model=FrontierResponse)
+async def efficient_frontier(
+    request: FrontierRequest,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """Trace the efficient frontier of the selected universe. Stateless."""
+    try:
+        return await _coalesced("frontier", request, _frontier, session_factory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
+    except Exception as e:
+        logger.exception("Efficient frontier failed")
+        raise HTTPException(
+            status_code=500,
+            detail="効率的フロンティアの計算に失敗しました。しばらく時間をおいて再度お試しください。",
+        ) from e
+
+
 @router.post("/backtest", response_model=BacktestResponse)
 async def backtest_portfolio(
     request: BacktestRequest,
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     """Run a historical backtest on the given allocations. Stateless."""
-    backtester = Backtester(db)
     try:
-        result = await backtester.run(
-            allocations=[a.model_dump() for a in request.allocations],
-            period_years=request.period_years,
-            initial_investment=request.initial_investment,
-            rebalance_frequency=request.rebalance_frequency,
-        )
-        return result
+        return await _coalesced("backtest", request, _backtest, session_factory)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
     except Exception as e:
         logger.exception("Backtest failed")
         raise HTTPException(
@@ -76,6 +136,46 @@ async def backtest_portfolio(
         ) from e
 
 
+@router.post("/backtest/batch", response_model=BacktestBatchResponse)
+async def backtest_portfolios_batch(
+    request: BacktestBatchRequest,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """Backtest several allocation sets over one shared price load. Stateless."""
+    try:
+        return await _coalesced("backtest/batch", request, _backtest_batch, session_factory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
+    except Exception as e:
+        logger.exception("Batch backtest failed")
+        raise HTTPException(
+            status_code=500,
+            detail="バックテストの実行に失敗しました。しばらく時間をおいて再度お試しください。",
+        ) from e
+
+
+@router.post("/simulate", response_model=SimulationResponse)
+async def simulate_portfolio(
+    request: SimulationRequest,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """Project the allocation's future value with Monte Carlo paths. Stateless."""
+    try:
+        return await _coalesced("simulate", request, _simulate, session_factory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=503, detail=COMPUTE_BUSY_DETAIL) from e
+    except Exception as e:
+        logger.exception("Simulation failed")
+        raise HTTPException(
+            status_code=500,
+            detail="シミュレーションの実行に失敗しました。しばらく時間をおいて再度お試しください。",
+        ) from e
+
+
 @router.post("/explain", response_model=ExplainResponse)
 async def explain_portfolio(
     request: ExplainRequest,
@@ -108,3 +208,79 @@ async def explain_portfolio(
             status_code=500,
             detail="ポートフォリオの説明生成に失敗しました。",
         ) from e
+
+
+# ------------------------------------------------------------------ #
+#  Shared computations (own session, see _coalesced)
+# ------------------------------------------------------------------ #
+
+async def _generate(session: AsyncSession, request: PortfolioGenerateRequest) -> dict:
+    return await PortfolioOptimizer(session).optimize(
+        risk_score=request.risk_score,
+        risk_tolerance=request.risk_tolerance,
+        investment_horizon=request.investment_horizon,
+        strategy=request.strategy,
+        investment_amount=request.investment_amount,
+        currency=request.currency,
+        constraints=request.constraints.model_dump() if request.constraints else None,
+        covariance_method=request.covariance_method,
+    )
+
+
+async def _compare(session: AsyncSession, request: PortfolioCompareRequest) -> dict:
+    portfolios = await PortfolioOptimizer(session).compare(
+        risk_score=request.risk_score,
+        risk_tolerance=request.risk_tolerance,
+        investment_horizon=request.investment_horizon,
+        strategies=request.strategies,
+        investment_amount=request.investment_amount,
+        currency=request.currency,
+        constraints=request.constraints.model_dump() if request.constraints else None,
+        covariance_method=request.covariance_method,
+    )
+    return {"portfolios": portfolios}
+
+
+async def _frontier(session: AsyncSession, request: FrontierRequest) -> dict:
+    return await PortfolioOptimizer(session).frontier(
+        risk_tolerance=request.risk_tolerance,
+        n_points=request.n_points,
+        constraints=request.constraints.model_dump() if request.constraints else None,
+        covariance_method=request.covariance_method,
+    )
+
+
+async def _backtest(session: AsyncSession, request: BacktestRequest) -> dict:
+    return await Backtester(session).run(
+        allocations=[a.model_dump() for a in request.allocations],
+        period_years=request.period_years,
+        initial_investment=request.initial_investment,
+        rebalance_frequency=request.rebalance_frequency,
+        max_points=request.max_points,
+    )
+
+
+async def _backtest_batch(session: AsyncSession, request: BacktestBatchRequest) -> dict:
+    return await Backtester(session).run_batch(
+        portfolios=[
+            {"label": p.label, "allocations": [a.model_dump() for a in p.allocations]}
+            for p in request.portfolios
+        ],
+        period_years=request.period_years,
+        initial_investment=request.initial_investment,
+        rebalance_frequency=request.rebalance_frequency,
+    )
+
+
+async def _simulate(session: AsyncSession, request: SimulationRequest) -> dict:
+    return await PortfolioSimulator(session).run(
+        allocations=[a.model_dump() for a in request.allocations],
+        initial_investment=request.initial_investment,
+        horizon_years=request.horizon_years,
+        n_paths=request.n_paths,
+        method=request.method,
+        history_years=request.history_years,
+        block_days=request.block_days,
+        covariance_method=request.covariance_method,
+        seed=request.seed,
+    )
@@ -60,6 +60,18 @@ async def _update_indicators():
         await coordinator.update_indicators()
 
 
+@app.command()
+def update_covariance(rebuild: bool = typer.Option(False, help="Replay the full price history")):
+    """Fold new prices into the incremental covariance state."""
+    asyncio.run(_update_covariance(rebuild))
+
+
+async def _update_covariance(rebuild: bool):
+    async with async_session() as session:
+        coordinator = PipelineCoordinator(session)
+        await coordinator.update_covariance(rebuild=rebuild)
+
+
 @app.command()
 def seed():
     """Seed database with initial asset data."""
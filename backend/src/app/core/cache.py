@@ -0,0 +1,169 @@
+"""In-process caches shared across requests within a worker."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry when full."""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value (marking it recently used) or ``None``."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+def canonical_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable parts; dict key order doesn't matter."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one in-flight task.
+
+    The first caller for a key (the leader) starts ``func()`` as a task;
+    callers arriving while it runs (followers) await the same task and get
+    the same result or exception. Nothing is kept once it finishes, so this
+    caps duplicate work during a burst without serving anything stale.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for ``key``, starting ``func()`` if there is none.
+
+        ``func`` may outlive the caller that started it (its followers still
+        need the result), so it must not depend on request-scoped resources
+        such as the request's DB session.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self.start(key, func)
+        else:
+            self.followers += 1
+        # shield: one caller disconnecting mustn't cancel the call the others are waiting on
+        return await asyncio.shield(task)
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start ``func()`` in the background as the call for ``key``, unless one is already running."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            task.add_done_callback(partial(self._finish, key))
+            self._tasks[key] = task
+            self.leaders += 1
+        return task
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._tasks), "leaders": self.leaders, "followers": self.followers}
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+
+class TTLCache:
+    """Async loader cache with a TTL, stale-while-revalidate and single-flight loads.
+
+    - younger than ``ttl``: served from memory
+    - up to ``stale_ttl`` past that: served stale while one background task reloads it
+    - older, or missing: the caller waits for a reload
+
+    Concurrent callers for the same key share one in-flight load, so at most
+    one of them hits the backing store per expiry.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._data: dict[Hashable, tuple[Any, float]] = {}
+        self._loads = SingleFlight()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the value for ``key``, calling ``loader()`` to (re)load it when due.
+
+        ``loader`` may run after the caller has returned (background
+        revalidation), so it must not depend on request-scoped resources
+        such as the request's DB session.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._loads.start(key, partial(self._load, key, loader))
+                return value
+
+        self.misses += 1
+        return await self._loads.run(key, partial(self._load, key, loader))
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop ``key`` (or every entry) so the next call reloads it."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            logger.warning(f"Cache load failed: {e!r}")
+            raise
+        self._data[key] = (value, time.monotonic())
+        return value
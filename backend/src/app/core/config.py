@@ -31,6 +31,45 @@ class Settings(BaseSettings):
     DAILY_TOKEN_BUDGET: int = 100000
     MONTHLY_TOKEN_BUDGET: int = 2000000
 
+    # Price matrix store: how often API workers check the DB for new price rows
+    PRICE_STORE_REFRESH_SECONDS: int = 300
+
+    # Max cached /portfolios/generate results per worker (LRU)
+    OPTIMIZATION_CACHE_SIZE: int = 256
+
+    # Max cached expected-return/covariance estimates per worker (LRU); each
+    # holds a few assets × assets matrices
+    RISK_MODEL_CACHE_SIZE: int = 32
+
+    # Market summary/indicator cache: served fresh for TTL, then stale while one
+    # request per worker reloads it in the background
+    MARKET_CACHE_TTL_SECONDS: int = 900
+    MARKET_CACHE_STALE_SECONDS: int = 3600
+
+    # Risk parity: stop once every risk-contribution share is within the
+    # tolerance of 1/n, or after the iteration limit (Newton steps)
+    RISK_PARITY_TOLERANCE: float = 1e-8
+    RISK_PARITY_MAX_ITER: int = 50
+
+    # Covariance draws averaged by the resampled (Michaud) strategy
+    RESAMPLED_SAMPLES: int = 500
+
+    # Half-life (trading days) of the pipeline-maintained EWMA covariance
+    COVARIANCE_EWMA_HALFLIFE_DAYS: float = 60.0
+
+    # Statistical (PCA) factors in the covariance_method="factor" risk model
+    FACTOR_MODEL_FACTORS: int = 10
+
+    # Market data pipeline: symbols downloaded/upserted at once across all
+    # fetchers in a run, each on its own DB session (keep below the pool size)
+    PIPELINE_CONCURRENCY: int = 8
+    # Max symbols per multi-ticker yfinance download
+    PIPELINE_DOWNLOAD_BATCH_SIZE: int = 50
+
+    # Compute pool for CPU-bound optimization/simulation (0 = run inline)
+    COMPUTE_POOL_WORKERS: int = 2
+    COMPUTE_JOB_TIMEOUT_SECONDS: float = 30.0
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
@@ -22,3 +22,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that may outlive the request (e.g. a call shared by concurrent requests)."""
+    return async_session
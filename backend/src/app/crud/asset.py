@@ -2,11 +2,20 @@
 
 from datetime import date, timedelta
 
+import sqlalchemy as sa
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.models.asset import Asset
 from src.app.models.asset_price import AssetPrice
+from src.app.models.latest_quote import LatestQuote
+
+# interval -> date_trunc unit for server-side OHLC resampling
+RESAMPLE_UNITS = {
+    "weekly": "week",
+    "monthly": "month",
+}
 
 
 async def get_assets(
@@ -55,8 +64,14 @@ async def get_asset_prices(
     asset_id: int,
     period: str = "1y",
     interval: str = "daily",
-) -> list[AssetPrice]:
-    """Get price history for an asset."""
+) -> list:
+    """Get price history for an asset.
+
+    Daily rows are returned as-is. Weekly/monthly bars are aggregated in SQL
+    (first open, max high, min low, last close, summed volume) and dated by
+    the start of the week/month. All rows expose the same attributes as
+    AssetPrice (date, open, high, low, close, adj_close, volume).
+    """
     period_days = {
         "1m": 30,
         "3m": 90,
@@ -69,44 +84,53 @@ async def get_asset_prices(
     days = period_days.get(period, 365)
     start_date = date.today() - timedelta(days=days)
 
+    trunc_unit = RESAMPLE_UNITS.get(interval)
+    if trunc_unit is None:
+        result = await session.execute(
+            select(AssetPrice)
+            .where(AssetPrice.asset_id == asset_id, AssetPrice.date >= start_date)
+            .order_by(AssetPrice.date)
+        )
+        return list(result.scalars().all())
+
+    # Literal unit (from RESAMPLE_UNITS, never user input) so SELECT and GROUP BY render identically
+    unit = sa.literal_column(f"'{trunc_unit}'")
+    bucket = sa.cast(func.date_trunc(unit, sa.cast(AssetPrice.date, sa.DateTime)), sa.Date)
     query = (
-        select(AssetPrice)
+        select(
+            bucket.label("date"),
+            _first(AssetPrice.open).label("open"),
+            func.max(AssetPrice.high).label("high"),
+            func.min(AssetPrice.low).label("low"),
+            _last(AssetPrice.close).label("close"),
+            _last(AssetPrice.adj_close).label("adj_close"),
+            sa.cast(func.sum(AssetPrice.volume), sa.BigInteger).label("volume"),
+        )
         .where(AssetPrice.asset_id == asset_id, AssetPrice.date >= start_date)
-        .order_by(AssetPrice.date)
+        .group_by(bucket)
+        .order_by(bucket)
     )
+    result = await session.execute(query)
+    return list(result.all())
 
-    # Downsample for weekly/monthly
-    if interval == "weekly":
-        # Get all and sample every 5th
-        result = await session.execute(query)
-        prices = list(result.scalars().all())
-        return prices[::5] if prices else []
-    elif interval == "monthly":
-        result = await session.execute(query)
-        prices = list(result.scalars().all())
-        return prices[::22] if prices else []
 
-    result = await session.execute(query)
-    return list(result.scalars().all())
+def _first(column):
+    """First non-null value of ``column`` in the group, by date."""
+    return array_agg(aggregate_order_by(column, AssetPrice.date.asc())).filter(column.isnot(None))[1]
 
 
-async def get_latest_price(session: AsyncSession, asset_id: int) -> AssetPrice | None:
-    """Get the latest price for an asset."""
-    result = await session.execute(
-        select(AssetPrice)
-        .where(AssetPrice.asset_id == asset_id)
-        .order_by(AssetPrice.date.desc())
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
+def _last(column):
+    """Last non-null value of ``column`` in the group, by date."""
+    return array_agg(aggregate_order_by(column, AssetPrice.date.desc())).filter(column.isnot(None))[1]
 
 
-async def get_previous_price(session: AsyncSession, asset_id: int, before_date: date) -> AssetPrice | None:
-    """Get the price before a given date."""
-    result = await session.execute(
-        select(AssetPrice)
-        .where(AssetPrice.asset_id == asset_id, AssetPrice.date < before_date)
-        .order_by(AssetPrice.date.desc())
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
+async def get_latest_quotes(session: AsyncSession, asset_ids: list[int]) -> dict[int, LatestQuote]:
+    """Get latest quotes for many assets with one primary-key lookup.
+
+    Assets without any prices are omitted.
+    """
+    if not asset_ids:
+        return {}
+
+    result = await session.execute(select(LatestQuote).where(LatestQuote.asset_id.in_(asset_ids)))
+    return {quote.asset_id: quote for quote in result.scalars().all()}
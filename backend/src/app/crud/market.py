@@ -0,0 +1,43 @@
+"""CRUD operations for market data (economic indicators, index quotes)."""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.app.models.asset import Asset
+from src.app.models.economic_indicator import EconomicIndicator
+from src.app.models.latest_quote import LatestQuote
+
+INDICATOR_TYPES = ("us_treasury_10y", "jp_govt_bond_10y", "usd_jpy", "eur_jpy")
+
+
+async def get_latest_indicators(
+    session: AsyncSession, indicator_types: tuple[str, ...] = INDICATOR_TYPES,
+) -> dict[str, EconomicIndicator]:
+    """Latest row per indicator type, keyed by type, in one query (row_number() per type).
+
+    Types with no rows are absent from the result.
+    """
+    ranked = (
+        select(
+            EconomicIndicator,
+            func.row_number()
+            .over(partition_by=EconomicIndicator.indicator_type, order_by=EconomicIndicator.date.desc())
+            .label("rank"),
+        )
+        .where(EconomicIndicator.indicator_type.in_(indicator_types))
+        .subquery()
+    )
+    latest = aliased(EconomicIndicator, ranked)
+    result = await session.execute(select(latest).where(ranked.c.rank == 1))
+    return {ind.indicator_type: ind for ind in result.scalars().all()}
+
+
+async def get_latest_quotes_by_symbol(session: AsyncSession, symbols: list[str]) -> dict[str, LatestQuote]:
+    """Latest quotes for the given symbols, keyed by symbol. Symbols without a quote are absent."""
+    result = await session.execute(
+        select(Asset.symbol, LatestQuote)
+        .join(LatestQuote, LatestQuote.asset_id == Asset.id)
+        .where(Asset.symbol.in_(symbols))
+    )
+    return {symbol: quote for symbol, quote in result.all()}
@@ -2,7 +2,9 @@ from src.app.models.api_usage_log import ApiUsageLog
 from src.app.models.asset import Asset, AssetType, Market
 from src.app.models.asset_price import AssetPrice
 from src.app.models.base import Base
+from src.app.models.covariance_state import CovarianceState
 from src.app.models.economic_indicator import EconomicIndicator, IndicatorType
+from src.app.models.latest_quote import LatestQuote
 
 __all__ = [
     "ApiUsageLog",
@@ -10,7 +12,9 @@ __all__ = [
     "AssetPrice",
     "AssetType",
     "Base",
+    "CovarianceState",
     "EconomicIndicator",
     "IndicatorType",
+    "LatestQuote",
     "Market",
 ]
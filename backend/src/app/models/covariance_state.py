@@ -0,0 +1,20 @@
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.models.base import Base
+
+
+class CovarianceState(Base):
+    """Serialized incremental covariance state, maintained by the data pipeline."""
+
+    __tablename__ = "covariance_states"
+
+    name: Mapped[str] = mapped_column(sa.String(30), primary_key=True)
+    as_of: Mapped[date | None] = mapped_column(sa.Date, nullable=True)
+    n_assets: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(sa.LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now()
+    )
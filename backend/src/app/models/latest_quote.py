@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.models.base import Base
+
+
+class LatestQuote(Base):
+    """Latest and previous close per asset, maintained by the data pipeline."""
+
+    __tablename__ = "latest_quotes"
+
+    asset_id: Mapped[int] = mapped_column(
+        sa.BigInteger, sa.ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True
+    )
+    close: Mapped[Decimal] = mapped_column(sa.Numeric(18, 6), nullable=False)
+    previous_close: Mapped[Decimal | None] = mapped_column(sa.Numeric(18, 6), nullable=True)
+    change_pct: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
+    as_of: Mapped[date] = mapped_column(sa.Date, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now()
+    )
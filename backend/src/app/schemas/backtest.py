@@ -2,6 +2,12 @@
 
 from pydantic import BaseModel, Field
 
+# Upper bound on allocation sets per /portfolios/backtest/batch call
+MAX_BATCH_PORTFOLIOS = 50
+
+# Upper bound on chart points per backtest time series
+MAX_TIME_SERIES_POINTS = 5000
+
 
 # --- Request schemas ---
 
@@ -18,6 +24,22 @@ class BacktestRequest(BaseModel):
         default="quarterly",
         pattern="^(monthly|quarterly|annually|none)$",
     )
+    max_points: int = Field(default=250, ge=3, le=MAX_TIME_SERIES_POINTS)
+
+
+class BacktestBatchPortfolio(BaseModel):
+    label: str | None = None
+    allocations: list[BacktestAllocation] = Field(..., min_length=1)
+
+
+class BacktestBatchRequest(BaseModel):
+    portfolios: list[BacktestBatchPortfolio] = Field(..., min_length=1, max_length=MAX_BATCH_PORTFOLIOS)
+    period_years: int = Field(default=5, ge=1, le=20)
+    initial_investment: float = Field(default=1_000_000, gt=0)
+    rebalance_frequency: str = Field(
+        default="quarterly",
+        pattern="^(monthly|quarterly|annually|none)$",
+    )
 
 
 # --- Response schemas ---
@@ -73,3 +95,21 @@ class BacktestResponse(BaseModel):
         "バックテストは仮想的なシミュレーションであり、"
         "実際の取引コスト・税金は考慮されていません。"
     )
+
+
+class BacktestBatchResult(BaseModel):
+    label: str | None = None
+    period: BacktestPeriod
+    metrics: BacktestMetrics
+
+
+class BacktestBatchResponse(BaseModel):
+    period: BacktestPeriod
+    initial_investment: float
+    results: list[BacktestBatchResult]
+    benchmark_comparison: dict[str, BenchmarkResult] | None = None
+    disclaimer: str = (
+        "※ 過去のパフォーマンスは将来の結果を保証するものではありません。"
+        "バックテストは仮想的なシミュレーションであり、"
+        "実際の取引コスト・税金は考慮されていません。"
+    )
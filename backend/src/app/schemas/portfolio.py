@@ -1,7 +1,13 @@
 """Portfolio-related Pydantic schemas."""
 
+from typing import Annotated
+
 from pydantic import BaseModel, Field
 
+MAX_FRONTIER_POINTS = 100
+
+COMPARE_STRATEGIES = ["min_volatility", "hrp", "max_sharpe", "risk_parity", "equal_weight"]
+
 
 # --- Request schemas ---
 
@@ -19,6 +25,27 @@ class PortfolioGenerateRequest(BaseModel):
     investment_amount: int | None = None
     currency: str = "JPY"
     constraints: PortfolioConstraints | None = None
+    covariance_method: str = Field(default="ledoit_wolf", pattern="^(ledoit_wolf|ewma|factor)$")
+
+
+class PortfolioCompareRequest(BaseModel):
+    risk_score: int = Field(..., ge=1, le=10)
+    risk_tolerance: str = Field(..., pattern="^(conservative|moderate|aggressive)$")
+    investment_horizon: str = Field(..., pattern="^(short|medium|long)$")
+    strategies: list[
+        Annotated[str, Field(pattern="^(min_volatility|hrp|max_sharpe|risk_parity|equal_weight|resampled)$")]
+    ] = Field(default_factory=lambda: list(COMPARE_STRATEGIES), min_length=1)
+    investment_amount: int | None = None
+    currency: str = "JPY"
+    constraints: PortfolioConstraints | None = None
+    covariance_method: str = Field(default="ledoit_wolf", pattern="^(ledoit_wolf|ewma|factor)$")
+
+
+class FrontierRequest(BaseModel):
+    risk_tolerance: str = Field(..., pattern="^(conservative|moderate|aggressive)$")
+    n_points: int = Field(default=20, ge=2, le=MAX_FRONTIER_POINTS)
+    constraints: PortfolioConstraints | None = None
+    covariance_method: str = Field(default="ledoit_wolf", pattern="^(ledoit_wolf|ewma|factor)$")
 
 
 class AllocationInput(BaseModel):
@@ -74,5 +101,21 @@ class PortfolioResponse(BaseModel):
     currency: str
 
 
+class PortfolioCompareResponse(BaseModel):
+    portfolios: list[PortfolioResponse]
+
+
+class FrontierPoint(BaseModel):
+    expected_return: float
+    volatility: float
+    sharpe_ratio: float
+    weights: dict[str, float]
+
+
+class FrontierResponse(BaseModel):
+    risk_free_rate: float
+    points: list[FrontierPoint]
+
+
 class ExplainResponse(BaseModel):
     explanation: str
@@ -0,0 +1,56 @@
+"""Monte Carlo simulation Pydantic schemas."""
+
+from pydantic import BaseModel, Field
+
+from src.app.schemas.backtest import BacktestAllocation
+
+# Upper bound on simulated paths per /portfolios/simulate call
+MAX_SIMULATION_PATHS = 100_000
+
+
+# --- Request schemas ---
+
+class SimulationRequest(BaseModel):
+    allocations: list[BacktestAllocation] = Field(..., min_length=1)
+    initial_investment: float = Field(default=1_000_000, gt=0)
+    horizon_years: int = Field(default=10, ge=1, le=30)
+    n_paths: int = Field(default=10_000, ge=100, le=MAX_SIMULATION_PATHS)
+    method: str = Field(default="parametric", pattern="^(parametric|bootstrap)$")
+    history_years: int = Field(default=10, ge=1, le=20)
+    block_days: int = Field(default=20, ge=5, le=252)
+    covariance_method: str = Field(default="ledoit_wolf", pattern="^(ledoit_wolf|factor)$")
+    seed: int | None = Field(default=None, ge=0)
+
+
+# --- Response schemas ---
+
+class SimulationAssumptions(BaseModel):
+    expected_return: float
+    volatility: float
+    history_start: str
+    history_end: str
+
+
+class SimulationBand(BaseModel):
+    year: int
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+    mean: float
+    probability_of_loss: float
+
+
+class SimulationResponse(BaseModel):
+    method: str
+    n_paths: int
+    horizon_years: int
+    initial_investment: float
+    seed: int | None = None
+    assumptions: SimulationAssumptions
+    bands: list[SimulationBand]
+    disclaimer: str = (
+        "※ シミュレーションは過去データに基づく仮定から算出した将来の値動きの一例であり、"
+        "将来の結果を保証するものではありません。実際の取引コスト・税金は考慮されていません。"
+    )
@@ -0,0 +1,115 @@
+"""Vectorized portfolio value simulation for backtests.
+
+Pure NumPy, no pandas or DB access. The series is split at rebalance dates
+and each segment is computed with one cumulative product over a 2-D
+(days × assets) growth array, instead of a Python loop over every day.
+"""
+
+import numpy as np
+
+
+def rebalance_points(n_days: int, rebalance_interval: int) -> np.ndarray:
+    """Row indices after which holdings are reset to the target weights.
+
+    Matches the day-counting rule of the original loop: a rebalance happens
+    every ``rebalance_interval`` trading days, never on the final day.
+    """
+    if rebalance_interval <= 0:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(rebalance_interval, n_days - 1, rebalance_interval)
+
+
+def simulate_portfolio_values(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    initial_investment: float,
+    rebalance_interval: int,
+) -> np.ndarray:
+    """Simulate daily portfolio value with optional periodic rebalancing.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        (n_days, n_assets) simple daily returns. Row 0 is ignored; the
+        portfolio starts at ``initial_investment`` on that day.
+    weights : np.ndarray
+        (n_assets,) target weights, assumed to sum to 1.
+    initial_investment : float
+        Starting portfolio value.
+    rebalance_interval : int
+        Trading days between rebalances, 0 for buy-and-hold.
+
+    Returns
+    -------
+    np.ndarray of shape (n_days,) with the portfolio value per day.
+    """
+    n_days = returns.shape[0]
+    values = np.empty(n_days)
+    values[0] = initial_investment
+    if n_days < 2:
+        return values
+
+    growth = 1.0 + returns
+    holdings = initial_investment * weights
+    bounds = np.concatenate(([0], rebalance_points(n_days, rebalance_interval), [n_days - 1]))
+
+    for start, end in zip(bounds[:-1], bounds[1:], strict=True):
+        # Row 0 carries the holdings in, so the cumulative product applies
+        # each day's growth in the same order as a day-by-day loop would.
+        block = np.empty((end - start + 1, growth.shape[1]))
+        block[0] = holdings
+        block[1:] = growth[start + 1:end + 1]
+        np.cumprod(block, axis=0, out=block)
+
+        segment = block[1:].sum(axis=1)
+        values[start + 1:end + 1] = segment
+        holdings = segment[-1] * weights
+
+    return values
+
+
+def simulate_portfolio_values_batch(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    initial_investment: float,
+    rebalance_interval: int,
+) -> np.ndarray:
+    """Simulate many portfolios over the same returns matrix in one pass.
+
+    Each segment's cumulative growth is computed once for all assets and
+    shared by every portfolio, so a segment costs one (days × assets) @
+    (assets × portfolios) product regardless of how many portfolios there are.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        (n_days, n_assets) simple daily returns; row 0 is ignored.
+    weights : np.ndarray
+        (n_portfolios, n_assets) target weights, one row per portfolio.
+    initial_investment : float
+        Starting value of every portfolio.
+    rebalance_interval : int
+        Trading days between rebalances, 0 for buy-and-hold.
+
+    Returns
+    -------
+    np.ndarray of shape (n_days, n_portfolios). Matches
+    ``simulate_portfolio_values`` per column up to floating-point rounding.
+    """
+    n_days = returns.shape[0]
+    values = np.empty((n_days, weights.shape[0]))
+    values[0] = initial_investment
+    if n_days < 2:
+        return values
+
+    growth = 1.0 + returns
+    holdings = initial_investment * weights.T  # (n_assets, n_portfolios)
+    bounds = np.concatenate(([0], rebalance_points(n_days, rebalance_interval), [n_days - 1]))
+
+    for start, end in zip(bounds[:-1], bounds[1:], strict=True):
+        cum_growth = np.cumprod(growth[start + 1:end + 1], axis=0)
+        segment = cum_growth @ holdings
+        values[start + 1:end + 1] = segment
+        holdings = weights.T * segment[-1]
+
+    return values
@@ -4,6 +4,7 @@ Simulates portfolio performance over a given period with periodic rebalancing.
 Computes standard risk/return metrics and benchmark comparisons.
 """
 
+import asyncio
 import logging
 from datetime import date, timedelta
 
@@ -14,6 +15,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.models.asset import Asset
 from src.app.models.asset_price import AssetPrice
+from src.app.services.backtest_engine import simulate_portfolio_values, simulate_portfolio_values_batch
+from src.app.services.compute_executor import compute_executor
+from src.app.services.downsampling import lttb_indices
+from src.app.services.price_store import price_store
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,9 @@ REBALANCE_DAYS = {
     "none": 0,
 }
 
+# Default number of time-series points returned for charting
+DEFAULT_MAX_POINTS = 250
+
 
 class Backtester:
     """Historical backtest simulator."""
@@ -43,6 +51,7 @@ class Backtester:
         period_years: int = 5,
         initial_investment: float = 1_000_000,
         rebalance_frequency: str = "quarterly",
+        max_points: int = DEFAULT_MAX_POINTS,
     ) -> dict:
         """Execute a historical backtest.
 
@@ -56,6 +65,8 @@ class Backtester:
             Starting portfolio value.
         rebalance_frequency : str
             One of "monthly", "quarterly", "annually", "none".
+        max_points : int
+            Upper bound on the number of points in ``time_series``.
 
         Returns
         -------
@@ -81,14 +92,13 @@ class Backtester:
         w_total = sum(weights[s] for s in available)
         norm_weights = {s: weights[s] / w_total for s in available}
 
-        # Forward-fill and drop leading NaN rows
-        prices_df = prices_df[available].ffill().dropna()
+        prices_df = self._portfolio_prices(prices_df, available)
         if len(prices_df) < 2:
             raise ValueError("バックテスト期間の価格データが不足しています。")
 
         # --- Portfolio value simulation ---
         rebalance_interval = REBALANCE_DAYS.get(rebalance_frequency, 90)
-        portfolio_values = self._simulate(
+        portfolio_values = await self._simulate_in_pool(
             prices_df, norm_weights, initial_investment, rebalance_interval,
         )
 
@@ -98,8 +108,8 @@ class Backtester:
         # --- Benchmark comparison ---
         benchmark_comparison = await self._compute_benchmarks(start_date, end_date, period_years)
 
-        # --- Time series (sampled for reasonable payload size) ---
-        time_series = self._build_time_series(portfolio_values, initial_investment)
+        # --- Time series (downsampled for reasonable payload size) ---
+        time_series = self._build_time_series(portfolio_values, initial_investment, max_points)
 
         # --- Annual returns ---
         annual_returns = self._compute_annual_returns(portfolio_values)
@@ -120,6 +130,110 @@ class Backtester:
             "annual_returns": annual_returns,
         }
 
+    async def run_batch(
+        self,
+        portfolios: list[dict],
+        period_years: int = 5,
+        initial_investment: float = 1_000_000,
+        rebalance_frequency: str = "quarterly",
+    ) -> dict:
+        """Backtest many allocation sets against one shared price matrix.
+
+        Parameters
+        ----------
+        portfolios : list[dict]
+            Each item has "allocations" (list of {"symbol", "weight"}) and an
+            optional "label".
+        period_years, initial_investment, rebalance_frequency
+            Shared by every portfolio; same meaning as in ``run``.
+
+        Each portfolio is simulated on the same calendar ``run`` would use
+        for it alone (see ``_portfolio_prices``), so its metrics match a
+        single ``/backtest``. Portfolios over the same symbols share that
+        calendar and are simulated together in one matrix pass.
+
+        Returns
+        -------
+        dict matching BacktestBatchResponse schema.
+        """
+        symbols = list(dict.fromkeys(a["symbol"] for p in portfolios for a in p["allocations"]))
+
+        end_date = date.today()
+        start_date = end_date - timedelta(days=period_years * 365)
+
+        prices_df = await self._get_price_matrix(symbols, start_date, end_date)
+        if prices_df.empty or len(prices_df.columns) == 0:
+            raise ValueError("バックテストに必要な価格データが不足しています。")
+
+        available = [s for s in symbols if s in prices_df.columns]
+        if not available:
+            raise ValueError("価格データのある銘柄が見つかりませんでした。")
+
+        # Group portfolios by the symbols they hold (with price data)
+        groups: dict[tuple[str, ...], list[int]] = {}
+        for row, portfolio in enumerate(portfolios):
+            held = sorted({a["symbol"] for a in portfolio["allocations"]} & set(available))
+            if not held:
+                raise ValueError("価格データのある銘柄を含まないポートフォリオがあります。")
+            groups.setdefault(tuple(held), []).append(row)
+
+        rebalance_interval = REBALANCE_DAYS.get(rebalance_frequency, 90)
+        group_prices = {}
+        jobs = []
+        for held, rows in groups.items():
+            prices = self._portfolio_prices(prices_df, list(held))
+            if len(prices) < 2:
+                raise ValueError("バックテスト期間の価格データが不足しています。")
+            group_prices[held] = prices
+
+            # Weights matrix (portfolios × assets), re-normalised to available symbols
+            columns = {s: i for i, s in enumerate(held)}
+            weight_matrix = np.zeros((len(rows), len(held)))
+            for i, row in enumerate(rows):
+                for a in portfolios[row]["allocations"]:
+                    if a["symbol"] in columns:
+                        weight_matrix[i, columns[a["symbol"]]] = a["weight"]
+            totals = weight_matrix.sum(axis=1)
+            if (totals <= 0).any():
+                raise ValueError("価格データのある銘柄を含まないポートフォリオがあります。")
+            weight_matrix /= totals[:, None]
+
+            jobs.append(compute_executor.run(
+                simulate_portfolio_values_batch,
+                prices.pct_change().fillna(0).to_numpy(dtype=np.float64),
+                weight_matrix,
+                initial_investment,
+                rebalance_interval,
+            ))
+
+        results: list[dict] = [{} for _ in portfolios]
+        for (held, rows), values in zip(groups.items(), await asyncio.gather(*jobs), strict=True):
+            index = group_prices[held].index
+            for i, row in enumerate(rows):
+                pv = pd.Series(values[:, i], index=index)
+                results[row] = {
+                    "label": portfolios[row].get("label"),
+                    "period": {
+                        "start": index[0].strftime("%Y-%m-%d"),
+                        "end": index[-1].strftime("%Y-%m-%d"),
+                        "years": period_years,
+                    },
+                    "metrics": self._compute_metrics(pv, initial_investment),
+                }
+
+        benchmark_comparison = await self._compute_benchmarks(start_date, end_date, period_years)
+
+        return {
+            "period": {
+                "start": min(r["period"]["start"] for r in results),
+                "end": max(r["period"]["end"] for r in results),
+                "years": period_years,
+            },
+            "initial_investment": initial_investment,
+            "results": results,
+            "benchmark_comparison": benchmark_comparison,
+        }
+
     # ------------------------------------------------------------------ #
     #  Price data
     # ------------------------------------------------------------------ #
@@ -127,43 +241,25 @@ class Backtester:
     async def _get_price_matrix(
         self, symbols: list[str], start_date: date, end_date: date,
     ) -> pd.DataFrame:
-        """Build price DataFrame from DB for given symbols & date range."""
+        """Build price DataFrame for given symbols & date range from the shared price store."""
         # Map symbol → asset_id
         result = await self.session.execute(
-            select(Asset).where(Asset.symbol.in_(symbols)),
+            select(Asset.id, Asset.symbol).where(Asset.symbol.in_(symbols)),
         )
-        assets = result.scalars().all()
-        if not assets:
+        asset_id_map = dict(result.all())
+        if not asset_id_map:
             return pd.DataFrame()
 
-        asset_id_map = {a.id: a.symbol for a in assets}
+        return await price_store.get_prices(self.session, asset_id_map, start_date, end_date)
 
-        result = await self.session.execute(
-            select(AssetPrice)
-            .where(
-                AssetPrice.asset_id.in_(asset_id_map.keys()),
-                AssetPrice.date >= start_date,
-                AssetPrice.date <= end_date,
-            )
-            .order_by(AssetPrice.date),
-        )
-        prices = result.scalars().all()
+    @staticmethod
+    def _portfolio_prices(prices: pd.DataFrame, symbols: list[str]) -> pd.DataFrame:
+        """A portfolio's simulation calendar and prices.
 
-        if not prices:
-            return pd.DataFrame()
-
-        data: dict[str, dict] = {}
-        for p in prices:
-            sym = asset_id_map.get(p.asset_id)
-            if sym:
-                if sym not in data:
-                    data[sym] = {}
-                close = float(p.adj_close) if p.adj_close else float(p.close)
-                data[sym][p.date] = close
-
-        df = pd.DataFrame(data)
-        df.index = pd.to_datetime(df.index)
-        return df.sort_index()
+        Dates on which any of ``symbols`` traded, forward-filled, from the
+        first date all of them have a price.
+        """
+        return prices[symbols].dropna(how="all").ffill().dropna()
 
     # ------------------------------------------------------------------ #
     #  Simulation
@@ -177,31 +273,38 @@ class Backtester:
         rebalance_interval: int,
     ) -> pd.Series:
         """Simulate daily portfolio value with optional rebalancing."""
-        symbols = list(weights.keys())
-        daily_returns = prices[symbols].pct_change().fillna(0)
+        daily_returns, w_arr = self._simulation_inputs(prices, weights)
+        portfolio_value = simulate_portfolio_values(
+            daily_returns.to_numpy(dtype=np.float64), w_arr, initial_investment, rebalance_interval,
+        )
+        return pd.Series(portfolio_value, index=daily_returns.index)
 
-        n_days = len(daily_returns)
-        portfolio_value = np.empty(n_days)
-        portfolio_value[0] = initial_investment
+    async def _simulate_in_pool(
+        self,
+        prices: pd.DataFrame,
+        weights: dict[str, float],
+        initial_investment: float,
+        rebalance_interval: int,
+    ) -> pd.Series:
+        """Same as ``_simulate``, but runs the simulation on the compute pool."""
+        daily_returns, w_arr = self._simulation_inputs(prices, weights)
+        portfolio_value = await compute_executor.run(
+            simulate_portfolio_values,
+            daily_returns.to_numpy(dtype=np.float64),
+            w_arr,
+            initial_investment,
+            rebalance_interval,
+        )
+        return pd.Series(portfolio_value, index=daily_returns.index)
 
-        # Current allocation in monetary terms
+    def _simulation_inputs(
+        self, prices: pd.DataFrame, weights: dict[str, float],
+    ) -> tuple[pd.DataFrame, np.ndarray]:
+        """Daily returns (first row zero) and the weight vector, in ``weights`` order."""
+        symbols = list(weights.keys())
+        daily_returns = prices[symbols].pct_change().fillna(0)
         w_arr = np.array([weights[s] for s in symbols])
-        holdings = initial_investment * w_arr  # dollar value per asset
-
-        days_since_rebalance = 0
-
-        for i in range(1, n_days):
-            ret = daily_returns.iloc[i].values
-            holdings = holdings * (1 + ret)
-            total = holdings.sum()
-            portfolio_value[i] = total
-
-            days_since_rebalance += 1
-            if rebalance_interval > 0 and days_since_rebalance >= rebalance_interval:
-                holdings = total * w_arr
-                days_since_rebalance = 0
-
-        return pd.Series(portfolio_value, index=daily_returns.index)
+        return daily_returns, w_arr
 
     # ------------------------------------------------------------------ #
     #  Metrics
@@ -305,15 +408,15 @@ class Backtester:
     # ------------------------------------------------------------------ #
 
     def _build_time_series(
-        self, pv: pd.Series, initial: float,
+        self, pv: pd.Series, initial: float, max_points: int = DEFAULT_MAX_POINTS,
     ) -> list[dict]:
-        """Build time series for charting. Sample to ~250 points max."""
-        n = len(pv)
-        step = max(1, n // 250)
-        sampled = pv.iloc[::step]
-        # Always include last point
-        if sampled.index[-1] != pv.index[-1]:
-            sampled = pd.concat([sampled, pv.iloc[[-1]]])
+        """Build time series for charting, LTTB-downsampled to ``max_points``.
+
+        LTTB keeps the points that shape the curve, so drawdown troughs and
+        peaks survive where every-n-th sampling would skip them.
+        """
+        days = pv.index.values.astype("datetime64[D]").astype(np.int64)
+        sampled = pv.iloc[lttb_indices(pv.to_numpy(), max_points, days)]
 
         return [
             {
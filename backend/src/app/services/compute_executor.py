@@ -0,0 +1,125 @@
+"""Process pool for CPU-bound optimization and simulation jobs.
+
+Solver and simulation code runs synchronously; calling it directly from an
+async handler blocks the event loop (and every other request on the worker,
+including /health and SSE chat streams) until it finishes. Jobs submitted
+here run in a separate process instead, with a per-job timeout.
+
+Jobs must be picklable module-level functions taking plain data (NumPy
+arrays, lists, scalars). DB access stays on the event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeTimeoutError(Exception):
+    """A compute job did not finish within its timeout."""
+
+
+class ComputeExecutor:
+    """Lazily started ``ProcessPoolExecutor`` with timeouts and load counters.
+
+    ``max_workers=0`` runs jobs inline on the calling thread, which is useful
+    for debugging and for environments where subprocesses aren't allowed.
+    """
+
+    def __init__(self, max_workers: int | None = None, timeout: float | None = None):
+        self.max_workers = settings.COMPUTE_POOL_WORKERS if max_workers is None else max_workers
+        self.timeout = settings.COMPUTE_JOB_TIMEOUT_SECONDS if timeout is None else timeout
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._submitted = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+        """Run ``func(*args)`` in the pool and await its result.
+
+        Raises ComputeTimeoutError if the job exceeds ``timeout`` (default
+        ``COMPUTE_JOB_TIMEOUT_SECONDS``). A job still waiting in the queue is
+        cancelled; one already running finishes in the background, since a
+        worker process can't be interrupted mid-solve.
+
+        If a worker dies (e.g. killed for running out of memory), the pool
+        is broken for every job; it is discarded so the next job starts a
+        fresh one, and the jobs that were on it raise BrokenProcessPool.
+        """
+        if self.max_workers <= 0:
+            return func(*args)
+
+        pool, future = self._submit(func, *args)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Compute job {func.__name__} timed out after {timeout}s")
+            raise ComputeTimeoutError(f"{func.__name__} did not finish within {timeout}s") from None
+        except BrokenProcessPool:
+            with self._lock:
+                self._failed += 1
+                if self._pool is pool:
+                    self._pool = None
+                    logger.error(f"Compute pool broken during {func.__name__}; starting a new pool for the next job")
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+
+    def stats(self) -> dict:
+        """Queue-depth and outcome counters for monitoring."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "peak_in_flight": self._peak_in_flight,
+                "submitted": self._submitted,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> tuple[ProcessPoolExecutor, Future]:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a multi-threaded server process can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = self._pool
+        future = pool.submit(func, *args)
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        future.add_done_callback(self._job_done)
+        return pool, future
+
+    def _job_done(self, _future: Future) -> None:
+        # Called from the pool's management thread
+        with self._lock:
+            self._in_flight -= 1
+
+
+compute_executor = ComputeExecutor()
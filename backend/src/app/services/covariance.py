@@ -0,0 +1,247 @@
+"""Incremental covariance of daily returns, maintained by the data pipeline.
+
+A full Ledoit-Wolf estimate costs O(T·n²) for T days of history. The
+pipeline only appends one day per asset per run, so it instead folds each
+new day into running state in O(n²):
+
+- pairwise running sums (count, Σr, Σr·r) over the days both assets traded,
+  giving the expanding-window sample covariance and mean returns
+- a RiskMetrics-style (zero-mean) EWMA covariance with a configurable
+  half-life, normalized per pair so assets listed later aren't biased low
+
+The state covers every active asset; any universe's matrices are
+sub-matrices of it. It is persisted in ``covariance_states`` and loaded by
+API workers through ``covariance_store``.
+"""
+
+import io
+import logging
+import math
+import time
+from datetime import date
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import settings
+from src.app.models.covariance_state import CovarianceState
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+# Name of the all-assets state row
+DEFAULT_STATE = "all_assets"
+
+
+class IncrementalCovariance:
+    """Running return statistics over a growing list of assets.
+
+    Returns are close-to-close between consecutive days on which an asset
+    has a price, so a market holiday neither adds a zero return nor drops
+    the move across it.
+
+    Memory is five n×n float64 matrices, 40·n² bytes (160 MB at 2,000
+    assets), so the pipeline calls ``retain`` with the active assets to keep
+    n bounded by the active universe.
+    """
+
+    def __init__(self, asset_ids: list[int] | None = None, halflife: float | None = None):
+        self.halflife = settings.COVARIANCE_EWMA_HALFLIFE_DAYS if halflife is None else halflife
+        self.decay = 0.5 ** (1.0 / self.halflife)
+        self.as_of: date | None = None
+        self.asset_ids: list[int] = []
+        self._positions: dict[int, int] = {}
+
+        self.last_prices = np.empty(0)
+        self.count = np.zeros((0, 0))
+        # sum_r[i, j]: sum of asset i's returns over days on which j also has one
+        self.sum_r = np.zeros((0, 0))
+        self.sum_rr = np.zeros((0, 0))
+        self.ewma = np.zeros((0, 0))
+        self.ewma_weight = np.zeros((0, 0))
+
+        self.add_assets(asset_ids or [])
+
+    def add_assets(self, asset_ids: list[int]) -> None:
+        """Start tracking new assets; already-tracked IDs are ignored."""
+        new = [i for i in dict.fromkeys(asset_ids) if i not in self._positions]
+        if not new:
+            return
+        n_old, n = len(self.asset_ids), len(self.asset_ids) + len(new)
+        for asset_id in new:
+            self._positions[asset_id] = len(self.asset_ids)
+            self.asset_ids.append(asset_id)
+
+        self.last_prices = np.concatenate((self.last_prices, np.full(len(new), np.nan)))
+        for name in ("count", "sum_r", "sum_rr", "ewma", "ewma_weight"):
+            grown = np.zeros((n, n))
+            grown[:n_old, :n_old] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def retain(self, asset_ids: list[int]) -> list[int]:
+        """Stop tracking every asset not in ``asset_ids``; returns the removed IDs.
+
+        Statistics are pairwise, so the remaining pairs are unaffected.
+        """
+        keep = set(asset_ids)
+        removed = [i for i in self.asset_ids if i not in keep]
+        if not removed:
+            return []
+        kept = [i for i in self.asset_ids if i in keep]
+        idx = self._index(kept)
+        grid = np.ix_(idx, idx)
+        self.last_prices = self.last_prices[idx]
+        for name in ("count", "sum_r", "sum_rr", "ewma", "ewma_weight"):
+            setattr(self, name, getattr(self, name)[grid])
+        self.asset_ids = kept
+        self._positions = {asset_id: pos for pos, asset_id in enumerate(kept)}
+        return removed
+
+    def update(self, day: date, prices: np.ndarray) -> None:
+        """Fold one day of prices (aligned with ``asset_ids``, NaN = no price) into the state. O(n²)."""
+        traded = np.isfinite(prices)
+        has_return = traded & np.isfinite(self.last_prices)
+        returns = np.where(has_return, prices / np.where(has_return, self.last_prices, 1.0) - 1.0, 0.0)
+        mask = has_return.astype(np.float64)
+
+        self.count += np.outer(mask, mask)
+        self.sum_r += np.outer(returns, mask)
+        self.sum_rr += np.outer(returns, returns)
+
+        self.ewma *= self.decay
+        self.ewma += (1.0 - self.decay) * np.outer(returns, returns)
+        self.ewma_weight *= self.decay
+        self.ewma_weight += (1.0 - self.decay) * np.outer(mask, mask)
+
+        self.last_prices = np.where(traded, prices, self.last_prices)
+        self.as_of = day
+
+    def update_many(self, dates: list[date], prices: np.ndarray) -> None:
+        """Apply ``update`` for each row of a (days × assets) matrix, in date order."""
+        for day, row in zip(dates, prices, strict=True):
+            self.update(day, row)
+
+    # ------------------------------------------------------------------ #
+    #  Estimates
+    # ------------------------------------------------------------------ #
+
+    def unpriced(self) -> list[int]:
+        """Tracked assets that no price has been folded in for yet."""
+        return [i for i, last in zip(self.asset_ids, self.last_prices, strict=True) if not np.isfinite(last)]
+
+    def covers(self, asset_ids: list[int], min_observations: int | None = None) -> bool:
+        """Whether every pair among ``asset_ids`` has at least ``min_observations`` common returns.
+
+        Defaults to one EWMA half-life, so a pair the EWMA has barely seen
+        isn't treated as estimated.
+        """
+        if any(i not in self._positions for i in asset_ids):
+            return False
+        if min_observations is None:
+            min_observations = math.ceil(self.halflife)
+        idx = self._index(asset_ids)
+        return bool(self.count[np.ix_(idx, idx)].min(initial=np.inf) >= min_observations)
+
+    def sample_covariance(self, asset_ids: list[int]) -> np.ndarray:
+        """Annualized pairwise sample covariance over each pair's common days."""
+        idx = self._index(asset_ids)
+        grid = np.ix_(idx, idx)
+        n = self.count[grid]
+        sum_i = self.sum_r[grid]
+        sum_j = self.sum_r.T[grid]
+        cov = (self.sum_rr[grid] - sum_i * sum_j / n) / (n - 1)
+        return cov * TRADING_DAYS
+
+    def ewma_covariance(self, asset_ids: list[int]) -> np.ndarray:
+        """Annualized EWMA covariance."""
+        idx = self._index(asset_ids)
+        grid = np.ix_(idx, idx)
+        return self.ewma[grid] / self.ewma_weight[grid] * TRADING_DAYS
+
+    def mean_returns(self, asset_ids: list[int]) -> np.ndarray:
+        """Annualized arithmetic mean daily return per asset."""
+        idx = self._index(asset_ids)
+        return self.sum_r[idx, idx] / self.count[idx, idx] * TRADING_DAYS
+
+    def _index(self, asset_ids: list[int]) -> np.ndarray:
+        return np.fromiter((self._positions[i] for i in asset_ids), dtype=np.int64, count=len(asset_ids))
+
+    # ------------------------------------------------------------------ #
+    #  Serialization
+    # ------------------------------------------------------------------ #
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            asset_ids=np.asarray(self.asset_ids, dtype=np.int64),
+            halflife=np.float64(self.halflife),
+            as_of=np.datetime64(self.as_of, "D") if self.as_of else np.datetime64("NaT", "D"),
+            last_prices=self.last_prices,
+            count=self.count,
+            sum_r=self.sum_r,
+            sum_rr=self.sum_rr,
+            ewma=self.ewma,
+            ewma_weight=self.ewma_weight,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "IncrementalCovariance":
+        with np.load(io.BytesIO(payload)) as data:
+            state = cls(halflife=float(data["halflife"]))
+            state.add_assets(data["asset_ids"].tolist())
+            as_of = data["as_of"]
+            state.as_of = None if np.isnat(as_of) else as_of.item()
+            for name in ("last_prices", "count", "sum_r", "sum_rr", "ewma", "ewma_weight"):
+                setattr(state, name, data[name])
+        return state
+
+
+class CovarianceStore:
+    """Per-worker copy of a persisted IncrementalCovariance.
+
+    The row's ``updated_at`` is checked at most every
+    ``PRICE_STORE_REFRESH_SECONDS``; the payload is reloaded only when it moved.
+    """
+
+    def __init__(self, name: str = DEFAULT_STATE, refresh_seconds: float | None = None):
+        self.name = name
+        self.refresh_seconds = (
+            settings.PRICE_STORE_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self._state: IncrementalCovariance | None = None
+        self._updated_at = None
+        self._checked_at: float | None = None
+
+    @property
+    def updated_at(self):
+        """``updated_at`` of the loaded state's row (None before the first load); identifies its version."""
+        return self._updated_at
+
+    async def get(self, session: AsyncSession) -> IncrementalCovariance | None:
+        """Return the latest persisted state, or ``None`` if the pipeline hasn't built one yet."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return self._state
+        self._checked_at = now
+
+        result = await session.execute(
+            select(CovarianceState.updated_at).where(CovarianceState.name == self.name)
+        )
+        updated_at = result.scalar_one_or_none()
+        if updated_at is None or updated_at == self._updated_at:
+            return self._state
+
+        result = await session.execute(
+            select(CovarianceState.payload).where(CovarianceState.name == self.name)
+        )
+        self._state = IncrementalCovariance.from_bytes(result.scalar_one())
+        self._updated_at = updated_at
+        logger.info(f"Loaded covariance state ({len(self._state.asset_ids)} assets, as of {self._state.as_of})")
+        return self._state
+
+
+covariance_store = CovarianceStore()
@@ -1,33 +1,158 @@
 """Base class for data fetchers."""
 
+import asyncio
+import copy
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, timedelta
+from itertools import repeat
 
-from sqlalchemy.ext.asyncio import AsyncSession
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.core.config import settings
+from src.app.core.database import async_session
+from src.app.models.asset import Asset
+from src.app.models.asset_price import AssetPrice
+from src.app.models.economic_indicator import EconomicIndicator
+from src.app.models.latest_quote import LatestQuote
+from src.app.services.data_pipeline.staging import price_staging
+from src.app.services.price_store import price_store
 
 logger = logging.getLogger(__name__)
 
+# asset_prices column -> yfinance OHLCV column
+PRICE_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adj_close": "Adj Close",
+    "volume": "Volume",
+}
+
+# Some yfinance releases keep yf.download's per-call results in module-level
+# state, so batched downloads run one at a time (each is threaded internally)
+_download_lock = threading.Lock()
+
+
+class FetchSummary:
+    """Outcome of one fetcher run.
+
+    Attributes
+    ----------
+    source : str
+        Fetcher class name.
+    succeeded : list[str]
+        Symbols / series fetched (including those with no new data), in completion order.
+    failed : dict[str, str]
+        Error message by symbol / series, after retries.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.succeeded: list[str] = []
+        self.failed: dict[str, str] = {}
+
+    def __str__(self) -> str:
+        text = f"{self.source}: {len(self.succeeded)} succeeded, {len(self.failed)} failed"
+        return f"{text} ({', '.join(sorted(self.failed))})" if self.failed else text
+
 
 class BaseFetcher(ABC):
     """Base class for all data fetchers.
 
-    Provides common functionality: logging, retry logic, error handling.
+    Provides common functionality: logging, retry logic, error handling, and
+    the concurrent per-symbol fan-out (``_fetch_each``). ``semaphore`` bounds
+    how many symbols are in flight at once; fetchers run by one coordinator
+    share it, so the bound holds for the whole pipeline run.
     """
 
     MAX_RETRIES = 3
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ):
         self.session = session
+        self.session_factory = session_factory or async_session
+        self.semaphore = semaphore or asyncio.Semaphore(settings.PIPELINE_CONCURRENCY)
         self.logger = logging.getLogger(self.__class__.__name__)
 
     @abstractmethod
-    async def fetch(self, **kwargs) -> None:
+    async def fetch(self, **kwargs) -> FetchSummary:
         """Fetch data from external source and save to DB."""
 
+    async def _fetch_each(
+        self,
+        keys: list[str],
+        fetch_one: Callable[["BaseFetcher", str], Awaitable[None]],
+        summary: FetchSummary | None = None,
+    ) -> FetchSummary:
+        """Run ``fetch_one(worker, key)`` for every key concurrently, at most ``semaphore`` at a time.
+
+        Each attempt gets its own worker: a copy of this fetcher bound to a
+        fresh session from ``session_factory``, so one symbol's transaction
+        (or failed attempt) never touches another's. Failures are logged and
+        recorded (in ``summary``, if given) without stopping the other keys.
+        """
+        summary = summary or FetchSummary(self.__class__.__name__)
+
+        async def attempt(key: str) -> None:
+            async with self.session_factory() as session:
+                worker = copy.copy(self)
+                worker.session = session
+                await fetch_one(worker, key)
+
+        async def run(key: str) -> None:
+            async with self.semaphore:
+                try:
+                    await self._retry(attempt, key)
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch {key}: {e}")
+                    summary.failed[key] = str(e)
+                else:
+                    self.logger.info(f"Fetched {key}")
+                    summary.succeeded.append(key)
+
+        await asyncio.gather(*(run(key) for key in keys))
+        return summary
+
+    async def _active_symbols(self, market: str) -> list[str]:
+        """Symbols of the active assets in ``market``, read on a short-lived session."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Asset.symbol).where(Asset.market == market, Asset.is_active.is_(True))
+            )
+            return list(result.scalars().all())
+
+    async def _indicator_watermarks(self, indicator_types: list[str]) -> dict[str, date]:
+        """Last stored date by indicator type, read on a short-lived session."""
+        async with self.session_factory() as session:
+            return await indicator_watermarks(session, indicator_types)
+
+    async def _download_history(self, symbol: str, start: date | None, period: str) -> pd.DataFrame:
+        """Daily OHLCV for ``symbol`` since ``start`` (or over ``period``), fetched on a thread.
+
+        Uses ``Ticker.history`` rather than ``yf.download``: each Ticker keeps
+        its own state, so concurrent workers can't mix up each other's frames.
+        """
+        window = {"start": start.isoformat()} if start else {"period": period}
+        ticker = yf.Ticker(symbol)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: ticker.history(**window, actions=False)
+        )
+
     async def _retry(self, coro_func, *args, **kwargs):
         """Retry with exponential backoff."""
-        import asyncio
-
         for attempt in range(self.MAX_RETRIES):
             try:
                 return await coro_func(*args, **kwargs)
@@ -38,3 +163,235 @@ class BaseFetcher(ABC):
                 wait = 2**attempt
                 self.logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait}s...")
                 await asyncio.sleep(wait)
+
+    async def _refresh_latest_quote(self, asset_id: int) -> None:
+        """Recompute the asset's latest_quotes row from its two newest prices.
+
+        Call after upserting prices and before committing, so the quote is
+        updated in the same transaction as the prices it summarizes.
+        """
+        result = await self.session.execute(
+            select(AssetPrice.date, AssetPrice.close)
+            .where(AssetPrice.asset_id == asset_id)
+            .order_by(AssetPrice.date.desc())
+            .limit(2)
+        )
+        rows = result.all()
+        if not rows:
+            return
+
+        as_of, close = rows[0]
+        previous_close = rows[1].close if len(rows) > 1 else None
+        change_pct = float((close - previous_close) / previous_close) if previous_close else None
+
+        stmt = insert(LatestQuote).values(
+            asset_id=asset_id,
+            close=close,
+            previous_close=previous_close,
+            change_pct=change_pct,
+            as_of=as_of,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LatestQuote.asset_id],
+            set_={
+                "close": stmt.excluded.close,
+                "previous_close": stmt.excluded.previous_close,
+                "change_pct": stmt.excluded.change_pct,
+                "as_of": stmt.excluded.as_of,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+
+async def price_watermarks(session: AsyncSession, asset_ids: list[int]) -> dict[int, date]:
+    """Last stored price date by asset id, in one GROUP BY query; assets without prices are left out."""
+    result = await session.execute(
+        select(AssetPrice.asset_id, func.max(AssetPrice.date))
+        .where(AssetPrice.asset_id.in_(asset_ids))
+        .group_by(AssetPrice.asset_id)
+    )
+    return dict(result.all())
+
+
+async def indicator_watermarks(session: AsyncSession, indicator_types: list[str]) -> dict[str, date]:
+    """Last stored date by indicator type, in one GROUP BY query; types without data are left out."""
+    result = await session.execute(
+        select(EconomicIndicator.indicator_type, func.max(EconomicIndicator.date))
+        .where(EconomicIndicator.indicator_type.in_(indicator_types))
+        .group_by(EconomicIndicator.indicator_type)
+    )
+    return dict(result.all())
+
+
+def frame_records(
+    frame: pd.DataFrame,
+    columns: list[str],
+    values: dict[str, str],
+    constants: dict[str, object] | None = None,
+    integers: Iterable[str] = (),
+    required: str | None = None,
+) -> list[tuple]:
+    """Records (tuples in ``columns`` order) from a date-indexed frame, one per row.
+
+    ``date`` is the row's index date. ``values`` maps record columns to
+    frame columns, read as floats (ints for ``integers``) with NaN and
+    non-numeric entries as None; a frame column that is missing gives all
+    None. Every other record column is filled from ``constants``. Rows
+    where the record column ``required`` would be None are dropped.
+
+    Each column is converted as a whole array, and the result holds plain
+    Python values, as the COPY encoders expect.
+    """
+    numeric = {
+        name: pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64)
+        for name, column in values.items()
+        if column in frame
+    }
+    keep = slice(None)
+    if required is not None:
+        if required not in numeric:
+            return []
+        keep = ~np.isnan(numeric[required])
+
+    index = frame.index[keep]
+    fields = {"date": (index.date if isinstance(index, pd.DatetimeIndex) else np.asarray(index)).tolist()}
+    integers = set(integers)
+    for name in values:
+        if name not in numeric:
+            fields[name] = repeat(None)
+            continue
+        array = numeric[name][keep]
+        missing = np.isnan(array)
+        converted = (np.where(missing, 0, array).astype(np.int64) if name in integers else array).astype(object)
+        converted[missing] = None
+        fields[name] = converted.tolist()
+
+    constants = constants or {}
+    return list(zip(*(fields[name] if name in fields else repeat(constants[name]) for name in columns)))
+
+
+def split_tickers(frame: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """Per-symbol OHLCV frames from a ``yf.download(..., group_by="ticker")`` result.
+
+    Multi-ticker frames are aligned on the union of the symbols' trading
+    days, so each symbol's rows without a close (other markets' holidays,
+    dates before it listed) are dropped. Symbols missing from the result
+    are left out.
+    """
+    if frame is None or frame.empty:
+        return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        # Single-ticker result without the ticker level
+        return {symbols[0]: frame.dropna(subset=["Close"])} if len(symbols) == 1 else {}
+
+    present = set(frame.columns.get_level_values(0))
+    return {symbol: frame[symbol].dropna(subset=["Close"]) for symbol in symbols if symbol in present}
+
+
+class PriceFetcher(BaseFetcher):
+    """Daily asset prices from yfinance, downloaded in multi-ticker batches.
+
+    Symbols are grouped by the date their incremental download starts from
+    (the day after their last stored price, or the full ``period`` for new
+    assets), and each group is split into batches of at most
+    ``batch_size`` symbols, one ``yf.download`` call each. The result is
+    split per asset and each asset is upserted on its own session.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+        batch_size: int | None = None,
+    ):
+        super().__init__(session, session_factory, semaphore)
+        self.batch_size = batch_size or settings.PIPELINE_DOWNLOAD_BATCH_SIZE
+
+    async def _upsert_prices(self, asset_id: int, df: pd.DataFrame) -> None:
+        """Upsert one asset's daily OHLCV frame into asset_prices via the COPY staging table."""
+        records = frame_records(
+            df,
+            price_staging.columns,
+            PRICE_COLUMNS,
+            constants={"asset_id": asset_id},
+            integers=("volume",),
+            required="close",
+        )
+
+        count = await price_staging.upsert(self.session, records)
+        if not count:
+            return
+        await self._refresh_latest_quote(asset_id)
+        await self.session.commit()
+        price_store.invalidate([asset_id])
+        self.logger.info(f"Upserted {count} price records for asset_id={asset_id}")
+
+    async def _fetch_prices(self, symbols: list[str], period: str) -> FetchSummary:
+        """Download ``symbols`` in batches and upsert each asset's new prices."""
+        summary = FetchSummary(self.__class__.__name__)
+        asset_ids, last_dates = await self._plan_downloads(symbols)
+        for symbol in symbols:
+            if symbol not in asset_ids:
+                self.logger.warning(f"Asset {symbol} not found in DB, skipping.")
+                summary.failed[symbol] = "asset not found in DB"
+
+        groups: dict[date | None, list[str]] = {}
+        for symbol, asset_id in asset_ids.items():
+            last_date = last_dates.get(asset_id)
+            groups.setdefault(last_date + timedelta(days=1) if last_date else None, []).append(symbol)
+
+        await asyncio.gather(*(
+            self._fetch_batch(group[i:i + self.batch_size], start, period, asset_ids, summary)
+            for start, group in groups.items()
+            for i in range(0, len(group), self.batch_size)
+        ))
+        return summary
+
+    async def _plan_downloads(self, symbols: list[str]) -> tuple[dict[str, int], dict[int, date]]:
+        """Asset id by symbol (known symbols only) and last stored price date by asset id."""
+        async with self.session_factory() as session:
+            result = await session.execute(select(Asset.id, Asset.symbol).where(Asset.symbol.in_(symbols)))
+            asset_ids = {symbol: asset_id for asset_id, symbol in result.all()}
+            last_dates = await price_watermarks(session, list(asset_ids.values())) if asset_ids else {}
+        return asset_ids, last_dates
+
+    async def _fetch_batch(
+        self,
+        symbols: list[str],
+        start: date | None,
+        period: str,
+        asset_ids: dict[str, int],
+        summary: FetchSummary,
+    ) -> None:
+        """One multi-ticker download, then a concurrent upsert per asset."""
+        async with self.semaphore:
+            try:
+                frames = await self._retry(self._download_batch, symbols, start, period)
+            except Exception as e:
+                self.logger.error(f"Failed to download {', '.join(symbols)}: {e}")
+                summary.failed.update(dict.fromkeys(symbols, str(e)))
+                return
+        self.logger.info(f"Downloaded {len(frames)}/{len(symbols)} symbols from {start or period}")
+
+        async def upsert(worker: "PriceFetcher", symbol: str) -> None:
+            df = frames.get(symbol)
+            if df is None or df.empty:
+                self.logger.info(f"No new data for {symbol}")
+                return
+            await worker._upsert_prices(asset_ids[symbol], df)
+
+        # Upserts take their own semaphore slots, so the download's slot is released first
+        await self._fetch_each(symbols, upsert, summary)
+
+    async def _download_batch(self, symbols: list[str], start: date | None, period: str) -> dict[str, pd.DataFrame]:
+        """Daily OHLCV for ``symbols`` since ``start`` (or over ``period``) in one call, split per symbol."""
+        window = {"start": start.isoformat()} if start else {"period": period}
+
+        def download() -> pd.DataFrame:
+            with _download_lock:
+                return yf.download(symbols, **window, group_by="ticker", auto_adjust=True, progress=False)
+
+        frame = await asyncio.get_running_loop().run_in_executor(None, download)
+        return split_tickers(frame, symbols)
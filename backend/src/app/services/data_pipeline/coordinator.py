@@ -1,9 +1,14 @@
 """Pipeline coordinator - orchestrates all data fetchers."""
 
+import asyncio
 import logging
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.app.core.config import settings
+from src.app.core.database import async_session
+from src.app.services.data_pipeline.base import FetchSummary
+from src.app.services.data_pipeline.covariance import CovarianceUpdater
 from src.app.services.data_pipeline.exchange_rate import ExchangeRateFetcher
 from src.app.services.data_pipeline.fred import FredFetcher
 from src.app.services.data_pipeline.jquants import JQuantsFetcher
@@ -13,45 +18,74 @@ logger = logging.getLogger(__name__)
 
 
 class PipelineCoordinator:
-    """Coordinates all data fetchers for market data updates."""
-
-    def __init__(self, session: AsyncSession):
+    """Coordinates all data fetchers for market data updates.
+
+    Fetchers run concurrently and each fans out over its symbols; one
+    semaphore of ``concurrency`` slots bounds the symbols in flight across
+    all of them. Every symbol is fetched and upserted on its own session
+    from ``session_factory``; ``session`` is used for the covariance update,
+    which runs after the fetchers finish.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker = async_session,
+        concurrency: int | None = None,
+    ):
         self.session = session
-        self.us_fetcher = YFinanceFetcher(session)
-        self.jp_fetcher = JQuantsFetcher(session)
-        self.fred_fetcher = FredFetcher(session)
-        self.fx_fetcher = ExchangeRateFetcher(session)
-
-    async def update_all(self) -> None:
+        semaphore = asyncio.Semaphore(concurrency or settings.PIPELINE_CONCURRENCY)
+        self.us_fetcher = YFinanceFetcher(session, session_factory, semaphore)
+        self.jp_fetcher = JQuantsFetcher(session, session_factory, semaphore)
+        self.fred_fetcher = FredFetcher(session, session_factory, semaphore)
+        self.fx_fetcher = ExchangeRateFetcher(session, session_factory, semaphore)
+        self.covariance_updater = CovarianceUpdater(session)
+
+    async def update_all(self) -> list[FetchSummary]:
         """Update all market data: US prices, JP prices, economic indicators, exchange rates."""
         logger.info("Starting full market data update...")
 
-        logger.info("Updating US market prices...")
-        await self.us_fetcher.fetch()
+        logger.info("Updating US/JP market prices, economic indicators (FRED) and exchange rates...")
+        summaries = await self._run(
+            self.us_fetcher.fetch(), self.jp_fetcher.fetch(), self.fred_fetcher.fetch(), self.fx_fetcher.fetch(),
+        )
 
-        logger.info("Updating JP market prices...")
-        await self.jp_fetcher.fetch()
-
-        logger.info("Updating economic indicators (FRED)...")
-        await self.fred_fetcher.fetch()
-
-        logger.info("Updating exchange rates...")
-        await self.fx_fetcher.fetch()
+        logger.info("Updating covariance state...")
+        await self.covariance_updater.update()
 
         logger.info("Full market data update completed.")
+        return summaries
 
-    async def update_us_prices(self) -> None:
+    async def update_us_prices(self) -> list[FetchSummary]:
         """Update US market prices only."""
         logger.info("Updating US market prices...")
-        await self.us_fetcher.fetch()
+        summaries = await self._run(self.us_fetcher.fetch())
+        await self.covariance_updater.update()
+        return summaries
 
-    async def update_jp_prices(self) -> None:
+    async def update_jp_prices(self) -> list[FetchSummary]:
         """Update JP market prices only."""
         logger.info("Updating JP market prices...")
-        await self.jp_fetcher.fetch()
+        summaries = await self._run(self.jp_fetcher.fetch())
+        await self.covariance_updater.update()
+        return summaries
+
+    async def update_covariance(self, rebuild: bool = False) -> None:
+        """Advance (or, with ``rebuild``, recompute from scratch) the incremental covariance state."""
+        logger.info("Updating covariance state...")
+        await self.covariance_updater.update(rebuild=rebuild)
 
-    async def update_indicators(self) -> None:
+    async def update_indicators(self) -> list[FetchSummary]:
         """Update economic indicators and exchange rates."""
         logger.info("Updating economic indicators...")
-        await self.fred_fetcher.fetch()
-        await self.fx_fetcher.fetch()
+        return await self._run(self.fred_fetcher.fetch(), self.fx_fetcher.fetch())
+
+    async def _run(self, *fetches) -> list[FetchSummary]:
+        """Run fetcher coroutines concurrently and log each one's summary."""
+        summaries = list(await asyncio.gather(*fetches))
+        for summary in summaries:
+            if summary.failed:
+                logger.warning(str(summary))
+            else:
+                logger.info(str(summary))
+        return summaries
@@ -0,0 +1,139 @@
+"""Fold newly ingested prices into the persisted incremental covariance state."""
+
+import logging
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.models.asset import Asset
+from src.app.models.asset_price import AssetPrice
+from src.app.models.covariance_state import CovarianceState
+from src.app.services.covariance import DEFAULT_STATE, IncrementalCovariance
+from src.app.services.price_store import adjusted_closes
+
+
+class CovarianceUpdater:
+    """Advance the covariance state through the days every market has reported.
+
+    Runs after the price fetchers. Only days up to the earliest of the
+    per-market latest dates are applied, so a day isn't folded in before a
+    market that reports later (e.g. JP after US) has its prices for it.
+    Each run costs O(n²) per new day; the first run replays the full history,
+    as does a run that finds an asset with prices the state never saw (e.g.
+    one activated or backfilled after the state was built), since its pairs
+    with every other asset need the days before ``as_of`` too. Assets no
+    longer active are dropped, so the state (40·n² bytes, rewritten on each
+    run and loaded by every API worker) stays sized to the active universe.
+    """
+
+    def __init__(self, session: AsyncSession, name: str = DEFAULT_STATE):
+        self.session = session
+        self.name = name
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def update(self, rebuild: bool = False) -> None:
+        """Apply new days to the stored state (or, with ``rebuild``, replay everything) and save it."""
+        state = None if rebuild else await self._load_state()
+        if state is None:
+            state = IncrementalCovariance()
+
+        result = await self.session.execute(select(Asset.id).where(Asset.is_active.is_(True)).order_by(Asset.id))
+        active_ids = list(result.scalars().all())
+        removed = state.retain(active_ids)
+        if removed:
+            self.logger.info(f"Dropped {len(removed)} inactive assets from the covariance state")
+        state.add_assets(active_ids)
+
+        through = await self._complete_through()
+        if through is None or (state.as_of is not None and through <= state.as_of):
+            if removed and state.as_of is not None:
+                await self._save_state(state)
+            self.logger.info(f"Covariance state up to date (as of {state.as_of})")
+            return
+
+        if state.as_of is not None and await self._has_prices_through(state.unpriced(), state.as_of):
+            self.logger.info(f"Assets with history before {state.as_of} are missing from the state; replaying")
+            state = IncrementalCovariance(active_ids)
+
+        query = (
+            select(AssetPrice.asset_id, AssetPrice.date, AssetPrice.close, AssetPrice.adj_close)
+            .where(AssetPrice.asset_id.in_(state.asset_ids), AssetPrice.date <= through)
+            .order_by(AssetPrice.date)
+        )
+        if state.as_of is not None:
+            query = query.where(AssetPrice.date > state.as_of)
+        result = await self.session.execute(query)
+        dates, prices = self._pivot(state.asset_ids, result.all())
+        if not dates:
+            return
+
+        state.update_many(dates, prices)
+        await self._save_state(state)
+        self.logger.info(
+            f"Covariance state advanced {len(dates)} days to {state.as_of} ({len(state.asset_ids)} assets)"
+        )
+
+    async def _load_state(self) -> IncrementalCovariance | None:
+        result = await self.session.execute(
+            select(CovarianceState.payload).where(CovarianceState.name == self.name)
+        )
+        payload = result.scalar_one_or_none()
+        return IncrementalCovariance.from_bytes(payload) if payload is not None else None
+
+    async def _has_prices_through(self, asset_ids: list[int], as_of: date) -> bool:
+        """Whether any of ``asset_ids`` has a price on or before ``as_of``."""
+        if not asset_ids:
+            return False
+        result = await self.session.execute(
+            select(AssetPrice.id)
+            .where(AssetPrice.asset_id.in_(asset_ids), AssetPrice.date <= as_of)
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def _complete_through(self) -> date | None:
+        """Earliest of the per-market latest price dates among active assets."""
+        result = await self.session.execute(
+            select(Asset.market, func.max(AssetPrice.date))
+            .join(AssetPrice, AssetPrice.asset_id == Asset.id)
+            .where(Asset.is_active.is_(True))
+            .group_by(Asset.market)
+        )
+        latest = [last for _, last in result.all() if last is not None]
+        return min(latest) if latest else None
+
+    async def _save_state(self, state: IncrementalCovariance) -> None:
+        stmt = insert(CovarianceState).values(
+            name=self.name,
+            as_of=state.as_of,
+            n_assets=len(state.asset_ids),
+            payload=state.to_bytes(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CovarianceState.name],
+            set_={
+                "as_of": stmt.excluded.as_of,
+                "n_assets": stmt.excluded.n_assets,
+                "payload": stmt.excluded.payload,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    @staticmethod
+    def _pivot(asset_ids: list[int], rows) -> tuple[list[date], np.ndarray]:
+        """(asset_id, date, close, adj_close) rows -> sorted dates and a (dates × asset_ids) price matrix."""
+        if not rows:
+            return [], np.empty((0, len(asset_ids)))
+        ids, dates, closes, adj_closes = zip(*rows, strict=True)
+        unique_dates, row_idx = np.unique(np.asarray(dates, dtype="datetime64[D]"), return_inverse=True)
+        positions = {asset_id: col for col, asset_id in enumerate(asset_ids)}
+        col_idx = np.fromiter((positions[i] for i in ids), dtype=np.int64, count=len(ids))
+
+        matrix = np.full((len(unique_dates), len(asset_ids)), np.nan)
+        matrix[row_idx, col_idx] = adjusted_closes(closes, adj_closes)
+        return unique_dates.tolist(), matrix
@@ -0,0 +1,109 @@
+"""Bulk upserts through a COPY-loaded temporary staging table.
+
+A multi-row ``INSERT ... VALUES`` binds every value as a query parameter,
+so a large backfill is slow to build and send and runs into PostgreSQL's
+32767-parameter limit. Instead, rows are streamed into a connection-local
+temporary table with asyncpg's binary COPY and merged into the target
+table with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``. The merge
+empties the staging table as it reads it, and any rows left by a failed
+transaction are dropped at commit/rollback.
+
+Staging value columns are double precision so Python floats COPY without
+conversion; the merge casts them to the target's numeric columns.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from src.app.models.asset_price import AssetPrice
+from src.app.models.economic_indicator import EconomicIndicator
+
+
+class StagingTable:
+    """COPY-based upserts into ``target``.
+
+    Attributes
+    ----------
+    target : sa.Table
+        Table rows are merged into.
+    columns : list[str]
+        Columns each record supplies, in record order.
+    table : sa.Table
+        The temporary staging table, created on first use per connection.
+    """
+
+    def __init__(self, target: sa.Table, columns: dict[str, type[sa.types.TypeEngine]], constraint: str):
+        self.target = target
+        self.columns = list(columns)
+        self.table = sa.Table(
+            f"{target.name}_staging",
+            sa.MetaData(),
+            *(sa.Column(name, type_) for name, type_ in columns.items()),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DELETE ROWS",
+        )
+
+        key = next(c for c in target.constraints if c.name == constraint).columns.keys()
+        staged = sa.delete(self.table).returning(*self.table.c).cte("staged")
+        merge = insert(target).from_select(self.columns, sa.select(*(staged.c[name] for name in self.columns)))
+        self.merge = merge.on_conflict_do_update(
+            constraint=constraint,
+            set_={name: merge.excluded[name] for name in self.columns if name not in key},
+        ).add_cte(staged)
+
+    async def upsert(self, session: AsyncSession, records: list[tuple]) -> int:
+        """COPY ``records`` (tuples in ``columns`` order) into staging and merge them; returns the row count.
+
+        Runs in the session's transaction; the caller commits. The staging
+        table is created once per database connection (pooled connections
+        outlive sessions), recorded in the connection's ``info``. A rollback
+        also drops a table created in that transaction, so a failed COPY or
+        merge clears the record and the caller's retry creates it again.
+        """
+        if not records:
+            return 0
+
+        connection = await session.connection()
+        staged = connection.info.setdefault("staging_tables", set())
+        if self.table.name not in staged:
+            await session.execute(CreateTable(self.table, if_not_exists=True))
+            staged.add(self.table.name)
+        try:
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(self.table.name, records=records, columns=self.columns)
+            await session.execute(self.merge)
+        except Exception:
+            staged.discard(self.table.name)
+            raise
+        return len(records)
+
+
+price_staging = StagingTable(
+    AssetPrice.__table__,
+    {
+        "asset_id": sa.BigInteger,
+        "date": sa.Date,
+        "open": sa.Double,
+        "high": sa.Double,
+        "low": sa.Double,
+        "close": sa.Double,
+        "adj_close": sa.Double,
+        "volume": sa.BigInteger,
+    },
+    "uq_asset_prices_asset_date",
+)
+
+indicator_staging = StagingTable(
+    EconomicIndicator.__table__,
+    {
+        "indicator_type": sa.String,
+        "indicator_name": sa.String,
+        "value": sa.Double,
+        "currency": sa.String,
+        "date": sa.Date,
+        "source": sa.String,
+    },
+    "uq_econ_indicators_type_date",
+)
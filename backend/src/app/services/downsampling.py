@@ -0,0 +1,86 @@
+"""Shape-preserving downsampling of chart series.
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013): the series is split into
+equal-count buckets and one point is kept per bucket, the one forming the
+largest triangle with the point kept from the previous bucket and the mean
+of the next bucket. Unlike keeping every n-th point, this retains peaks and
+troughs such as drawdown lows.
+
+Pure NumPy. Bucket bounds, next-bucket means and the candidate matrix are
+built with a few array operations; only the per-bucket pick, which depends
+on the previous pick, runs in a loop of one small dot product per bucket.
+That loop dominates: about 2.5 µs per output point, so 10k → 250 points
+(the backtest default) takes ~0.6 ms and 10k → 1000 ~2.3 ms
+(benchmarks/bench_lttb.py).
+"""
+
+import numpy as np
+
+
+def lttb_indices(y: np.ndarray, max_points: int, x: np.ndarray | None = None) -> np.ndarray:
+    """Indices of the points to keep when downsampling ``(x, y)`` to ``max_points``.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        (n,) finite values.
+    max_points : int
+        Target number of points, at least 3. The first and last points are
+        always kept.
+    x : np.ndarray, optional
+        (n,) increasing positions, e.g. dates as day numbers. Defaults to
+        ``arange(n)``.
+
+    Returns
+    -------
+    np.ndarray of sorted int64 indices, ``min(n, max_points)`` long.
+    """
+    if max_points < 3:
+        raise ValueError("max_points must be at least 3")
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n, dtype=np.int64)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Bucket b covers [edges[b], edges[b + 1]); points 0 and n-1 sit outside
+    # every bucket and are always kept.
+    n_buckets = max_points - 2
+    edges = (np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    starts = edges[:-1]
+    counts = np.diff(edges)
+
+    # Third triangle vertex: mean of the next bucket, or the last point
+    next_x = np.append(np.add.reduceat(x[:n - 1], starts[1:]) / counts[1:], x[-1])
+    next_y = np.append(np.add.reduceat(y[:n - 1], starts[1:]) / counts[1:], y[-1])
+
+    # (bucket, slot, [x, y, 1]) candidates; short buckets repeat their last
+    # point, which can't beat its first occurrence in argmax
+    width = int(counts.max())
+    slots = np.minimum(starts[:, None] + np.arange(width), (edges[1:] - 1)[:, None])
+    candidates = np.empty((n_buckets, width, 3))
+    candidates[..., 0] = x[slots]
+    candidates[..., 1] = y[slots]
+    candidates[..., 2] = 1.0
+
+    # Twice the triangle area for candidate (px, py), previous pick (ax, ay)
+    # and next mean (cx, cy) is |px·(cy - ay) + py·(ax - cx) + (cx·ay - ax·cy)|,
+    # linear in the candidate, so each bucket is a single dot product.
+    keep = [0] * max_points
+    keep[-1] = n - 1
+    coef = np.empty(3)
+    area = np.empty(width)
+    picked = 0
+    for b, (bucket, start, cx, cy) in enumerate(
+        zip(candidates, starts.tolist(), next_x.tolist(), next_y.tolist(), strict=True), start=1,
+    ):
+        ax, ay = x.item(picked), y.item(picked)
+        coef[0] = cy - ay
+        coef[1] = ax - cx
+        coef[2] = cx * ay - ax * cy
+        np.dot(bucket, coef, out=area)
+        picked = start + int(np.absolute(area, out=area).argmax())
+        keep[b] = picked
+
+    return np.asarray(keep, dtype=np.int64)
@@ -0,0 +1,214 @@
+"""Efficient frontier as a sweep of one parametrized convex problem.
+
+Each frontier point is a minimum-variance portfolio for a target return:
+
+    minimize    wᵀΣw
+    subject to  μᵀw ≥ target,  Σw = 1,  0 ≤ w ≤ max_weight
+
+Only ``target`` changes between points. The QP is set up once in an OSQP
+workspace (matrix scaling and KKT factorization included); each point
+then only updates the lower bound of the return row and warm-starts from
+the previous point's solution, which is close by construction. Building
+an ``EfficientFrontier`` per point would instead re-parse and cold-solve
+it, and even a cvxpy Parameter re-stuffs the full problem data on every
+solve, which costs far more than the warm-started iterations themselves.
+
+The maximum-return end is a vertex of the feasible set where first-order
+solvers converge slowly; it is computed directly instead, and any point
+OSQP fails to converge on is re-solved cold with Clarabel through cvxpy.
+
+With a factor model Σ = B·F·Bᵀ + D the QP is posed over (w, y) with y = Bᵀw
+and objective wᵀDw + yᵀFy, so the workspace holds O(n·k) entries instead of
+a dense n×n block.
+
+The objective's sparsity pattern depends only on the problem's dimensions,
+so the same workspace can also be re-solved for a different covariance of
+the same shape (see ``FrontierProblem.update_covariance``).
+"""
+
+import logging
+
+import cvxpy as cp
+import numpy as np
+import osqp
+import scipy.sparse as sp
+
+from src.app.services.factor_model import FactorCovariance
+from src.app.services.risk_model import RiskModel
+
+logger = logging.getLogger(__name__)
+
+OSQP_SOLVED = (osqp.constant("OSQP_SOLVED"), osqp.constant("OSQP_SOLVED_INACCURATE"))
+OSQP_SETTINGS = {
+    "eps_abs": 1e-5,
+    "eps_rel": 1e-5,
+    # Warm-started solves usually need tens of iterations; past this, switch solvers
+    "max_iter": 4000,
+    "polishing": True,
+    "verbose": False,
+}
+
+
+def max_return_weights(mu: np.ndarray, max_weight: float) -> np.ndarray:
+    """Weights maximizing μᵀw under the box and budget constraints: fill the best assets first."""
+    weights = np.zeros(len(mu))
+    remaining = 1.0
+    for i in np.argsort(mu)[::-1]:
+        weights[i] = min(max_weight, remaining)
+        remaining -= weights[i]
+        if remaining <= 0:
+            break
+    return weights
+
+
+def _upper_indices(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row and column indices of an n×n upper triangle in column-major (CSC) order."""
+    cols, rows = np.tril_indices(n)
+    return rows, cols
+
+
+def _objective_data(cov: np.ndarray | FactorCovariance) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSC (data, indices, indptr) of the upper-triangular QP objective.
+
+    Every entry of the pattern is stored, zero or not, so that a covariance
+    of the same shape only changes ``data``.
+    """
+    if isinstance(cov, FactorCovariance):
+        n, k = len(cov.symbols), cov.n_factors
+        rows, cols = _upper_indices(k)
+        data = np.concatenate((cov.specific_var, cov.factor_cov[rows, cols]))
+        indices = np.concatenate((np.arange(n), n + rows))
+        counts = np.concatenate((np.ones(n, dtype=int), np.arange(1, k + 1)))
+    else:
+        rows, cols = _upper_indices(len(cov))
+        data, indices, counts = cov[rows, cols], rows, np.arange(1, len(cov) + 1)
+    return data, indices, np.concatenate(([0], np.cumsum(counts)))
+
+
+class FrontierProblem:
+    """Min-variance-for-target-return QP compiled once and re-solved per target.
+
+    Constraint rows are [μᵀ; 1ᵀ; I] with bounds [target, 1, 0] ≤ · ≤ [∞, 1, max_weight];
+    only the first lower bound moves between solves. A factor model adds k
+    columns for y and k rows Bᵀw − y = 0.
+    """
+
+    def __init__(self, mu: np.ndarray, cov: np.ndarray | FactorCovariance, max_weight: float):
+        n = len(mu)
+        self.mu = mu
+        self.cov = cov
+        self.max_weight = max_weight
+        self.lower = np.concatenate(([-np.inf, 1.0], np.zeros(n)))
+        upper = np.concatenate(([np.inf, 1.0], np.full(n, max_weight)))
+        constraints = sp.vstack(
+            [sp.csc_matrix(mu[None, :]), sp.csc_matrix(np.ones((1, n))), sp.identity(n, format="csc")],
+            format="csc",
+        )
+        size = n
+        if isinstance(cov, FactorCovariance):
+            k = cov.n_factors
+            size += k
+            constraints = sp.bmat(
+                [[constraints, None], [sp.csc_matrix(cov.loadings.T), -sp.identity(k)]], format="csc",
+            )
+            self.lower = np.concatenate((self.lower, np.zeros(k)))
+            upper = np.concatenate((upper, np.zeros(k)))
+        objective = sp.csc_matrix(_objective_data(cov), shape=(size, size))
+        self.solver = osqp.OSQP()
+        self.solver.setup(
+            P=objective, q=np.zeros(objective.shape[0]), A=constraints, l=self.lower, u=upper, **OSQP_SETTINGS,
+        )
+
+    def update_covariance(self, cov: np.ndarray | FactorCovariance) -> None:
+        """Swap in another covariance of the same shape (for a factor model, the same loadings).
+
+        Only the objective's values change; the next solve warm-starts from
+        the previous solution.
+        """
+        self.cov = cov
+        self.solver.update(Px=_objective_data(cov)[0])
+
+    def solve(self, target: float) -> np.ndarray | None:
+        """Minimum-variance weights reaching ``target``, or None if no solver converged."""
+        self.lower[0] = target
+        self.solver.update(l=self.lower)
+        result = self.solver.solve(raise_error=False)
+        if result.info.status_val in OSQP_SOLVED:
+            weights = result.x[:len(self.mu)]
+        else:
+            logger.info(f"OSQP stopped after {result.info.iter} iterations at target {target:.4f}; using Clarabel")
+            weights = self._solve_cold(target)
+            if weights is None:
+                return None
+        weights = np.clip(weights, 0.0, self.max_weight)
+        return weights / weights.sum()
+
+    def _solve_cold(self, target: float) -> np.ndarray | None:
+        w = cp.Variable(len(self.mu))
+        if isinstance(self.cov, FactorCovariance):
+            variance = cp.sum_squares(self.cov.exposures.T @ w) + cp.sum_squares(
+                cp.multiply(np.sqrt(self.cov.specific_var), w)
+            )
+        else:
+            variance = cp.quad_form(w, cp.psd_wrap(self.cov))
+        problem = cp.Problem(
+            cp.Minimize(variance),
+            [self.mu @ w >= target, cp.sum(w) == 1, w >= 0, w <= self.max_weight],
+        )
+        problem.solve(solver=cp.CLARABEL)
+        return w.value if problem.status in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE) else None
+
+
+def solve_frontier(
+    risk_model: RiskModel,
+    n_points: int,
+    max_weight: float,
+    risk_free_rate: float,
+) -> list[dict]:
+    """Trace ``n_points`` frontier portfolios from minimum variance to maximum return.
+
+    Pure function of its arguments so it can run on the compute pool.
+    Returns points ordered by volatility, each {"expected_return",
+    "volatility", "sharpe_ratio", "weights"}, with the risk and return
+    measured on the same mu/cov the frontier was optimized over.
+    """
+    symbols = risk_model.symbols
+    mu = risk_model.mu[symbols].to_numpy(dtype=np.float64)
+    if isinstance(risk_model.cov, FactorCovariance):
+        cov = risk_model.cov.subset(symbols)
+    else:
+        cov = risk_model.cov.loc[symbols, symbols].to_numpy(dtype=np.float64)
+    if max_weight * len(symbols) < 1:
+        raise ValueError("1銘柄あたりの上限比率が低すぎるため、配分の合計が100%になりません。")
+
+    frontier = FrontierProblem(mu, cov, max_weight)
+
+    # Without a return floor the first solve is the global minimum-variance portfolio
+    min_variance = frontier.solve(-np.inf)
+    if min_variance is None:
+        raise ValueError("効率的フロンティアを計算できませんでした。")
+    top = max_return_weights(mu, max_weight)
+    low, high = float(mu @ min_variance), float(mu @ top)
+
+    points = []
+    for i, target in enumerate(np.linspace(low, max(low, high), n_points)):
+        if i == 0:
+            weights = min_variance
+        elif i == n_points - 1:
+            weights = top
+        else:
+            weights = frontier.solve(float(target))
+        if weights is None:
+            logger.warning(f"Frontier point at target return {target:.4f} did not solve; skipping")
+            continue
+        expected_return = float(mu @ weights)
+        variance = cov.variance(weights) if isinstance(cov, FactorCovariance) else weights @ cov @ weights
+        volatility = float(np.sqrt(max(variance, 0.0)))
+        points.append({
+            "expected_return": round(expected_return, 4),
+            "volatility": round(volatility, 4),
+            "sharpe_ratio": round((expected_return - risk_free_rate) / volatility, 4) if volatility > 0 else 0.0,
+            "weights": {s: round(float(w), 4) for s, w in zip(symbols, weights, strict=True) if w > 0.001},
+        })
+
+    return points
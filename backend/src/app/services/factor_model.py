@@ -0,0 +1,180 @@
+"""Low-rank factor covariance for large universes.
+
+The covariance is held as Σ = B·F·Bᵀ + D: n×k loadings B, a k×k factor
+covariance F and per-asset specific variances D, with k (tens) ≪ n
+(thousands). Storage is O(n·k) instead of O(n²), and everything the
+optimizer needs is computed from the factors without forming Σ:
+
+- portfolio variance wᵀΣw = |Gᵀw|² + Σ dᵢwᵢ², where G = B·F^½,
+- products Σx in O(n·k),
+- solves with Σ + diag(s) by the Woodbury identity in O(n·k²),
+- min-variance / max-Sharpe QPs with k auxiliary variables y = Gᵀw, so the
+  solver sees O(n·k) nonzeros rather than a dense n×n quadratic.
+
+Factors are statistical: the leading principal components of the demeaned
+daily returns, found with a randomized SVD that touches the T×n return
+matrix a few times and never the n×n covariance.
+"""
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# Randomized SVD: extra sampled directions and power iterations for accuracy
+_OVERSAMPLE = 10
+_POWER_ITERATIONS = 4
+# Keeps D (and so Σ) positive definite when a factor explains an asset entirely
+_MIN_SPECIFIC_VARIANCE = 1e-10
+
+
+class FactorCovariance:
+    """Annualized covariance B·F·Bᵀ + diag(specific_var) over ``symbols``.
+
+    Attributes
+    ----------
+    symbols : list[str]
+        Asset order of the rows of ``loadings`` and ``specific_var``.
+    loadings : np.ndarray
+        (n, k) factor loadings B.
+    factor_cov : np.ndarray
+        (k, k) factor covariance F.
+    specific_var : np.ndarray
+        (n,) specific (idiosyncratic) variances D.
+    exposures : np.ndarray
+        (n, k) G = B·F^½, so that Σ = G·Gᵀ + D.
+    """
+
+    def __init__(self, symbols: list[str], loadings: np.ndarray, factor_cov: np.ndarray, specific_var: np.ndarray):
+        self.symbols = list(symbols)
+        self.loadings = loadings
+        self.factor_cov = factor_cov
+        self.specific_var = specific_var
+        eigenvalues, eigenvectors = np.linalg.eigh(factor_cov)
+        self.exposures = loadings @ (eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None)))
+
+    @property
+    def n_factors(self) -> int:
+        return self.loadings.shape[1]
+
+    def variance(self, weights: np.ndarray) -> float:
+        """Portfolio variance wᵀΣw."""
+        factor_exposure = self.exposures.T @ weights
+        return float(factor_exposure @ factor_exposure + self.specific_var @ weights**2)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Σx."""
+        return self.exposures @ (self.exposures.T @ x) + self.specific_var * x
+
+    def diagonal(self) -> np.ndarray:
+        """Asset variances diag(Σ)."""
+        return np.einsum("ij,ij->i", self.exposures, self.exposures) + self.specific_var
+
+    def solve_shifted(self, shift: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """Solve (Σ + diag(shift))·x = rhs by the Woodbury identity.
+
+        With A = D + diag(shift): x = A⁻¹r − A⁻¹G·(I + GᵀA⁻¹G)⁻¹·GᵀA⁻¹r,
+        one k×k Cholesky solve.
+        """
+        inv_a = 1.0 / (self.specific_var + shift)
+        scaled = self.exposures * inv_a[:, None]
+        capacitance = np.eye(self.n_factors) + self.exposures.T @ scaled
+        a_inv_rhs = inv_a * rhs
+        correction = np.linalg.solve(capacitance, self.exposures.T @ a_inv_rhs)
+        return a_inv_rhs - scaled @ correction
+
+    def subset(self, symbols: list[str]) -> "FactorCovariance":
+        """The model restricted to ``symbols`` (rows of B and D; F is shared)."""
+        positions = {s: i for i, s in enumerate(self.symbols)}
+        idx = [positions[s] for s in symbols]
+        return FactorCovariance(symbols, self.loadings[idx], self.factor_cov, self.specific_var[idx])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dense n×n covariance, for consumers that need every pairwise entry."""
+        dense = self.exposures @ self.exposures.T
+        dense[np.diag_indices_from(dense)] += self.specific_var
+        return pd.DataFrame(dense, index=self.symbols, columns=self.symbols)
+
+
+def fit_statistical_factors(
+    returns: np.ndarray, symbols: list[str], n_factors: int, seed: int = 0,
+) -> FactorCovariance:
+    """PCA factor model of a (days × assets) daily-return matrix without NaNs.
+
+    The k leading principal components of the demeaned returns are the
+    factors; each asset's specific variance is the variance of what they
+    leave unexplained, so diag(Σ) matches the sample variances (to the
+    accuracy of the truncated SVD).
+    """
+    n_days, n_assets = returns.shape
+    k = max(1, min(n_factors, n_assets - 1, n_days - 1))
+    demeaned = returns - returns.mean(axis=0)
+
+    _, singular_values, components = _randomized_svd(demeaned, k, seed)
+    loadings = components.T
+    factor_returns = demeaned @ loadings
+    residual = demeaned - factor_returns @ loadings.T
+
+    scale = TRADING_DAYS / (n_days - 1)
+    return FactorCovariance(
+        symbols,
+        loadings,
+        np.diag(singular_values**2 * scale),
+        np.maximum(np.einsum("ij,ij->j", residual, residual) * scale, _MIN_SPECIFIC_VARIANCE),
+    )
+
+
+def _randomized_svd(matrix: np.ndarray, k: int, seed: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-k SVD (Halko, Martinsson & Tropp, 2011) in O(rows·cols·k) time."""
+    rows, cols = matrix.shape
+    rank = min(k + _OVERSAMPLE, rows, cols)
+    rng = np.random.default_rng(seed)
+    basis = matrix @ rng.standard_normal((cols, rank))
+    for _ in range(_POWER_ITERATIONS):
+        basis, _ = np.linalg.qr(basis)
+        basis, _ = np.linalg.qr(matrix.T @ basis)
+        basis = matrix @ basis
+    basis, _ = np.linalg.qr(basis)
+    u, s, vt = np.linalg.svd(basis.T @ matrix, full_matrices=False)
+    return (basis @ u)[:, :k], s[:k], vt[:k]
+
+
+# ------------------------------------------------------------------ #
+#  Optimization on the factor form
+# ------------------------------------------------------------------ #
+
+
+def _portfolio_variance_expr(cov: FactorCovariance, w: cp.Variable) -> cp.Expression:
+    return cp.sum_squares(cov.exposures.T @ w) + cp.sum_squares(cp.multiply(np.sqrt(cov.specific_var), w))
+
+
+def min_variance_weights(cov: FactorCovariance, max_weight: float) -> np.ndarray:
+    """Long-only minimum-variance weights with 0 ≤ wᵢ ≤ max_weight."""
+    w = cp.Variable(len(cov.symbols))
+    problem = cp.Problem(cp.Minimize(_portfolio_variance_expr(cov, w)), [cp.sum(w) == 1, w >= 0, w <= max_weight])
+    problem.solve(solver=cp.CLARABEL)
+    if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+        raise ValueError(f"Minimum-variance solve failed: {problem.status}")
+    return np.clip(w.value, 0.0, None)
+
+
+def max_sharpe_weights(mu: np.ndarray, cov: FactorCovariance, risk_free_rate: float, max_weight: float) -> np.ndarray:
+    """Long-only maximum-Sharpe weights with 0 ≤ wᵢ ≤ max_weight.
+
+    Solved as the convex problem over x = κ·w (Cornuejols & Tütüncü):
+    minimize xᵀΣx subject to (μ − r_f)ᵀx = 1, 1ᵀx = κ, 0 ≤ x ≤ κ·max_weight.
+    """
+    excess = mu - risk_free_rate
+    if not np.any(excess > 0):
+        raise ValueError("At least one asset must have an expected return exceeding the risk-free rate")
+    x = cp.Variable(len(cov.symbols))
+    kappa = cp.Variable()
+    problem = cp.Problem(
+        cp.Minimize(_portfolio_variance_expr(cov, x)),
+        [excess @ x == 1, cp.sum(x) == kappa, x >= 0, x <= kappa * max_weight],
+    )
+    problem.solve(solver=cp.CLARABEL)
+    if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE) or kappa.value <= 0:
+        raise ValueError(f"Maximum-Sharpe solve failed: {problem.status}")
+    return np.clip(x.value / kappa.value, 0.0, None)
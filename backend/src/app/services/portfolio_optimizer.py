@@ -6,27 +6,36 @@ Supports strategies:
 - max_sharpe: Maximum Sharpe ratio
 - risk_parity: Risk parity (equal risk contribution)
 - equal_weight: 1/N allocation
+- resampled: Michaud resampled minimum variance (see resampling.py)
 
-Uses Ledoit-Wolf shrinkage for covariance estimation.
+Uses Ledoit-Wolf shrinkage for covariance estimation. Return and covariance
+estimates come from the shared RiskModel cache (see risk_model.py). With a
+factor risk model the strategies and metrics work on its low-rank form
+(see factor_model.py); only HRP, which clusters on every pairwise
+correlation, expands it to a dense matrix.
 """
 
+import asyncio
 import logging
 
 import numpy as np
 import pandas as pd
-from pypfopt import (
-    CovarianceShrinkage,
-    EfficientFrontier,
-    HRPOpt,
-    expected_returns,
-    risk_models,
-)
+from pypfopt import EfficientFrontier, HRPOpt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.cache import LRUCache
+from src.app.core.config import settings
 from src.app.models.asset import Asset
-from src.app.models.asset_price import AssetPrice
 from src.app.models.economic_indicator import EconomicIndicator
+from src.app.services.compute_executor import ComputeTimeoutError, compute_executor
+from src.app.services.covariance import covariance_store
+from src.app.services.efficient_frontier import solve_frontier
+from src.app.services.factor_model import FactorCovariance, max_sharpe_weights, min_variance_weights
+from src.app.services.price_store import price_store
+from src.app.services.resampling import average_weights, resampled_min_variance, sample_chunks, solve_resampled
+from src.app.services.risk_model import RiskModel, risk_model_cache, risk_model_from_incremental
+from src.app.services.risk_parity import solve_risk_parity
 
 logger = logging.getLogger(__name__)
 
@@ -55,9 +64,123 @@ STRATEGY_NAMES = {
     "max_sharpe": "積極型ポートフォリオ",
     "risk_parity": "リスクパリティポートフォリオ",
     "equal_weight": "均等配分ポートフォリオ",
+    "resampled": "リサンプリング安定型ポートフォリオ",
 }
 
 
+DEFAULT_MAX_WEIGHT = 0.30
+
+DEFAULT_FRONTIER_POINTS = 20
+
+# Fixed so the resampled weights only change when the market data does
+RESAMPLING_SEED = 0
+
+# Optimization results keyed by (risk_tolerance, strategy, constraints, covariance method, market-data version)
+optimization_cache = LRUCache(settings.OPTIMIZATION_CACHE_SIZE)
+
+# Last risk-parity weights per request shape (the cache key without the data
+# version), used to warm-start the solve after the next market-data update
+risk_parity_warm_starts = LRUCache(settings.OPTIMIZATION_CACHE_SIZE)
+
+
+def _normalize_constraints(constraints: dict | None) -> tuple | None:
+    """Hashable, order-independent form of the constraints dict for cache keys."""
+    if constraints is None:
+        return None
+    return tuple(sorted(
+        (key, tuple(sorted(value)) if isinstance(value, list) else value)
+        for key, value in constraints.items()
+    ))
+
+
+def _max_weight(constraints: dict | None) -> float:
+    if constraints and "max_single_asset_weight" in constraints:
+        return constraints["max_single_asset_weight"]
+    return DEFAULT_MAX_WEIGHT
+
+
+def _resampling_inputs(risk_model: RiskModel) -> tuple[np.ndarray, np.ndarray | FactorCovariance]:
+    """mu and cov as arrays in ``risk_model.symbols`` order, for the resampled solver."""
+    symbols = risk_model.symbols
+    if risk_model.n_observations is None:
+        raise ValueError("Risk model has no observation count to resample from")
+    mu = risk_model.mu[symbols].to_numpy(dtype=np.float64)
+    if isinstance(risk_model.cov, FactorCovariance):
+        return mu, risk_model.cov.subset(symbols)
+    return mu, risk_model.cov.loc[symbols, symbols].to_numpy(dtype=np.float64)
+
+
+def _cache_key(
+    risk_tolerance: str, strategy: str, constraints: dict | None, covariance_method: str, data_version: int | tuple,
+) -> tuple:
+    return (risk_tolerance, strategy, _normalize_constraints(constraints), covariance_method, data_version)
+
+
+def solve_portfolio(
+    strategy: str,
+    risk_model: RiskModel,
+    risk_free_rate: float,
+    constraints: dict | None,
+    warm_start: dict[str, float] | None = None,
+) -> tuple[str, dict[str, float], dict]:
+    """Optimize weights and compute metrics from a risk model.
+
+    Pure function of its arguments so it can run on the compute pool.
+    ``warm_start`` (previous weights by symbol) seeds the risk-parity solver.
+    Returns (strategy actually used, normalized weights, metrics); falls back
+    to equal_weight if the requested strategy fails.
+    """
+    optimizer = PortfolioOptimizer(session=None)
+    symbols = risk_model.symbols
+
+    # Optimize based on strategy
+    try:
+        if strategy == "min_volatility":
+            weights = optimizer._optimize_min_volatility(risk_model.mu, risk_model.cov, constraints)
+        elif strategy == "hrp":
+            weights = optimizer._optimize_hrp(risk_model.sample_cov)
+        elif strategy == "max_sharpe":
+            weights = optimizer._optimize_max_sharpe(risk_model.mu, risk_model.cov, risk_free_rate, constraints)
+        elif strategy == "risk_parity":
+            weights = optimizer._optimize_risk_parity(risk_model.cov, warm_start)
+        elif strategy == "equal_weight":
+            weights = optimizer._optimize_equal_weight(symbols)
+        elif strategy == "resampled":
+            weights = optimizer._optimize_resampled(risk_model, constraints)
+        else:
+            weights = optimizer._optimize_hrp(risk_model.sample_cov)
+    except Exception as e:
+        logger.warning(f"Optimization failed for {strategy}: {e}. Falling back to equal_weight.")
+        weights = optimizer._optimize_equal_weight(symbols)
+        strategy = "equal_weight"
+
+    return _finalize_portfolio(optimizer, strategy, weights, risk_model, risk_free_rate)
+
+
+def _finalize_portfolio(
+    optimizer: "PortfolioOptimizer",
+    strategy: str,
+    weights: dict[str, float],
+    risk_model: RiskModel,
+    risk_free_rate: float,
+) -> tuple[str, dict[str, float], dict]:
+    """Drop near-zero weights, renormalize and compute metrics: the tail of ``solve_portfolio``."""
+    # Filter out near-zero weights
+    weights = {k: float(v) for k, v in weights.items() if v > 0.001}
+
+    # Normalize weights to sum to 1
+    total_weight = sum(weights.values())
+    if total_weight > 0:
+        weights = {k: v / total_weight for k, v in weights.items()}
+
+    # Calculate metrics
+    metrics = optimizer._calculate_metrics(
+        weights, risk_model.mean_returns, risk_model.sample_cov, risk_free_rate,
+    )
+
+    return strategy, weights, metrics
+
+
 class PortfolioOptimizer:
     """PyPortfolioOpt-based portfolio optimization engine."""
 
@@ -73,15 +196,239 @@ class PortfolioOptimizer:
         investment_amount: int | None = None,
         currency: str = "JPY",
         constraints: dict | None = None,
+        covariance_method: str = "ledoit_wolf",
     ) -> dict:
         """Main entry point for portfolio optimization.
 
+        Weights and metrics depend only on the strategy, constraints and market
+        data, so they are cached per (request shape, market-data version); only
+        the per-user fields (amounts, risk profile, currency) are rebuilt here.
+
+        ``covariance_method`` is "ledoit_wolf" (estimated from the full price
+        history), "ewma" (the pipeline-maintained incremental state) or
+        "factor" (a PCA factor model, for large universes).
+
         Returns a dict matching PortfolioResponse schema.
         """
         # Auto-select strategy
         if strategy == "auto":
             strategy = self._auto_select_strategy(risk_tolerance)
 
+        data_version = await price_store.refresh(self.session)
+        cache_version = await self._cache_version(data_version, covariance_method)
+        cache_key = _cache_key(risk_tolerance, strategy, constraints, covariance_method, cache_version)
+        result = optimization_cache.get(cache_key)
+        if result is None:
+            result = await self._compute_allocation(
+                risk_tolerance, strategy, constraints, data_version, covariance_method,
+            )
+            optimization_cache.put(cache_key, result)
+
+        return self._build_response(result, risk_score, risk_tolerance, investment_amount, currency)
+
+    async def compare(
+        self,
+        risk_score: int,
+        risk_tolerance: str,
+        investment_horizon: str,
+        strategies: list[str],
+        investment_amount: int | None = None,
+        currency: str = "JPY",
+        constraints: dict | None = None,
+        covariance_method: str = "ledoit_wolf",
+    ) -> list[dict]:
+        """Optimize several strategies on one universe, in the order given (duplicates dropped).
+
+        Strategies missing from the cache share a single asset selection,
+        price load, risk model and risk-free rate, and are solved
+        concurrently on the compute pool. Results are cached per strategy,
+        so they're also served to later ``optimize`` calls and vice versa.
+
+        Returns a list of dicts matching PortfolioResponse schema.
+        """
+        strategies = list(dict.fromkeys(strategies))
+
+        data_version = await price_store.refresh(self.session)
+        cache_version = await self._cache_version(data_version, covariance_method)
+        cache_keys = {
+            s: _cache_key(risk_tolerance, s, constraints, covariance_method, cache_version) for s in strategies
+        }
+        results = {s: optimization_cache.get(key) for s, key in cache_keys.items()}
+
+        missing = [s for s, result in results.items() if result is None]
+        if missing:
+            computed = await self._compute_allocations(
+                risk_tolerance, missing, constraints, data_version, covariance_method,
+            )
+            for strategy, result in zip(missing, computed, strict=True):
+                optimization_cache.put(cache_keys[strategy], result)
+                results[strategy] = result
+
+        return [
+            self._build_response(results[s], risk_score, risk_tolerance, investment_amount, currency)
+            for s in strategies
+        ]
+
+    async def frontier(
+        self,
+        risk_tolerance: str,
+        n_points: int = DEFAULT_FRONTIER_POINTS,
+        constraints: dict | None = None,
+        covariance_method: str = "ledoit_wolf",
+    ) -> dict:
+        """Efficient frontier of the selected universe, from minimum variance to maximum return.
+
+        Uses the same asset selection and risk model as ``optimize``; the
+        whole sweep runs as one compute-pool job. Cached like allocations.
+
+        Returns a dict matching FrontierResponse schema.
+        """
+        data_version = await price_store.refresh(self.session)
+        cache_version = await self._cache_version(data_version, covariance_method)
+        cache_key = (
+            "frontier", n_points, risk_tolerance, _normalize_constraints(constraints), covariance_method, cache_version,
+        )
+        result = optimization_cache.get(cache_key)
+        if result is None:
+            _, risk_model, risk_free_rate = await self._load_inputs(
+                risk_tolerance, constraints, data_version, covariance_method,
+            )
+            points = await compute_executor.run(
+                solve_frontier, risk_model, n_points, _max_weight(constraints), risk_free_rate,
+            )
+            result = {"risk_free_rate": risk_free_rate, "points": points}
+            optimization_cache.put(cache_key, result)
+
+        return {"risk_free_rate": result["risk_free_rate"], "points": [dict(p) for p in result["points"]]}
+
+    def _build_response(
+        self,
+        result: dict,
+        risk_score: int,
+        risk_tolerance: str,
+        investment_amount: int | None,
+        currency: str,
+    ) -> dict:
+        """Add the per-user fields (amounts, risk profile, currency) to a cached allocation."""
+        allocations = [
+            {
+                "asset": dict(asset),
+                "weight": round(weight, 4),
+                "amount": round(investment_amount * weight) if investment_amount else None,
+            }
+            for asset, weight in result["holdings"]
+        ]
+
+        return {
+            "name": STRATEGY_NAMES.get(result["strategy"], result["strategy"]),
+            "strategy": result["strategy"],
+            "risk_profile": {
+                "risk_score": risk_score,
+                "risk_tolerance": risk_tolerance,
+            },
+            "metrics": dict(result["metrics"]),
+            "allocations": allocations,
+            "currency": currency,
+        }
+
+    async def _cache_version(self, data_version: int, covariance_method: str) -> int | tuple:
+        """Market-data component of result cache keys.
+
+        For "ewma" it also carries the worker's covariance state version: the
+        pipeline writes that state after committing prices, and workers reload
+        it on their own throttle, so one price version can be served with
+        either the old or the new state.
+        """
+        if covariance_method != "ewma":
+            return data_version
+        await covariance_store.get(self.session)
+        return data_version, covariance_store.updated_at
+
+    async def _compute_allocation(
+        self,
+        risk_tolerance: str,
+        strategy: str,
+        constraints: dict | None,
+        data_version: int,
+        covariance_method: str = "ledoit_wolf",
+    ) -> dict:
+        """Select assets, optimize and compute metrics (the cacheable part of ``optimize``).
+
+        Returns {"strategy", "metrics", "holdings"} where holdings is a list of
+        (asset summary, unrounded weight) sorted by weight descending.
+        """
+        (result,) = await self._compute_allocations(
+            risk_tolerance, [strategy], constraints, data_version, covariance_method,
+        )
+        return result
+
+    async def _compute_allocations(
+        self,
+        risk_tolerance: str,
+        strategies: list[str],
+        constraints: dict | None,
+        data_version: int,
+        covariance_method: str,
+    ) -> list[dict]:
+        """``_compute_allocation`` for several strategies over one data load, solved concurrently."""
+        assets, risk_model, risk_free_rate = await self._load_inputs(
+            risk_tolerance, constraints, data_version, covariance_method,
+        )
+
+        warm_key = (risk_tolerance, _normalize_constraints(constraints), covariance_method)
+        warm_start = risk_parity_warm_starts.get(warm_key) if "risk_parity" in strategies else None
+
+        # Solve off the event loop, one pool job per strategy (several for resampled)
+        solved = await asyncio.gather(*(
+            self._solve_resampled(risk_model, risk_free_rate, constraints) if strategy == "resampled"
+            else compute_executor.run(solve_portfolio, strategy, risk_model, risk_free_rate, constraints, warm_start)
+            for strategy in strategies
+        ))
+        for strategy, weights, _ in solved:
+            if strategy == "risk_parity":
+                risk_parity_warm_starts.put(warm_key, weights)
+
+        asset_map = {a.symbol: a for a in assets}
+        return [
+            {"strategy": strategy, "metrics": metrics, "holdings": self._build_holdings(asset_map, weights)}
+            for strategy, weights, metrics in solved
+        ]
+
+    async def _solve_resampled(
+        self, risk_model: RiskModel, risk_free_rate: float, constraints: dict | None,
+    ) -> tuple[str, dict[str, float], dict]:
+        """``solve_portfolio`` for the resampled strategy, with its draws spread over the compute pool.
+
+        The chunks and their seeds are those ``solve_resampled`` runs
+        sequentially, so both give the same weights.
+        """
+        n_samples = settings.RESAMPLED_SAMPLES
+        try:
+            mu, cov = _resampling_inputs(risk_model)
+            results = await asyncio.gather(*(
+                compute_executor.run(
+                    resampled_min_variance, mu, cov, _max_weight(constraints), count, risk_model.n_observations, seed,
+                )
+                for count, seed in sample_chunks(n_samples, RESAMPLING_SEED)
+            ))
+            weights = dict(zip(risk_model.symbols, average_weights(results, n_samples).tolist(), strict=True))
+            strategy = "resampled"
+        except ComputeTimeoutError:
+            raise
+        except Exception as e:
+            logger.warning(f"Optimization failed for resampled: {e}. Falling back to equal_weight.")
+            weights = self._optimize_equal_weight(risk_model.symbols)
+            strategy = "equal_weight"
+        return _finalize_portfolio(self, strategy, weights, risk_model, risk_free_rate)
+
+    async def _load_inputs(
+        self,
+        risk_tolerance: str,
+        constraints: dict | None,
+        data_version: int,
+        covariance_method: str,
+    ) -> tuple[list[Asset], RiskModel, float]:
+        """Selected assets, their risk model and the risk-free rate: everything the solvers need."""
         # Select assets
         assets = await self._select_assets(risk_tolerance, constraints)
         if len(assets) < 2:
@@ -102,74 +449,46 @@ class PortfolioOptimizer:
         # Forward-fill then drop remaining NaN rows
         prices_df = prices_df.ffill().dropna()
 
-        # Calculate returns
-        returns_df = self._calculate_returns(prices_df)
+        # Return/covariance estimates, shared with other strategies on this universe
+        risk_model = None
+        if covariance_method == "ewma":
+            risk_model = await self._incremental_risk_model(prices_df, assets)
+        if risk_model is None:
+            method = "factor" if covariance_method == "factor" else "ledoit_wolf"
+            risk_model = await risk_model_cache.get_or_estimate(prices_df, data_version, method)
 
         # Get risk-free rate
         risk_free_rate = await self._get_risk_free_rate()
 
-        # Optimize based on strategy
-        try:
-            if strategy == "min_volatility":
-                weights = self._optimize_min_volatility(returns_df, prices_df, constraints)
-            elif strategy == "hrp":
-                weights = self._optimize_hrp(returns_df)
-            elif strategy == "max_sharpe":
-                weights = self._optimize_max_sharpe(returns_df, prices_df, risk_free_rate, constraints)
-            elif strategy == "risk_parity":
-                weights = self._optimize_risk_parity(returns_df)
-            elif strategy == "equal_weight":
-                weights = self._optimize_equal_weight(prices_df.columns.tolist())
-            else:
-                weights = self._optimize_hrp(returns_df)
-        except Exception as e:
-            logger.warning(f"Optimization failed for {strategy}: {e}. Falling back to equal_weight.")
-            weights = self._optimize_equal_weight(prices_df.columns.tolist())
-            strategy = "equal_weight"
-
-        # Filter out near-zero weights
-        weights = {k: v for k, v in weights.items() if v > 0.001}
+        return assets, risk_model, risk_free_rate
 
-        # Normalize weights to sum to 1
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            weights = {k: v / total_weight for k, v in weights.items()}
-
-        # Calculate metrics
-        metrics = self._calculate_metrics(weights, returns_df, risk_free_rate)
-
-        # Build asset lookup
-        asset_map = {a.symbol: a for a in assets}
-
-        # Build allocations
-        allocations = []
+    def _build_holdings(self, asset_map: dict[str, Asset], weights: dict[str, float]) -> list[tuple[dict, float]]:
+        """(asset summary, weight) pairs sorted by weight descending."""
+        holdings = []
         for symbol, weight in sorted(weights.items(), key=lambda x: x[1], reverse=True):
             asset = asset_map.get(symbol)
             if not asset:
                 continue
-            amount = round(investment_amount * weight) if investment_amount else None
-            allocations.append({
-                "asset": {
+            holdings.append((
+                {
                     "symbol": asset.symbol,
                     "name_ja": asset.name_ja,
                     "asset_type": asset.asset_type,
                     "market": asset.market,
                 },
-                "weight": round(weight, 4),
-                "amount": amount,
-            })
-
-        return {
-            "name": STRATEGY_NAMES.get(strategy, strategy),
-            "strategy": strategy,
-            "risk_profile": {
-                "risk_score": risk_score,
-                "risk_tolerance": risk_tolerance,
-            },
-            "metrics": metrics,
-            "allocations": allocations,
-            "currency": currency,
-        }
+                weight,
+            ))
+        return holdings
+
+    async def _incremental_risk_model(self, prices: pd.DataFrame, assets: list[Asset]) -> RiskModel | None:
+        """Risk model from the pipeline's incremental covariance, or None if it doesn't cover the universe."""
+        state = await covariance_store.get(self.session)
+        ids_by_symbol = {a.symbol: a.id for a in assets}
+        asset_ids = [ids_by_symbol[s] for s in prices.columns]
+        if state is None or not state.covers(asset_ids):
+            logger.warning("Incremental covariance unavailable for this universe; using Ledoit-Wolf")
+            return None
+        return risk_model_from_incremental(state, asset_ids, prices)
 
     def _auto_select_strategy(self, risk_tolerance: str) -> str:
         strategy_map = {
@@ -193,33 +512,8 @@ class PortfolioOptimizer:
         return list(result.scalars().all())
 
     async def _get_price_matrix(self, assets: list[Asset]) -> pd.DataFrame:
-        """Build a price DataFrame (columns=symbols, index=date) from DB."""
-        asset_ids = {a.id: a.symbol for a in assets}
-
-        result = await self.session.execute(
-            select(AssetPrice)
-            .where(AssetPrice.asset_id.in_(asset_ids.keys()))
-            .order_by(AssetPrice.date)
-        )
-        prices = result.scalars().all()
-
-        if not prices:
-            return pd.DataFrame()
-
-        # Build dict of {symbol: {date: close_price}}
-        data: dict[str, dict] = {}
-        for p in prices:
-            symbol = asset_ids.get(p.asset_id)
-            if symbol:
-                if symbol not in data:
-                    data[symbol] = {}
-                close = float(p.adj_close) if p.adj_close else float(p.close)
-                data[symbol][p.date] = close
-
-        df = pd.DataFrame(data)
-        df.index = pd.to_datetime(df.index)
-        df = df.sort_index()
-        return df
+        """Build a price DataFrame (columns=symbols, index=date) from the shared price store."""
+        return await price_store.get_prices(self.session, {a.id: a.symbol for a in assets})
 
     def _calculate_returns(self, prices: pd.DataFrame) -> pd.DataFrame:
         """Calculate daily returns."""
@@ -239,63 +533,70 @@ class PortfolioOptimizer:
         return 0.04  # Default 4%
 
     def _optimize_min_volatility(
-        self, returns: pd.DataFrame, prices: pd.DataFrame, constraints: dict | None
+        self, mu: pd.Series, cov: pd.DataFrame | FactorCovariance, constraints: dict | None
     ) -> dict[str, float]:
         """Minimum variance optimization."""
-        mu = expected_returns.mean_historical_return(prices)
-        S = CovarianceShrinkage(prices).ledoit_wolf()
-
-        max_weight = 0.30
-        if constraints and "max_single_asset_weight" in constraints:
-            max_weight = constraints["max_single_asset_weight"]
-
-        ef = EfficientFrontier(mu, S, weight_bounds=(0, max_weight))
+        if isinstance(cov, FactorCovariance):
+            weights = min_variance_weights(cov, _max_weight(constraints))
+            return dict(zip(cov.symbols, weights.tolist(), strict=True))
+        ef = EfficientFrontier(mu, cov, weight_bounds=(0, _max_weight(constraints)))
         ef.min_volatility()
         return dict(ef.clean_weights())
 
-    def _optimize_hrp(self, returns: pd.DataFrame) -> dict[str, float]:
+    def _optimize_hrp(self, cov: pd.DataFrame | FactorCovariance) -> dict[str, float]:
         """Hierarchical Risk Parity optimization."""
-        hrp = HRPOpt(returns)
+        if isinstance(cov, FactorCovariance):
+            # The clustering step needs every pairwise distance
+            cov = cov.to_frame()
+        hrp = HRPOpt(cov_matrix=cov)
         hrp.optimize()
         return dict(hrp.clean_weights())
 
     def _optimize_max_sharpe(
-        self, returns: pd.DataFrame, prices: pd.DataFrame, risk_free_rate: float, constraints: dict | None
+        self, mu: pd.Series, cov: pd.DataFrame | FactorCovariance, risk_free_rate: float, constraints: dict | None
     ) -> dict[str, float]:
         """Maximum Sharpe ratio optimization."""
-        mu = expected_returns.mean_historical_return(prices)
-        S = CovarianceShrinkage(prices).ledoit_wolf()
-
-        max_weight = 0.30
-        if constraints and "max_single_asset_weight" in constraints:
-            max_weight = constraints["max_single_asset_weight"]
-
-        ef = EfficientFrontier(mu, S, weight_bounds=(0, max_weight))
+        if isinstance(cov, FactorCovariance):
+            weights = max_sharpe_weights(
+                mu[cov.symbols].to_numpy(dtype=np.float64), cov, risk_free_rate, _max_weight(constraints),
+            )
+            return dict(zip(cov.symbols, weights.tolist(), strict=True))
+        ef = EfficientFrontier(mu, cov, weight_bounds=(0, _max_weight(constraints)))
         ef.max_sharpe(risk_free_rate=risk_free_rate)
         return dict(ef.clean_weights())
 
-    def _optimize_risk_parity(self, returns: pd.DataFrame) -> dict[str, float]:
-        """Risk parity: equal risk contribution from each asset."""
-        cov = returns.cov().values
-        n = cov.shape[0]
-
-        # Inverse volatility as starting point
-        vols = np.sqrt(np.diag(cov))
-        inv_vols = 1.0 / vols
-        weights = inv_vols / inv_vols.sum()
-
-        # Simple iterative risk parity
-        for _ in range(100):
-            port_vol = np.sqrt(weights @ cov @ weights)
-            marginal_risk = (cov @ weights) / port_vol
-            risk_contribution = weights * marginal_risk
-            target_risk = port_vol / n
-
-            adjustment = target_risk / risk_contribution
-            weights = weights * adjustment
-            weights = weights / weights.sum()
-
-        return dict(zip(returns.columns, weights, strict=False))
+    def _optimize_risk_parity(
+        self, cov: pd.DataFrame | FactorCovariance, warm_start: dict[str, float] | None = None
+    ) -> dict[str, float]:
+        """Risk parity: equal risk contribution from each asset (see risk_parity.py)."""
+        symbols = cov.symbols if isinstance(cov, FactorCovariance) else cov.columns.tolist()
+        x0 = None
+        if warm_start:
+            x0 = np.array([warm_start.get(s, np.nan) for s in symbols])
+        solution = solve_risk_parity(
+            cov if isinstance(cov, FactorCovariance) else cov.values,
+            x0=x0,
+            tol=settings.RISK_PARITY_TOLERANCE,
+            max_iter=settings.RISK_PARITY_MAX_ITER,
+        )
+        message = (
+            f"Risk parity ({len(symbols)} assets{', warm start' if x0 is not None else ''}): "
+            f"{solution.iterations} iterations, residual {solution.residual:.2e}"
+        )
+        if solution.converged:
+            logger.info(message)
+        else:
+            logger.warning(f"{message} (not converged)")
+
+        return dict(zip(symbols, solution.weights.tolist(), strict=True))
+
+    def _optimize_resampled(self, risk_model: RiskModel, constraints: dict | None) -> dict[str, float]:
+        """Resampled minimum variance: the average over covariances redrawn around the estimate."""
+        mu, cov = _resampling_inputs(risk_model)
+        weights = solve_resampled(
+            mu, cov, _max_weight(constraints), settings.RESAMPLED_SAMPLES, risk_model.n_observations, RESAMPLING_SEED,
+        )
+        return dict(zip(risk_model.symbols, weights.tolist(), strict=True))
 
     def _optimize_equal_weight(self, symbols: list[str]) -> dict[str, float]:
         """Equal weight allocation (1/N)."""
@@ -304,23 +605,30 @@ class PortfolioOptimizer:
         return {s: weight for s in symbols}
 
     def _calculate_metrics(
-        self, weights: dict[str, float], returns: pd.DataFrame, risk_free_rate: float
+        self,
+        weights: dict[str, float],
+        mean_returns: pd.Series,
+        cov: pd.DataFrame | FactorCovariance,
+        risk_free_rate: float,
     ) -> dict:
-        """Calculate expected return, volatility, Sharpe ratio."""
+        """Calculate expected return, volatility, Sharpe ratio from annualized estimates."""
         symbols = list(weights.keys())
-        available = [s for s in symbols if s in returns.columns]
+        covered = set(cov.symbols) if isinstance(cov, FactorCovariance) else cov.columns
+        available = [s for s in symbols if s in covered]
         if not available:
             return {"expected_return": None, "volatility": None, "sharpe_ratio": None}
 
         w = np.array([weights[s] for s in available])
         w = w / w.sum()  # Renormalize
 
-        ret = returns[available]
-        mean_returns = ret.mean() * 252  # Annualize
-        cov_matrix = ret.cov() * 252
+        mean_returns = mean_returns[available]
+        if isinstance(cov, FactorCovariance):
+            variance = cov.subset(available).variance(w)
+        else:
+            variance = w @ cov.loc[available, available] @ w
 
         expected_return = float(w @ mean_returns)
-        volatility = float(np.sqrt(w @ cov_matrix @ w))
+        volatility = float(np.sqrt(variance))
         sharpe_ratio = (
             float((expected_return - risk_free_rate) / volatility) if volatility > 0 else 0.0
         )
@@ -0,0 +1,258 @@
+"""In-process columnar store of adjusted close prices.
+
+Keeps a date × asset float64 matrix of adjusted closes in memory so the
+optimizer and backtester don't rebuild a DataFrame from ORM rows on every
+request. Assets are loaded lazily on first use and reloaded only when their
+rows change:
+
+- in-process: the data pipeline calls ``invalidate()`` with the asset IDs it upserted
+- cross-process: a per-asset ``max(date)`` watermark query, answered from
+  the ``(asset_id, date)`` index and throttled to once every
+  ``PRICE_STORE_REFRESH_SECONDS``. The pipeline only appends dates after
+  an asset's last one, so a new last date is what a write looks like.
+  The same check watches each economic indicator's last date, since the
+  risk-free rate feeds the metrics of cached optimization results.
+
+Both paths bump ``version``, which result caches use as the market-data
+component of their keys.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import settings
+from src.app.models.asset import Asset
+from src.app.models.asset_price import AssetPrice
+from src.app.models.economic_indicator import EconomicIndicator
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_DATES = np.empty(0, dtype="datetime64[D]")
+_EMPTY_VALUES = np.empty(0, dtype=np.float64)
+
+
+def adjusted_closes(closes, adj_closes) -> np.ndarray:
+    """Price series used for returns: adj_close, falling back to close where it is missing or zero."""
+    closes = np.asarray(closes, dtype=np.float64)
+    adj_closes = np.asarray(adj_closes, dtype=np.float64)  # None -> NaN
+    return np.where(np.isnan(adj_closes) | (adj_closes == 0), closes, adj_closes)
+
+
+class PriceMatrixStore:
+    """Date × asset matrix of adjusted closes, shared by all requests in a worker.
+
+    The matrix is never mutated in place: a reload builds new arrays and swaps
+    them in, so DataFrames handed out earlier stay valid.
+    """
+
+    def __init__(self, refresh_seconds: float | None = None):
+        self.refresh_seconds = (
+            settings.PRICE_STORE_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        # asset_id -> (dates, closes), both sorted by date
+        self._series: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        # asset_id -> last price date as last seen in the DB
+        self._watermarks: dict[int, date] = {}
+        # indicator_type -> last date as last seen in the DB
+        self._indicator_watermarks: dict[str, date] = {}
+        self._stale: set[int] = set()
+        self._version = 0
+        self._checked_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self._dates = _EMPTY_DATES
+        self._index = pd.DatetimeIndex([])
+        self._matrix = np.empty((0, 0), dtype=np.float64, order="F")
+        self._columns: dict[int, int] = {}
+
+    @property
+    def version(self) -> int:
+        """Market-data version; bumped whenever price rows are known to have changed."""
+        return self._version
+
+    async def get_prices(
+        self,
+        session: AsyncSession,
+        assets: dict[int, str],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Return a price DataFrame (columns=symbols, index=date) for ``{asset_id: symbol}``.
+
+        Only dates on which at least one of the requested assets traded are
+        included, matching a direct ``asset_prices`` query.
+        """
+        await self._ensure_loaded(session, assets.keys())
+        return self._slice(assets, start_date, end_date)
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Run the throttled DB watermark check and return the current version."""
+        if self._check_due():
+            async with self._lock:
+                if self._check_due():
+                    await self._check_watermarks(session)
+        return self._version
+
+    def invalidate(self, asset_ids: Iterable[int] | None = None) -> None:
+        """Mark assets (or everything, if ``None``) for reload and bump the version."""
+        if asset_ids is None:
+            self._stale.update(self._series)
+        else:
+            self._stale.update(i for i in asset_ids if i in self._series)
+        self._version += 1
+
+    # ------------------------------------------------------------------ #
+    #  Loading
+    # ------------------------------------------------------------------ #
+
+    async def _ensure_loaded(self, session: AsyncSession, asset_ids: Iterable[int]) -> None:
+        await self.refresh(session)
+        asset_ids = list(asset_ids)
+        if not any(i not in self._series or i in self._stale for i in asset_ids):
+            return
+
+        async with self._lock:
+            pending = [i for i in asset_ids if i not in self._series or i in self._stale]
+            if not pending:
+                return
+
+            loaded = await self._load(session, pending)
+            for asset_id in pending:
+                dates, values = loaded.get(asset_id, (_EMPTY_DATES, _EMPTY_VALUES))
+                self._series[asset_id] = (dates, values)
+                if len(dates):
+                    self._watermarks[asset_id] = dates[-1].item()
+                else:
+                    self._watermarks.pop(asset_id, None)
+            self._stale.difference_update(pending)
+            self._rebuild()
+            logger.info(f"Price store loaded {len(pending)} assets ({len(self._dates)} dates)")
+
+    def _check_due(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.refresh_seconds
+
+    async def _check_watermarks(self, session: AsyncSession) -> None:
+        """Detect price and indicator rows written by another process (e.g. the nightly pipeline).
+
+        Loaded assets whose watermark moved are marked stale; any change at
+        all, including assets not loaded here and new indicator
+        observations, bumps the version.
+
+        The last date is a correlated ``max()`` per asset, which PostgreSQL
+        answers with one backward index probe each instead of aggregating
+        every price row.
+        """
+        self._checked_at = time.monotonic()
+        last_date = select(func.max(AssetPrice.date)).where(AssetPrice.asset_id == Asset.id).scalar_subquery()
+        result = await session.execute(select(Asset.id, last_date))
+        current = {asset_id: last for asset_id, last in result.all() if last is not None}
+        changed = {i for i in current.keys() | self._watermarks.keys() if current.get(i) != self._watermarks.get(i)}
+        self._watermarks = current
+
+        # Indicator rows are few; (indicator_type, date) is unique-indexed
+        result = await session.execute(
+            select(EconomicIndicator.indicator_type, func.max(EconomicIndicator.date))
+            .group_by(EconomicIndicator.indicator_type)
+        )
+        indicators = dict(result.all())
+        indicators_changed = indicators != self._indicator_watermarks
+        self._indicator_watermarks = indicators
+
+        if changed or indicators_changed:
+            self._stale.update(changed & self._series.keys())
+            self._version += 1
+
+    async def _load(
+        self, session: AsyncSession, asset_ids: list[int],
+    ) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """Fetch (date, close) columns for the given assets, split per asset."""
+        result = await session.execute(
+            select(AssetPrice.asset_id, AssetPrice.date, AssetPrice.close, AssetPrice.adj_close)
+            .where(AssetPrice.asset_id.in_(asset_ids))
+            .order_by(AssetPrice.asset_id, AssetPrice.date)
+        )
+        rows = result.all()
+        if not rows:
+            return {}
+
+        ids, dates, closes, adj_closes = zip(*rows, strict=True)
+        ids = np.asarray(ids, dtype=np.int64)
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        values = adjusted_closes(closes, adj_closes)
+
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+        starts = np.concatenate(([0], bounds))
+        return {
+            int(ids[s]): (d, v)
+            for s, d, v in zip(starts, np.split(dates, bounds), np.split(values, bounds), strict=True)
+        }
+
+    def _rebuild(self) -> None:
+        """Re-materialize the dense matrix from the per-asset series."""
+        loaded = {i: s for i, s in self._series.items() if len(s[0])}
+        if not loaded:
+            self._dates = _EMPTY_DATES
+            self._index = pd.DatetimeIndex([])
+            self._matrix = np.empty((0, 0), dtype=np.float64, order="F")
+            self._columns = {}
+            return
+
+        all_dates = np.unique(np.concatenate([d for d, _ in loaded.values()]))
+        matrix = np.full((len(all_dates), len(loaded)), np.nan, dtype=np.float64, order="F")
+        columns = {}
+        for col, (asset_id, (dates, values)) in enumerate(loaded.items()):
+            matrix[np.searchsorted(all_dates, dates), col] = values
+            columns[asset_id] = col
+
+        self._dates = all_dates
+        self._index = pd.DatetimeIndex(all_dates.astype("datetime64[ns]"))
+        self._matrix = matrix
+        self._columns = columns
+
+    # ------------------------------------------------------------------ #
+    #  Slicing
+    # ------------------------------------------------------------------ #
+
+    def _slice(
+        self, assets: dict[int, str], start_date: date | None, end_date: date | None,
+    ) -> pd.DataFrame:
+        present = [(self._columns[i], sym) for i, sym in assets.items() if i in self._columns]
+        if not present:
+            return pd.DataFrame()
+
+        lo = 0 if start_date is None else int(np.searchsorted(self._dates, np.datetime64(start_date, "D"), "left"))
+        hi = (
+            len(self._dates) if end_date is None
+            else int(np.searchsorted(self._dates, np.datetime64(end_date, "D"), "right"))
+        )
+        if lo >= hi:
+            return pd.DataFrame()
+
+        cols = [c for c, _ in present]
+        block = self._matrix[lo:hi]
+        if cols == list(range(cols[0], cols[0] + len(cols))):
+            block = block[:, cols[0]:cols[-1] + 1]  # contiguous columns: still a view
+        else:
+            block = block[:, cols]
+        index = self._index[lo:hi]
+
+        # Drop dates on which none of the requested assets have a price
+        has_data = ~np.isnan(block).all(axis=1)
+        if not has_data.all():
+            block = block[has_data]
+            index = index[has_data]
+        if len(block) == 0:
+            return pd.DataFrame()
+
+        return pd.DataFrame(block, index=index, columns=[s for _, s in present], copy=False)
+
+
+price_store = PriceMatrixStore()
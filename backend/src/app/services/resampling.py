@@ -0,0 +1,140 @@
+"""Resampled (Michaud) minimum-variance portfolios.
+
+A minimum-variance portfolio solved on one covariance estimate reacts to
+its estimation noise: a small change in the history can move weight
+between near-substitute assets wholesale. Resampling averages the
+solutions over many covariances the history could equally have produced:
+
+1. treat the risk model's covariance Σ as the truth,
+2. draw the sample covariance of T simulated days from N(0, Σ), T being
+   the number of daily returns Σ was estimated from,
+3. solve the long-only minimum-variance problem on each draw,
+4. average the weights, which still satisfy the (convex) constraints.
+
+Step 2 draws the sample covariance directly from its Wishart distribution
+(Bartlett decomposition), an n×n draw instead of T×n. With a factor model
+the factor covariance F is redrawn the same way and each specific
+variance from its scaled χ² distribution; the loadings are kept.
+
+Draws within a chunk share one ``FrontierProblem`` workspace: only the
+objective's values change between them, and each solve warm-starts from
+the previous draw's solution. Chunks are independent pool jobs with their
+own seeds, so results don't depend on how many workers run them.
+"""
+
+import logging
+
+import numpy as np
+
+from src.app.services.efficient_frontier import FrontierProblem
+from src.app.services.factor_model import FactorCovariance
+
+logger = logging.getLogger(__name__)
+
+# Draws per compute-pool job
+CHUNK_SAMPLES = 50
+
+
+def _matrix_root(cov: np.ndarray) -> np.ndarray:
+    """R with R·Rᵀ = cov, tolerating a positive semidefinite (singular) cov."""
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def _wishart_root(rng: np.random.Generator, n: int, df: int) -> np.ndarray:
+    """A with A·Aᵀ ~ Wishart(I, df): Bartlett's triangular factor when df ≥ n, else df Gaussian columns."""
+    if df < n:
+        return rng.standard_normal((n, df))
+    root = np.tril(rng.standard_normal((n, n)), -1)
+    root[np.diag_indices(n)] = np.sqrt(rng.chisquare(df - np.arange(n)))
+    return root
+
+
+def _sample_covariance(root: np.ndarray, df: int, rng: np.random.Generator) -> np.ndarray:
+    """Sample covariance (df degrees of freedom) of draws from N(0, root·rootᵀ)."""
+    scatter = root @ _wishart_root(rng, root.shape[1], df)
+    return scatter @ scatter.T / df
+
+
+def resample_covariance(
+    cov: np.ndarray | FactorCovariance, root: np.ndarray, df: int, rng: np.random.Generator,
+) -> np.ndarray | FactorCovariance:
+    """One resampled covariance; ``root`` is ``_matrix_root`` of cov (of F for a factor model)."""
+    if isinstance(cov, FactorCovariance):
+        specific_var = cov.specific_var * rng.chisquare(df, len(cov.specific_var)) / df
+        return FactorCovariance(cov.symbols, cov.loadings, _sample_covariance(root, df, rng), specific_var)
+    return _sample_covariance(root, df, rng)
+
+
+def resampled_min_variance(
+    mu: np.ndarray,
+    cov: np.ndarray | FactorCovariance,
+    max_weight: float,
+    n_samples: int,
+    n_observations: int,
+    seed: np.random.SeedSequence | int | None = None,
+) -> tuple[np.ndarray, int]:
+    """Sum of the minimum-variance weights over ``n_samples`` resampled covariances, and how many solved.
+
+    Pure function of its arguments so it can run on the compute pool.
+    ``mu`` only fills the (unbounded) return row of the shared QP.
+    """
+    if n_observations < 2:
+        raise ValueError("リサンプリングには2日以上のリターンが必要です。")
+    df = n_observations - 1
+    rng = np.random.default_rng(seed)
+    root = _matrix_root(cov.factor_cov if isinstance(cov, FactorCovariance) else cov)
+
+    total = np.zeros(len(mu))
+    solved = 0
+    problem = None
+    for _ in range(n_samples):
+        sample = resample_covariance(cov, root, df, rng)
+        if problem is None:
+            problem = FrontierProblem(mu, sample, max_weight)
+        else:
+            problem.update_covariance(sample)
+        weights = problem.solve(-np.inf)
+        if weights is not None:
+            total += weights
+            solved += 1
+    return total, solved
+
+
+def sample_chunks(
+    n_samples: int, seed: int = 0, chunk_samples: int = CHUNK_SAMPLES,
+) -> list[tuple[int, np.random.SeedSequence]]:
+    """Split ``n_samples`` draws into (count, seed) jobs with independent random streams."""
+    counts = [min(chunk_samples, n_samples - start) for start in range(0, n_samples, chunk_samples)]
+    return list(zip(counts, np.random.SeedSequence(seed).spawn(len(counts)), strict=True))
+
+
+def average_weights(results: list[tuple[np.ndarray, int]], n_samples: int) -> np.ndarray:
+    """Mean weights from the chunks' (weight sum, solved count) results."""
+    total = sum(weights for weights, _ in results)
+    solved = sum(count for _, count in results)
+    if solved == 0:
+        raise ValueError("リサンプリングした最小分散問題がいずれも解けませんでした。")
+    if solved < n_samples:
+        logger.warning(f"Resampling: {n_samples - solved} of {n_samples} draws did not solve; averaging the rest")
+    return total / solved
+
+
+def solve_resampled(
+    mu: np.ndarray,
+    cov: np.ndarray | FactorCovariance,
+    max_weight: float,
+    n_samples: int,
+    n_observations: int,
+    seed: int = 0,
+) -> np.ndarray:
+    """Resampled minimum-variance weights, with every chunk solved in this process.
+
+    Gives the same result as running the chunks of ``sample_chunks`` on the
+    compute pool and combining them with ``average_weights``.
+    """
+    results = [
+        resampled_min_variance(mu, cov, max_weight, count, n_observations, chunk_seed)
+        for count, chunk_seed in sample_chunks(n_samples, seed)
+    ]
+    return average_weights(results, n_samples)
@@ -0,0 +1,176 @@
+"""Expected-return and covariance estimates shared across optimizer strategies.
+
+Estimating the covariance matrix is the dominant cost of an optimization
+once the universe grows past a few hundred assets, and every strategy run on
+the same universe and price window needs the same estimates. They are
+computed once per (universe, window, market-data version) on the compute
+pool and kept in a per-worker LRU.
+
+With ``covariance_method="ewma"`` the covariance estimates are instead
+sliced from the pipeline-maintained incremental state (see covariance.py),
+which avoids touching the full return history at request time. With
+``covariance_method="factor"`` they are a low-rank PCA factor model (see
+factor_model.py), whose size and cost grow linearly with the universe.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+from pypfopt import CovarianceShrinkage, expected_returns, risk_models
+
+from src.app.core.cache import LRUCache
+from src.app.core.config import settings
+from src.app.services.compute_executor import compute_executor
+from src.app.services.covariance import IncrementalCovariance
+from src.app.services.factor_model import FactorCovariance, fit_statistical_factors
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+
+class RiskModel:
+    """Annualized estimates for one cleaned price window.
+
+    Attributes
+    ----------
+    mu : pd.Series
+        Mean historical (compounded) return, used by the efficient-frontier strategies.
+    cov : pd.DataFrame or FactorCovariance
+        Ledoit-Wolf shrunk covariance, used by the efficient-frontier strategies
+        and risk parity.
+    sample_cov : pd.DataFrame or FactorCovariance
+        Sample covariance of daily returns, used by HRP and metrics.
+    mean_returns : pd.Series
+        Arithmetic mean of daily returns, used by metrics.
+    n_observations : int or None
+        Daily returns the estimates were made from, used by the resampled
+        strategy to size its estimation error.
+    """
+
+    def __init__(
+        self,
+        mu: pd.Series,
+        cov: pd.DataFrame | FactorCovariance,
+        sample_cov: pd.DataFrame | FactorCovariance,
+        mean_returns: pd.Series,
+        n_observations: int | None = None,
+    ):
+        self.mu = mu
+        self.cov = cov
+        self.sample_cov = sample_cov
+        self.mean_returns = mean_returns
+        self.n_observations = n_observations
+
+    @property
+    def symbols(self) -> list[str]:
+        return self.mu.index.tolist()
+
+
+def estimate_risk_model(prices: np.ndarray, symbols: list[str]) -> RiskModel:
+    """Estimate a RiskModel from a (days × assets) price matrix without NaNs.
+
+    Pure function of its arguments so it can run on the compute pool.
+    """
+    prices_df = pd.DataFrame(prices, columns=symbols)
+    returns = prices_df.pct_change().dropna()
+
+    return RiskModel(
+        mu=expected_returns.mean_historical_return(returns, returns_data=True, frequency=TRADING_DAYS),
+        cov=CovarianceShrinkage(returns, returns_data=True, frequency=TRADING_DAYS).ledoit_wolf(),
+        sample_cov=returns.cov() * TRADING_DAYS,
+        mean_returns=returns.mean() * TRADING_DAYS,
+        n_observations=len(returns),
+    )
+
+
+def estimate_factor_risk_model(prices: np.ndarray, symbols: list[str], n_factors: int) -> RiskModel:
+    """Estimate a RiskModel whose covariances are one PCA factor model of the daily returns.
+
+    Pure function of its arguments so it can run on the compute pool. The
+    factor model stands in for both the shrunk and the sample covariance:
+    truncating to the leading factors is itself the shrinkage, and no n×n
+    matrix is formed.
+    """
+    prices_df = pd.DataFrame(prices, columns=symbols)
+    returns = prices_df.pct_change().dropna()
+    factor_cov = fit_statistical_factors(returns.to_numpy(dtype=np.float64), symbols, n_factors)
+
+    return RiskModel(
+        mu=expected_returns.mean_historical_return(returns, returns_data=True, frequency=TRADING_DAYS),
+        cov=factor_cov,
+        sample_cov=factor_cov,
+        mean_returns=returns.mean() * TRADING_DAYS,
+        n_observations=len(returns),
+    )
+
+
+def risk_model_from_incremental(
+    state: IncrementalCovariance, asset_ids: list[int], prices: pd.DataFrame,
+) -> RiskModel:
+    """Build a RiskModel from the incremental covariance state in O(n²).
+
+    ``asset_ids`` must align with ``prices.columns`` and be covered by the
+    state. ``cov`` is the EWMA covariance; ``sample_cov`` and
+    ``mean_returns`` come from the state's running sums (each pair's full
+    common history). ``mu`` only needs the window's first and last prices.
+    """
+    symbols = prices.columns
+    periods = len(prices) - 1
+    mu = (prices.iloc[-1] / prices.iloc[0]) ** (TRADING_DAYS / periods) - 1
+
+    def frame(matrix: np.ndarray) -> pd.DataFrame:
+        # Pairwise estimates over different windows need not be positive semidefinite
+        return risk_models.fix_nonpositive_semidefinite(pd.DataFrame(matrix, index=symbols, columns=symbols))
+
+    return RiskModel(
+        mu=mu,
+        cov=frame(state.ewma_covariance(asset_ids)),
+        sample_cov=frame(state.sample_covariance(asset_ids)),
+        mean_returns=pd.Series(state.mean_returns(asset_ids), index=symbols),
+        n_observations=periods,
+    )
+
+
+class RiskModelCache:
+    """LRU of RiskModels keyed by (universe, date window, market-data version, method)."""
+
+    def __init__(self, maxsize: int):
+        self._models = LRUCache(maxsize)
+
+    @staticmethod
+    def key(prices: pd.DataFrame, data_version: int, method: str = "ledoit_wolf") -> tuple:
+        return (tuple(prices.columns), prices.index[0], prices.index[-1], data_version, method)
+
+    async def get_or_estimate(
+        self, prices: pd.DataFrame, data_version: int, method: str = "ledoit_wolf",
+    ) -> RiskModel:
+        """Return the cached model for this price window, estimating it on the pool on a miss.
+
+        ``prices`` must already be cleaned (no NaNs); the universe and window
+        in the key are read from its columns and index. ``method`` is
+        "ledoit_wolf" (dense) or "factor" (PCA factor model).
+        """
+        key = self.key(prices, data_version, method)
+        model = self._models.get(key)
+        if model is None:
+            matrix, symbols = prices.to_numpy(dtype=np.float64), prices.columns.tolist()
+            if method == "factor":
+                model = await compute_executor.run(
+                    estimate_factor_risk_model, matrix, symbols, settings.FACTOR_MODEL_FACTORS,
+                )
+            else:
+                model = await compute_executor.run(estimate_risk_model, matrix, symbols)
+            self._models.put(key, model)
+            logger.info(f"Estimated {method} risk model for {len(prices.columns)} assets × {len(prices)} days")
+        return model
+
+    def clear(self) -> None:
+        self._models.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+risk_model_cache = RiskModelCache(settings.RISK_MODEL_CACHE_SIZE)
@@ -0,0 +1,149 @@
+"""Equal-risk-contribution (risk parity) weights.
+
+The ERC portfolio is the normalized minimizer of the strictly convex
+log-barrier problem (Maillard, Roncalli & Teïletche, 2010)
+
+    minimize  f(y) = ½·yᵀΣy − Σ bᵢ·log yᵢ   over y > 0
+
+whose first-order condition yᵢ·(Σy)ᵢ = bᵢ is exactly "risk contribution
+equals budget". It is solved with damped Newton steps: each iteration is
+one Cholesky solve of an n×n system (tens of milliseconds at 1,000 assets), and
+convergence is quadratic near the solution (typically under ten
+iterations, fewer from a warm start). The barrier keeps every weight
+strictly positive, so risk contributions never vanish.
+
+A FactorCovariance is used in its low-rank form: products with Σ cost
+O(n·k) and each Newton system is solved by the Woodbury identity in
+O(n·k²), so large universes never build the dense matrix.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from src.app.services.factor_model import FactorCovariance
+
+DEFAULT_TOLERANCE = 1e-8
+DEFAULT_MAX_ITER = 50
+
+# Armijo sufficient-decrease factor and step shrink for the line search
+_ARMIJO = 0.25
+_BACKTRACK = 0.5
+_PURE_NEWTON_DECREMENT = 1e-10
+
+
+class RiskParitySolution:
+    """Result of ``solve_risk_parity``.
+
+    Attributes
+    ----------
+    weights : np.ndarray
+        Long-only weights summing to 1.
+    iterations : int
+        Newton iterations taken.
+    residual : float
+        max |risk contribution share − budget| at ``weights``.
+    converged : bool
+        Whether ``residual`` reached the tolerance within the iteration limit.
+    """
+
+    def __init__(self, weights: np.ndarray, iterations: int, residual: float, converged: bool):
+        self.weights = weights
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+
+def risk_contributions(weights: np.ndarray, cov: np.ndarray | FactorCovariance) -> np.ndarray:
+    """Share of portfolio variance contributed by each asset (sums to 1)."""
+    marginal = cov.matvec(weights) if isinstance(cov, FactorCovariance) else cov @ weights
+    return weights * marginal / (weights @ marginal)
+
+
+def solve_risk_parity(
+    cov: np.ndarray | FactorCovariance,
+    budgets: np.ndarray | None = None,
+    x0: np.ndarray | None = None,
+    tol: float = DEFAULT_TOLERANCE,
+    max_iter: int = DEFAULT_MAX_ITER,
+) -> RiskParitySolution:
+    """Long-only weights whose risk contributions match ``budgets`` (equal by default).
+
+    Parameters
+    ----------
+    cov : np.ndarray or FactorCovariance
+        (n, n) covariance matrix, or factor model, with positive variances.
+    budgets : np.ndarray, optional
+        (n,) positive risk budgets; normalized to sum to 1.
+    x0 : np.ndarray, optional
+        (n,) starting weights, e.g. the previous day's solution. Non-positive
+        or non-finite entries are replaced by the inverse-volatility guess.
+    tol : float
+        Stop once every risk-contribution share is within ``tol`` of its budget.
+    max_iter : int
+        Newton iteration limit.
+    """
+    matvec, variances, solve_shifted = _operators(cov)
+    n = len(variances)
+    if not np.all(variances > 0):
+        raise ValueError("Risk parity requires every asset to have positive variance")
+    budgets = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=np.float64)
+    budgets = budgets / budgets.sum()
+
+    start = budgets / np.sqrt(variances)
+    start /= start.sum()
+    if x0 is not None:
+        x0 = np.asarray(x0, dtype=np.float64)
+        start = np.where(np.isfinite(x0) & (x0 > 0), x0, start)
+    # On the ray through any start, f is minimized at y = start / sqrt(startᵀΣstart)
+    y = start / np.sqrt(start @ matvec(start))
+
+    def objective(v: np.ndarray) -> float:
+        return 0.5 * v @ matvec(v) - budgets @ np.log(v)
+
+    iterations = 0
+    residual = _residual(y, cov, budgets)
+    while residual > tol and iterations < max_iter:
+        gradient = matvec(y) - budgets / y
+        # Hessian Σ + diag(b / y²) is positive definite: one linear solve per step
+        step = solve_shifted(budgets / y**2, -gradient)
+
+        # Largest step keeping y > 0, then backtrack to sufficient decrease
+        shrinking = step < 0
+        t = min(1.0, 0.99 * float(np.min(-y[shrinking] / step[shrinking]))) if shrinking.any() else 1.0
+        # Once the Newton decrement (-slope) is below what f can resolve in
+        # floating point, the full step is taken: this is the quadratically
+        # convergent phase and comparing f values there is just rounding noise
+        slope = gradient @ step
+        if -slope > _PURE_NEWTON_DECREMENT:
+            f_y = objective(y)
+            while t > 1e-12 and objective(y + t * step) > f_y + _ARMIJO * t * slope:
+                t *= _BACKTRACK
+
+        y = y + t * step
+        iterations += 1
+        residual = _residual(y, cov, budgets)
+
+    return RiskParitySolution(y / y.sum(), iterations, residual, residual <= tol)
+
+
+def _operators(
+    cov: np.ndarray | FactorCovariance,
+) -> tuple[Callable[[np.ndarray], np.ndarray], np.ndarray, Callable[[np.ndarray, np.ndarray], np.ndarray]]:
+    """(x ↦ Σx, diag(Σ), (s, r) ↦ (Σ + diag(s))⁻¹r) for a dense matrix or a factor model."""
+    if isinstance(cov, FactorCovariance):
+        return cov.matvec, cov.diagonal(), cov.solve_shifted
+
+    cov = np.asarray(cov, dtype=np.float64)
+
+    def solve_shifted(shift: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        shifted = cov.copy()
+        shifted[np.diag_indices_from(shifted)] += shift
+        return cho_solve(cho_factor(shifted, overwrite_a=True, check_finite=False), rhs, check_finite=False)
+
+    return cov.__matmul__, np.diag(cov), solve_shifted
+
+
+def _residual(y: np.ndarray, cov: np.ndarray | FactorCovariance, budgets: np.ndarray) -> float:
+    return float(np.max(np.abs(risk_contributions(y, cov) - budgets)))
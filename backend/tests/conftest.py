@@ -1,12 +1,17 @@
 """Test configuration and fixtures."""
 
+import os
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.database import get_db
+# Run compute jobs inline; the process pool itself is covered by test_compute_executor.py
+os.environ.setdefault("COMPUTE_POOL_WORKERS", "0")
+
+from src.app.core.database import get_db, get_session_factory
 from src.app.main import app
 
 
@@ -19,12 +24,17 @@ def mock_db():
 
 @pytest.fixture
 async def client(mock_db):
-    """Provide an httpx AsyncClient with DB dependency overridden."""
+    """Provide an httpx AsyncClient with DB dependencies overridden (both hand out ``mock_db``)."""
 
     async def override_get_db():
         yield mock_db
 
+    @asynccontextmanager
+    async def session_factory():
+        yield mock_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -0,0 +1,141 @@
+"""Tests for asset CRUD helpers and endpoints."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.app.crud.asset import get_asset_prices, get_latest_quotes
+from src.app.models.asset import Asset
+from src.app.models.asset_price import AssetPrice
+from src.app.models.latest_quote import LatestQuote
+
+
+def _result(rows=None, scalar=None, scalars=None):
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalar_one.return_value = scalar
+    result.scalar_one_or_none.return_value = scalar
+    result.scalars.return_value.all.return_value = scalars or []
+    return result
+
+
+def _asset(asset_id: int, symbol: str) -> Asset:
+    return Asset(
+        id=asset_id, symbol=symbol, name=symbol, asset_type="etf", market="us", currency="USD", is_active=True,
+    )
+
+
+def _quote(asset_id: int, close: str, change_pct: float | None) -> LatestQuote:
+    return LatestQuote(asset_id=asset_id, close=Decimal(close), change_pct=change_pct, as_of=date(2024, 1, 5))
+
+
+class TestGetLatestQuotes:
+    @pytest.mark.asyncio
+    async def test_empty_ids_skip_query(self):
+        session = AsyncMock()
+        assert await get_latest_quotes(session, []) == {}
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_asset_id(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(scalars=[_quote(1, "110", 0.1), _quote(2, "50", None)])
+
+        quotes = await get_latest_quotes(session, [1, 2, 3])
+
+        session.execute.assert_awaited_once()
+        assert quotes[1].close == Decimal("110")
+        assert quotes[2].change_pct is None
+        assert 3 not in quotes
+
+
+class TestListAssetsEndpoint:
+    @pytest.mark.asyncio
+    async def test_uses_single_quote_query(self, client, mock_db):
+        mock_db.execute.side_effect = [
+            _result(scalar=2),  # count
+            _result(scalars=[_asset(1, "AGG"), _asset(2, "SPY")]),  # page
+            _result(scalars=[_quote(1, "110", 0.1)]),  # quotes
+        ]
+
+        response = await client.get("/api/v1/assets/", params={"per_page": 100})
+
+        assert response.status_code == 200
+        assert mock_db.execute.await_count == 3
+        items = response.json()["items"]
+        assert items[0]["latest_price"] == {"close": 110.0, "date": "2024-01-05", "change_pct": 0.1}
+        assert items[1]["latest_price"] is None
+
+
+class TestGetPricesEndpoint:
+    @staticmethod
+    def _prices(n: int) -> list[AssetPrice]:
+        start = date(2020, 1, 1)
+        closes = [100 + i * 0.01 for i in range(n)]
+        closes[n // 2] = 50.0  # crash day
+        return [
+            AssetPrice(asset_id=1, date=start + timedelta(days=i), close=Decimal(str(c)), volume=1000)
+            for i, c in enumerate(closes)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_max_points_downsamples(self, client, mock_db):
+        mock_db.execute.side_effect = [
+            _result(scalar=_asset(1, "SPY")),
+            _result(scalars=self._prices(2000)),
+        ]
+
+        response = await client.get("/api/v1/assets/SPY/prices", params={"period": "max", "max_points": 200})
+
+        assert response.status_code == 200
+        prices = response.json()["prices"]
+        assert len(prices) == 200
+        assert prices[0]["date"] == "2020-01-01"
+        assert min(p["close"] for p in prices) == 50.0
+
+    @pytest.mark.asyncio
+    async def test_without_max_points_returns_all(self, client, mock_db):
+        mock_db.execute.side_effect = [
+            _result(scalar=_asset(1, "SPY")),
+            _result(scalars=self._prices(300)),
+        ]
+
+        response = await client.get("/api/v1/assets/SPY/prices", params={"period": "max"})
+
+        assert len(response.json()["prices"]) == 300
+
+
+class TestGetAssetPrices:
+    @staticmethod
+    def _sql(session) -> str:
+        stmt = session.execute.await_args.args[0]
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_daily_returns_rows(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(scalars=["row"])
+
+        prices = await get_asset_prices(session, 1, period="1m", interval="daily")
+
+        assert prices == ["row"]
+        assert "date_trunc" not in self._sql(session)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("interval,unit", [("weekly", "week"), ("monthly", "month")])
+    async def test_resampled_in_sql(self, interval, unit):
+        session = AsyncMock()
+        session.execute.return_value = _result(rows=["bar"])
+
+        prices = await get_asset_prices(session, 1, period="max", interval=interval)
+
+        assert prices == ["bar"]
+        sql = self._sql(session)
+        assert f"date_trunc('{unit}'" in sql
+        assert "GROUP BY" in sql
+        assert "max(asset_prices.high)" in sql
+        assert "min(asset_prices.low)" in sql
+        assert "sum(asset_prices.volume)" in sql
@@ -1,8 +1,12 @@
 """Tests for backtester service."""
 
+from unittest.mock import AsyncMock
+
 import numpy as np
 import pandas as pd
+import pytest
 
+from src.app.schemas.backtest import MAX_BATCH_PORTFOLIOS
 from src.app.services.backtester import Backtester
 
 
@@ -71,6 +75,16 @@ class TestBacktesterPureMethods:
         assert ts[0]["return_pct"] == 0.0  # first point: 0% return relative to initial
         assert ts[-1]["return_pct"] > 0
 
+    def test_build_time_series_keeps_drawdown_trough(self):
+        dates = pd.bdate_range("2020-01-01", periods=2500)
+        values = np.linspace(1_000_000, 1_500_000, 2500)
+        values[1234] = 700_000
+        pv = pd.Series(values, index=dates)
+
+        ts = self.backtester._build_time_series(pv, 1_000_000, max_points=100)
+        assert len(ts) == 100
+        assert min(p["value"] for p in ts) == 700_000
+
     def test_compute_annual_returns(self):
         dates = pd.bdate_range("2022-01-03", periods=504)
         pv = pd.Series(np.linspace(1_000_000, 1_500_000, 504), index=dates)
@@ -94,3 +108,88 @@ class TestBacktesterPureMethods:
         metrics = self.backtester._compute_metrics(pv, 1_000_000)
         assert metrics["max_drawdown_period"]["start"] is not None
         assert metrics["max_drawdown_period"]["end"] is not None
+
+
+class TestBacktesterRunBatch:
+    def setup_method(self):
+        dates = pd.bdate_range("2022-01-03", periods=300)
+        rng = np.random.default_rng(7)
+        self.prices = pd.DataFrame(
+            100 * np.cumprod(1 + rng.normal(0.0003, 0.01, size=(300, 3)), axis=0),
+            index=dates,
+            columns=["A", "B", "C"],
+        )
+        self.backtester = Backtester(session=None)
+        self.backtester._get_price_matrix = AsyncMock(return_value=self.prices)
+        self.backtester._compute_benchmarks = AsyncMock(return_value=None)
+
+    @pytest.mark.asyncio
+    async def test_metrics_match_individual_simulation(self):
+        portfolios = [
+            {"label": "ab", "allocations": [{"symbol": "A", "weight": 0.6}, {"symbol": "B", "weight": 0.4}]},
+            {"label": "c", "allocations": [{"symbol": "C", "weight": 1.0}]},
+        ]
+        result = await self.backtester.run_batch(portfolios, rebalance_frequency="monthly")
+
+        self.backtester._get_price_matrix.assert_awaited_once()
+        assert [r["label"] for r in result["results"]] == ["ab", "c"]
+        for portfolio, r in zip(portfolios, result["results"], strict=True):
+            weights = {a["symbol"]: a["weight"] for a in portfolio["allocations"]}
+            pv = self.backtester._simulate(self.prices, weights, 1_000_000, 30)
+            assert r["metrics"] == self.backtester._compute_metrics(pv, 1_000_000)
+
+    @pytest.mark.asyncio
+    async def test_matches_single_backtest_across_calendars(self):
+        # "J" skips some days the others trade (market holidays), "L" lists 60 days in
+        prices = self.prices.rename(columns={"C": "J"})
+        prices["L"] = prices["A"] * 0.5
+        prices.iloc[::7, prices.columns.get_loc("J")] = np.nan
+        prices.iloc[::11, [prices.columns.get_loc("A"), prices.columns.get_loc("L")]] = np.nan
+        prices.iloc[:60, prices.columns.get_loc("L")] = np.nan
+
+        async def price_matrix(symbols, start_date, end_date):
+            # Like the price store: the requested columns, on dates any of them traded
+            return prices[[s for s in symbols if s in prices.columns]].dropna(how="all")
+
+        self.backtester._get_price_matrix = AsyncMock(side_effect=price_matrix)
+        portfolios = [
+            {"label": "us", "allocations": [{"symbol": "A", "weight": 0.7}, {"symbol": "B", "weight": 0.3}]},
+            {"label": "jp", "allocations": [{"symbol": "J", "weight": 1.0}]},
+            {"label": "late", "allocations": [{"symbol": "L", "weight": 0.5}, {"symbol": "J", "weight": 0.5}]},
+            {"label": "us2", "allocations": [{"symbol": "B", "weight": 0.2}, {"symbol": "A", "weight": 0.8}]},
+        ]
+
+        batch = await self.backtester.run_batch(portfolios, rebalance_frequency="monthly")
+
+        for portfolio, r in zip(portfolios, batch["results"], strict=True):
+            single = await self.backtester.run(portfolio["allocations"], rebalance_frequency="monthly")
+            assert r["label"] == portfolio["label"]
+            assert r["period"] == single["period"]
+            assert r["metrics"] == single["metrics"]
+        assert batch["results"][2]["period"]["start"] > batch["results"][1]["period"]["start"]
+        assert batch["period"]["start"] == min(r["period"]["start"] for r in batch["results"])
+
+    @pytest.mark.asyncio
+    async def test_portfolio_without_price_data_is_rejected(self):
+        portfolios = [
+            {"allocations": [{"symbol": "A", "weight": 1.0}]},
+            {"allocations": [{"symbol": "UNKNOWN", "weight": 1.0}]},
+        ]
+        with pytest.raises(ValueError):
+            await self.backtester.run_batch(portfolios)
+
+
+class TestBacktestBatchEndpoint:
+    @pytest.mark.asyncio
+    async def test_too_many_portfolios(self, client):
+        portfolio = {"allocations": [{"symbol": "SPY", "weight": 1.0}]}
+        response = await client.post(
+            "/api/v1/portfolios/backtest/batch",
+            json={"portfolios": [portfolio] * (MAX_BATCH_PORTFOLIOS + 1)},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, client):
+        response = await client.post("/api/v1/portfolios/backtest/batch", json={"portfolios": []})
+        assert response.status_code == 422
@@ -0,0 +1,105 @@
+"""Tests for the vectorized backtest simulation engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.services.backtest_engine import (
+    rebalance_points,
+    simulate_portfolio_values,
+    simulate_portfolio_values_batch,
+)
+from src.app.services.backtester import Backtester
+
+
+def _loop_simulate(
+    prices: pd.DataFrame, weights: dict[str, float], initial_investment: float, rebalance_interval: int,
+) -> pd.Series:
+    """Reference day-by-day loop (the original Backtester._simulate)."""
+    symbols = list(weights.keys())
+    daily_returns = prices[symbols].pct_change().fillna(0)
+
+    n_days = len(daily_returns)
+    portfolio_value = np.empty(n_days)
+    portfolio_value[0] = initial_investment
+
+    w_arr = np.array([weights[s] for s in symbols])
+    holdings = initial_investment * w_arr
+
+    days_since_rebalance = 0
+    for i in range(1, n_days):
+        ret = daily_returns.iloc[i].values
+        holdings = holdings * (1 + ret)
+        total = holdings.sum()
+        portfolio_value[i] = total
+
+        days_since_rebalance += 1
+        if rebalance_interval > 0 and days_since_rebalance >= rebalance_interval:
+            holdings = total * w_arr
+            days_since_rebalance = 0
+
+    return pd.Series(portfolio_value, index=daily_returns.index)
+
+
+def _random_prices(n_days: int, n_assets: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.012, size=(n_days, n_assets))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    dates = pd.bdate_range("2005-01-03", periods=n_days)
+    return pd.DataFrame(prices, index=dates, columns=[f"S{i}" for i in range(n_assets)])
+
+
+class TestRebalancePoints:
+    def test_no_rebalance(self):
+        assert len(rebalance_points(100, 0)) == 0
+
+    def test_excludes_last_day(self):
+        assert rebalance_points(91, 30).tolist() == [30, 60]
+        assert rebalance_points(92, 30).tolist() == [30, 60, 90]
+
+
+class TestSimulationParity:
+    def setup_method(self):
+        self.backtester = Backtester(session=None)
+
+    @pytest.mark.parametrize("rebalance_interval", [0, 1, 7, 30, 90, 365, 10_000])
+    @pytest.mark.parametrize("n_assets", [1, 5, 25])
+    def test_matches_loop_exactly(self, rebalance_interval, n_assets):
+        prices = _random_prices(1_000, n_assets, seed=n_assets)
+        rng = np.random.default_rng(1)
+        raw = rng.random(n_assets)
+        weights = dict(zip(prices.columns, raw / raw.sum(), strict=True))
+
+        expected = _loop_simulate(prices, weights, 1_000_000, rebalance_interval)
+        actual = self.backtester._simulate(prices, weights, 1_000_000, rebalance_interval)
+
+        pd.testing.assert_series_equal(actual, expected, check_exact=True)
+
+    def test_weight_order_follows_dict_not_columns(self):
+        prices = _random_prices(300, 3)
+        weights = {"S2": 0.5, "S0": 0.3, "S1": 0.2}
+        expected = _loop_simulate(prices, weights, 1_000_000, 30)
+        actual = self.backtester._simulate(prices, weights, 1_000_000, 30)
+        pd.testing.assert_series_equal(actual, expected, check_exact=True)
+
+    def test_single_day(self):
+        values = simulate_portfolio_values(np.zeros((1, 2)), np.array([0.5, 0.5]), 100.0, 30)
+        assert values.tolist() == [100.0]
+
+
+class TestBatchSimulation:
+    @pytest.mark.parametrize("rebalance_interval", [0, 30, 90])
+    def test_matches_single_portfolio_engine(self, rebalance_interval):
+        prices = _random_prices(1_500, 10)
+        returns = prices.pct_change().fillna(0).to_numpy()
+        rng = np.random.default_rng(2)
+        weights = rng.random((8, 10))
+        weights[:, :3] = 0.0  # assets outside some portfolios
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        batch = simulate_portfolio_values_batch(returns, weights, 1_000_000, rebalance_interval)
+
+        assert batch.shape == (1_500, 8)
+        for p in range(8):
+            single = simulate_portfolio_values(returns, weights[p], 1_000_000, rebalance_interval)
+            np.testing.assert_allclose(batch[:, p], single, rtol=1e-12)
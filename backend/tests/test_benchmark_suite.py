@@ -0,0 +1,65 @@
+"""Tests for the synthetic-data benchmark suite."""
+
+import json
+
+import numpy as np
+
+from benchmarks import suite
+from benchmarks.synthetic import gbm_prices
+
+
+class TestGbmPrices:
+    def test_shape_and_calendar(self):
+        prices = gbm_prices(504, 10, seed=1)
+
+        assert prices.shape == (504, 10)
+        assert prices.columns[0] == "S0"
+        assert prices.index.is_monotonic_increasing
+        assert (prices.to_numpy() > 0).all()
+
+    def test_reproducible_from_seed(self):
+        np.testing.assert_array_equal(gbm_prices(100, 5, seed=3), gbm_prices(100, 5, seed=3))
+        assert not np.allclose(gbm_prices(100, 5, seed=3), gbm_prices(100, 5, seed=4))
+
+    def test_returns_share_a_market_factor(self):
+        returns = np.log(gbm_prices(2520, 20, seed=0)).diff().dropna()
+        corr = returns.corr().to_numpy()
+
+        assert corr[np.triu_indices(20, k=1)].mean() > 0.2
+        annual_vol = returns.std() * np.sqrt(252)
+        assert annual_vol.between(0.1, 0.6).all()
+
+
+class TestSuite:
+    def test_runs_every_case_on_grid(self):
+        records = suite.run_suite((5,), (1, 2), list(suite.CASES), repeats=2, log=lambda _: None)
+
+        assert len(records) == 2 * len(suite.CASES)
+        assert {r["case"] for r in records} == set(suite.CASES)
+        assert all(r["best_s"] <= r["median_s"] and r["runs"] == 2 for r in records)
+        assert {r["days"] for r in records} == {252, 504}
+
+    def test_main_writes_report(self, tmp_path):
+        output = tmp_path / "run.json"
+
+        status = suite.main([
+            "--assets", "5", "--years", "1", "--repeats", "1",
+            "--cases", "backtest.simulate", "--output", str(output),
+        ])
+
+        report = json.loads(output.read_text())
+        assert status == 0
+        assert report["repeats"] == 1
+        assert [r["case"] for r in report["results"]] == ["backtest.simulate"]
+
+    def test_compare_flags_regressions(self):
+        def report(*timings):
+            return {"results": [
+                {"case": "optimizer.hrp", "assets": n, "years": 1, "best_s": t}
+                for n, t in zip((25, 100, 500), timings, strict=False)
+            ]}
+
+        rows = suite.compare(report(1.0, 1.0), report(1.1, 2.0, 5.0), threshold=1.25)
+
+        assert [(r["assets"], r["regression"]) for r in rows] == [(25, False), (100, True)]
+        assert rows[1]["ratio"] == 2.0
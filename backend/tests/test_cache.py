@@ -0,0 +1,183 @@
+"""Tests for in-process cache helpers."""
+
+import asyncio
+
+import pytest
+
+from src.app.core.cache import LRUCache, SingleFlight, TTLCache, canonical_key
+
+
+class TestLRUCache:
+    def test_get_missing_returns_none(self):
+        cache = LRUCache(2)
+        assert cache.get("x") is None
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.put("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_put_existing_key_refreshes_entry(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+        cache.put("c", 3)
+
+        assert cache.get("a") == 10
+        assert "b" not in cache
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+
+class _Loader:
+    """Counts calls and returns "v1", "v2", ... after an optional delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"v{self.calls}"
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        flights = SingleFlight()
+        load = _Loader(delay=0.01)
+
+        results = await asyncio.gather(*(flights.run("k", load) for _ in range(10)))
+
+        assert results == ["v1"] * 10
+        assert load.calls == 1
+        assert flights.stats() == {"in_flight": 0, "leaders": 1, "followers": 9}
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        flights = SingleFlight()
+        load = _Loader()
+
+        assert await flights.run("k", load) == "v1"
+        await asyncio.sleep(0)
+        assert await flights.run("k", load) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        flights = SingleFlight()
+        load = _Loader(delay=0.01)
+
+        await asyncio.gather(flights.run("a", load), flights.run("b", load))
+
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flights.run("k", fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert not flights.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flights = SingleFlight()
+        load = _Loader(delay=0.02)
+
+        leader = asyncio.create_task(flights.run("k", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("k", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "v1"
+        assert load.calls == 1
+
+
+class TestCanonicalKey:
+    def test_dict_order_does_not_matter(self):
+        assert canonical_key("generate", {"a": 1, "b": [1, 2]}) == canonical_key("generate", {"b": [1, 2], "a": 1})
+
+    def test_values_and_names_matter(self):
+        assert canonical_key("generate", {"a": 1}) != canonical_key("generate", {"a": 2})
+        assert canonical_key("generate", {"a": 1}) != canonical_key("backtest", {"a": 1})
+
+
+class TestTTLCache:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_from_memory(self):
+        cache = TTLCache(ttl=60)
+        load = _Loader()
+
+        assert await cache.get_or_load("k", load) == "v1"
+        assert await cache.get_or_load("k", load) == "v1"
+        assert load.calls == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TTLCache(ttl=60)
+        load = _Loader(delay=0.01)
+
+        results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(10)))
+
+        assert results == ["v1"] * 10
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_revalidating(self):
+        cache = TTLCache(ttl=0, stale_ttl=60)
+        load = _Loader(delay=0.01)
+        await cache.get_or_load("k", load)
+
+        stale = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(5)))
+        assert stale == ["v1"] * 5
+        await asyncio.sleep(0.05)
+
+        assert load.calls == 2  # one background reload for all five
+        assert cache.stale_hits >= 5
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_waits_for_reload(self):
+        cache = TTLCache(ttl=0, stale_ttl=0)
+        load = _Loader()
+        await cache.get_or_load("k", load)
+
+        assert await cache.get_or_load("k", load) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        cache = TTLCache(ttl=60)
+
+        async def fail():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", fail)
+        assert await cache.get_or_load("k", _Loader()) == "v1"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        cache = TTLCache(ttl=60)
+        load = _Loader()
+        await cache.get_or_load("k", load)
+
+        cache.invalidate("k")
+        assert await cache.get_or_load("k", load) == "v2"
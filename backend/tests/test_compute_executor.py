@@ -0,0 +1,63 @@
+"""Tests for the compute process pool."""
+
+import math
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.app.services.compute_executor import ComputeExecutor, ComputeTimeoutError
+
+
+class TestComputeExecutor:
+    @pytest.mark.asyncio
+    async def test_inline_mode(self):
+        executor = ComputeExecutor(max_workers=0)
+        assert await executor.run(math.factorial, 5) == 120
+        assert executor.stats()["submitted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_runs_in_pool(self):
+        executor = ComputeExecutor(max_workers=1, timeout=30)
+        try:
+            assert await executor.run(math.factorial, 10) == 3_628_800
+            stats = executor.stats()
+            assert stats["submitted"] == 1
+            assert stats["in_flight"] == 0
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        executor = ComputeExecutor(max_workers=1, timeout=30)
+        try:
+            with pytest.raises(ComputeTimeoutError):
+                await executor.run(time.sleep, 1, timeout=0.1)
+            assert executor.stats()["timed_out"] == 1
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_job_exception_propagates(self):
+        executor = ComputeExecutor(max_workers=1, timeout=30)
+        try:
+            with pytest.raises(ValueError):
+                await executor.run(math.factorial, -1)
+            assert executor.stats()["failed"] == 1
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_recovers_after_worker_dies(self):
+        executor = ComputeExecutor(max_workers=1, timeout=30)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await executor.run(os._exit, 1)
+            assert await executor.run(math.factorial, 5) == 120
+            assert await executor.run(math.factorial, 6) == 720
+            stats = executor.stats()
+            assert stats["failed"] == 1
+            assert stats["submitted"] == 3
+        finally:
+            executor.shutdown()
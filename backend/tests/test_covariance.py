@@ -0,0 +1,283 @@
+"""Tests for the incremental covariance state and its pipeline updater."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.services.covariance import IncrementalCovariance
+from src.app.services.data_pipeline.covariance import CovarianceUpdater
+from src.app.services.risk_model import risk_model_from_incremental
+
+
+def _prices(n_days: int = 200, n_assets: int = 4, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.01, (n_days, n_assets))
+    index = pd.bdate_range("2023-01-02", periods=n_days)
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=index, columns=list(range(1, n_assets + 1)))
+
+
+def _state(prices: pd.DataFrame, halflife: float = 20.0) -> IncrementalCovariance:
+    state = IncrementalCovariance(prices.columns.tolist(), halflife=halflife)
+    state.update_many(prices.index.date.tolist(), prices.to_numpy())
+    return state
+
+
+def _result(rows=None, scalars=None, scalar=None):
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalars.return_value.all.return_value = scalars or []
+    result.scalar_one_or_none.return_value = scalar
+    return result
+
+
+class TestIncrementalCovariance:
+    def test_sample_covariance_matches_pandas(self):
+        prices = _prices()
+        state = _state(prices)
+        returns = prices.pct_change().dropna()
+        ids = prices.columns.tolist()
+
+        np.testing.assert_allclose(state.sample_covariance(ids), returns.cov() * 252)
+        np.testing.assert_allclose(state.mean_returns(ids), returns.mean() * 252)
+        assert state.as_of == prices.index[-1].date()
+
+    def test_ewma_matches_weighted_sum(self):
+        prices = _prices()
+        state = _state(prices, halflife=20.0)
+        returns = prices.pct_change().dropna().to_numpy()
+
+        decay = 0.5 ** (1 / 20.0)
+        weights = (1 - decay) * decay ** np.arange(len(returns))[::-1]
+        expected = (returns.T * weights) @ returns / weights.sum() * 252
+        np.testing.assert_allclose(state.ewma_covariance(prices.columns.tolist()), expected)
+
+    def test_subset_is_submatrix(self):
+        prices = _prices()
+        state = _state(prices)
+
+        full = state.sample_covariance([1, 2, 3, 4])
+        np.testing.assert_allclose(state.sample_covariance([3, 1]), full[np.ix_([2, 0], [2, 0])])
+
+    def test_late_listing_uses_common_days(self):
+        prices = _prices()
+        prices.iloc[:120, 3] = np.nan
+        state = _state(prices)
+        returns = prices.pct_change(fill_method=None)
+
+        np.testing.assert_allclose(state.sample_covariance([1, 2, 3, 4]), returns.cov() * 252)
+        assert state.covers([1, 4])
+        assert state.count[0, 3] == len(prices) - 121
+
+    def test_holiday_gap_keeps_move_across_it(self):
+        state = IncrementalCovariance([1, 2], halflife=10.0)
+        state.update(date(2024, 1, 1), np.array([100.0, 50.0]))
+        state.update(date(2024, 1, 2), np.array([np.nan, 55.0]))
+        state.update(date(2024, 1, 3), np.array([110.0, 55.0]))
+
+        assert state.count[0, 0] == 1
+        assert state.sum_r[0, 0] == pytest.approx(0.10)
+        assert state.count[1, 1] == 2
+
+    def test_add_assets_after_updates(self):
+        prices = _prices(n_assets=3)
+        state = IncrementalCovariance([1, 2], halflife=20.0)
+        state.update_many(prices.index.date.tolist()[:100], prices.iloc[:100, :2].to_numpy())
+        state.add_assets([2, 3])
+        state.update_many(prices.index.date.tolist()[100:], prices.iloc[100:].to_numpy())
+
+        assert state.asset_ids == [1, 2, 3]
+        returns = prices.pct_change().dropna()
+        np.testing.assert_allclose(state.sample_covariance([1, 2]), returns.iloc[:, :2].cov() * 252)
+        assert state.count[2, 2] == len(prices) - 101
+
+    def test_retain_drops_assets_and_keeps_remaining_pairs(self):
+        prices = _prices(n_assets=4)
+        state = _state(prices)
+        full = state.ewma_covariance([1, 3, 4])
+
+        assert state.retain([4, 3, 1]) == [2]
+        assert state.asset_ids == [1, 3, 4]
+        assert state.count.shape == (3, 3)
+        assert len(state.last_prices) == 3
+        np.testing.assert_allclose(state.ewma_covariance([1, 3, 4]), full)
+        np.testing.assert_allclose(state.sample_covariance([3, 1]), _state(prices).sample_covariance([3, 1]))
+        assert not state.covers([1, 2])
+        assert state.retain([1, 3, 4]) == []
+
+    def test_covers_requires_known_assets_and_history(self):
+        state = _state(_prices(n_days=2))
+
+        assert not state.covers([1, 99])
+        assert not state.covers([1, 2])
+        assert state.covers([1, 2], min_observations=1)
+
+    def test_covers_defaults_to_one_halflife_of_common_returns(self):
+        prices = _prices(n_days=30, n_assets=2)
+        state = IncrementalCovariance([1], halflife=20.0)
+        state.update_many(prices.index.date.tolist(), prices.iloc[:, :1].to_numpy())
+        state.add_assets([2])
+        state.update_many(prices.index.date.tolist()[-11:], prices.iloc[-11:].to_numpy())
+
+        assert state.unpriced() == []
+        assert state.covers([1])
+        assert not state.covers([1, 2])
+
+    def test_unpriced_lists_assets_without_a_price(self):
+        state = _state(_prices(n_days=5, n_assets=2))
+        state.add_assets([3])
+
+        assert state.unpriced() == [3]
+
+    def test_bytes_round_trip(self):
+        state = _state(_prices())
+        restored = IncrementalCovariance.from_bytes(state.to_bytes())
+
+        assert restored.asset_ids == state.asset_ids
+        assert restored.as_of == state.as_of
+        assert restored.halflife == state.halflife
+        np.testing.assert_array_equal(restored.ewma, state.ewma)
+        np.testing.assert_array_equal(restored.last_prices, state.last_prices)
+
+    def test_empty_round_trip(self):
+        restored = IncrementalCovariance.from_bytes(IncrementalCovariance(halflife=5.0).to_bytes())
+
+        assert restored.asset_ids == []
+        assert restored.as_of is None
+
+
+class TestRiskModelFromIncremental:
+    def test_builds_model_for_window(self):
+        prices = _prices()
+        state = _state(prices)
+        window = prices.iloc[-100:].set_axis(["A", "B", "C", "D"], axis=1)
+
+        model = risk_model_from_incremental(state, [1, 2, 3, 4], window)
+
+        assert model.symbols == ["A", "B", "C", "D"]
+        expected_mu = (window.iloc[-1] / window.iloc[0]) ** (252 / 99) - 1
+        np.testing.assert_allclose(model.mu, expected_mu)
+        np.testing.assert_allclose(model.cov, state.ewma_covariance([1, 2, 3, 4]), rtol=1e-6)
+        assert np.linalg.eigvalsh(model.sample_cov).min() >= -1e-12
+
+
+class TestCovarianceUpdater:
+    @pytest.mark.asyncio
+    async def test_applies_complete_days_and_saves(self):
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result(scalar=None),  # no stored state
+            _result(scalars=[1, 2]),  # active assets
+            _result(rows=[("US", date(2024, 1, 4)), ("JP", date(2024, 1, 3))]),
+            _result(rows=[
+                (1, date(2024, 1, 2), Decimal("100"), None),
+                (2, date(2024, 1, 2), Decimal("50"), Decimal("25")),
+                (1, date(2024, 1, 3), Decimal("110"), None),
+                (2, date(2024, 1, 3), Decimal("55"), Decimal("27.5")),
+            ]),
+            MagicMock(),  # upsert
+        ]
+
+        await CovarianceUpdater(session).update()
+
+        price_query = session.execute.await_args_list[3].args[0].compile().params
+        assert date(2024, 1, 3) in price_query.values()
+        params = session.execute.await_args_list[4].args[0].compile().params
+        assert params["as_of"] == date(2024, 1, 3)
+        assert params["n_assets"] == 2
+        saved = IncrementalCovariance.from_bytes(params["payload"])
+        assert saved.sum_r[0, 0] == pytest.approx(0.10)
+        assert saved.sum_r[1, 1] == pytest.approx(0.10)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_up_to_date_state_skips_query(self):
+        state = IncrementalCovariance([1], halflife=20.0)
+        state.update(date(2024, 1, 3), np.array([100.0]))
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result(scalar=state.to_bytes()),
+            _result(scalars=[1]),
+            _result(rows=[("US", date(2024, 1, 3))]),
+        ]
+
+        await CovarianceUpdater(session).update()
+
+        assert session.execute.await_count == 3
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_inactive_assets_are_dropped_and_saved(self):
+        state = IncrementalCovariance([1, 2], halflife=20.0)
+        state.update(date(2024, 1, 3), np.array([100.0, 50.0]))
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result(scalar=state.to_bytes()),
+            _result(scalars=[1]),  # asset 2 deactivated
+            _result(rows=[("US", date(2024, 1, 3))]),
+            MagicMock(),  # upsert
+        ]
+
+        await CovarianceUpdater(session).update()
+
+        params = session.execute.await_args_list[3].args[0].compile().params
+        assert params["n_assets"] == 1
+        assert IncrementalCovariance.from_bytes(params["payload"]).asset_ids == [1]
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_asset_with_history_replays_everything(self):
+        state = IncrementalCovariance([1], halflife=20.0)
+        state.update(date(2024, 1, 2), np.array([100.0]))
+        state.update(date(2024, 1, 3), np.array([110.0]))
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result(scalar=state.to_bytes()),
+            _result(scalars=[1, 2]),  # asset 2 is new to the state
+            _result(rows=[("US", date(2024, 1, 4))]),
+            _result(scalar=1),  # asset 2 has prices before as_of
+            _result(rows=[
+                (1, date(2024, 1, 2), Decimal("100"), None),
+                (2, date(2024, 1, 2), Decimal("50"), None),
+                (1, date(2024, 1, 3), Decimal("110"), None),
+                (2, date(2024, 1, 3), Decimal("55"), None),
+                (1, date(2024, 1, 4), Decimal("121"), None),
+                (2, date(2024, 1, 4), Decimal("55"), None),
+            ]),
+            MagicMock(),  # upsert
+        ]
+
+        await CovarianceUpdater(session).update()
+
+        price_query = session.execute.await_args_list[4].args[0].compile().params
+        assert date(2024, 1, 3) not in price_query.values()
+        saved = IncrementalCovariance.from_bytes(session.execute.await_args_list[5].args[0].compile().params["payload"])
+        assert saved.as_of == date(2024, 1, 4)
+        np.testing.assert_allclose(np.diag(saved.count), [2, 2])
+        assert saved.sum_r[0, 0] == pytest.approx(0.20)
+        assert saved.sum_r[1, 1] == pytest.approx(0.10)
+
+    @pytest.mark.asyncio
+    async def test_new_asset_without_history_only_applies_new_days(self):
+        state = IncrementalCovariance([1], halflife=20.0)
+        state.update(date(2024, 1, 3), np.array([100.0]))
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result(scalar=state.to_bytes()),
+            _result(scalars=[1, 2]),
+            _result(rows=[("US", date(2024, 1, 4))]),
+            _result(scalar=None),  # asset 2 listed after as_of
+            _result(rows=[(1, date(2024, 1, 4), Decimal("110"), None), (2, date(2024, 1, 4), Decimal("50"), None)]),
+            MagicMock(),
+        ]
+
+        await CovarianceUpdater(session).update()
+
+        price_query = session.execute.await_args_list[4].args[0].compile().params
+        assert date(2024, 1, 3) in price_query.values()
+        saved = IncrementalCovariance.from_bytes(session.execute.await_args_list[5].args[0].compile().params["payload"])
+        assert saved.sum_r[0, 0] == pytest.approx(0.10)
+        assert saved.unpriced() == []
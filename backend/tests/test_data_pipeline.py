@@ -0,0 +1,483 @@
+"""Tests for data pipeline helpers (DB access mocked)."""
+
+import asyncio
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.app.services.data_pipeline.base import (
+    PRICE_COLUMNS,
+    FetchSummary,
+    frame_records,
+    indicator_watermarks,
+    price_watermarks,
+    split_tickers,
+)
+from src.app.services.data_pipeline.coordinator import PipelineCoordinator
+from src.app.services.data_pipeline.exchange_rate import EXCHANGE_PAIRS, ExchangeRateFetcher
+from src.app.services.data_pipeline.staging import indicator_staging, price_staging
+from src.app.services.data_pipeline.yfinance_fetcher import YFinanceFetcher
+
+
+def _result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+PriceRow = namedtuple("PriceRow", ["date", "close"])
+
+
+def _price_row(price_date: date, close: str) -> PriceRow:
+    return PriceRow(price_date, Decimal(close))
+
+
+class TestRefreshLatestQuote:
+    @pytest.mark.asyncio
+    async def test_upserts_latest_and_previous(self):
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result([_price_row(date(2024, 1, 5), "110"), _price_row(date(2024, 1, 4), "100")]),
+            MagicMock(),
+        ]
+        fetcher = YFinanceFetcher(session)
+
+        await fetcher._refresh_latest_quote(7)
+
+        params = session.execute.await_args_list[1].args[0].compile().params
+        assert params["asset_id"] == 7
+        assert params["close"] == Decimal("110")
+        assert params["previous_close"] == Decimal("100")
+        assert params["change_pct"] == pytest.approx(0.1)
+        assert params["as_of"] == date(2024, 1, 5)
+
+    @pytest.mark.asyncio
+    async def test_single_price_has_no_change(self):
+        session = AsyncMock()
+        session.execute.side_effect = [_result([_price_row(date(2024, 1, 5), "110")]), MagicMock()]
+        fetcher = YFinanceFetcher(session)
+
+        await fetcher._refresh_latest_quote(7)
+
+        params = session.execute.await_args_list[1].args[0].compile().params
+        assert params["previous_close"] is None
+        assert params["change_pct"] is None
+
+    @pytest.mark.asyncio
+    async def test_no_prices_skips_upsert(self):
+        session = AsyncMock()
+        session.execute.return_value = _result([])
+        fetcher = YFinanceFetcher(session)
+
+        await fetcher._refresh_latest_quote(7)
+
+        session.execute.assert_awaited_once()
+
+
+def _session_factory():
+    """Stand-in for ``async_session`` that hands out a new mock session per call."""
+    sessions = []
+
+    @asynccontextmanager
+    async def factory():
+        session = AsyncMock()
+        sessions.append(session)
+        yield session
+
+    return factory, sessions
+
+
+class TestFetchEach:
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_by_semaphore(self):
+        factory, _ = _session_factory()
+        fetcher = YFinanceFetcher(AsyncMock(), factory, asyncio.Semaphore(2))
+        in_flight, peak = 0, 0
+
+        async def fetch_one(worker, symbol):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        summary = await fetcher._fetch_each([f"S{i}" for i in range(6)], fetch_one)
+
+        assert peak == 2
+        assert sorted(summary.succeeded) == [f"S{i}" for i in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_each_symbol_gets_its_own_session(self):
+        factory, sessions = _session_factory()
+        fetcher = YFinanceFetcher(AsyncMock(), factory)
+        used = {}
+
+        async def fetch_one(worker, symbol):
+            used[symbol] = worker.session
+
+        await fetcher._fetch_each(["SPY", "AGG", "VNQ"], fetch_one)
+
+        assert len(sessions) == 3
+        assert {id(s) for s in used.values()} == {id(s) for s in sessions}
+
+    @pytest.mark.asyncio
+    async def test_failures_are_summarized_and_retried_on_fresh_sessions(self):
+        factory, sessions = _session_factory()
+        fetcher = YFinanceFetcher(AsyncMock(), factory)
+
+        async def fetch_one(worker, symbol):
+            if symbol == "BAD":
+                raise RuntimeError("no data")
+
+        with patch("src.app.services.data_pipeline.base.asyncio.sleep", AsyncMock()):
+            summary = await fetcher._fetch_each(["SPY", "BAD", "AGG"], fetch_one)
+
+        assert sorted(summary.succeeded) == ["AGG", "SPY"]
+        assert summary.failed == {"BAD": "no data"}
+        assert len(sessions) == 2 + YFinanceFetcher.MAX_RETRIES
+        assert str(summary) == "YFinanceFetcher: 2 succeeded, 1 failed (BAD)"
+
+
+def _download_frame(symbols: list[str], days: int = 3) -> pd.DataFrame:
+    """A ``yf.download(..., group_by="ticker")``-shaped result."""
+    index = pd.date_range("2024-01-02", periods=days, freq="B")
+    columns = pd.MultiIndex.from_product([symbols, ["Open", "High", "Low", "Close", "Volume"]])
+    return pd.DataFrame(np.arange(days * len(columns), dtype=float).reshape(days, -1), index=index, columns=columns)
+
+
+class TestSplitTickers:
+    def test_splits_multi_ticker_frame(self):
+        frames = split_tickers(_download_frame(["SPY", "AGG"]), ["SPY", "AGG"])
+
+        assert list(frames) == ["SPY", "AGG"]
+        assert list(frames["AGG"].columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert frames["AGG"]["Close"].tolist() == [8.0, 18.0, 28.0]
+
+    def test_drops_rows_without_close_and_missing_tickers(self):
+        frame = _download_frame(["SPY", "AGG"])
+        frame.loc[frame.index[0], ("AGG", "Close")] = np.nan
+
+        frames = split_tickers(frame, ["SPY", "AGG", "GONE"])
+
+        assert set(frames) == {"SPY", "AGG"}
+        assert len(frames["SPY"]) == 3
+        assert len(frames["AGG"]) == 2
+
+    def test_flat_single_ticker_frame(self):
+        frame = _download_frame(["SPY"])["SPY"]
+
+        assert split_tickers(frame, ["SPY"])["SPY"] is not None
+        assert split_tickers(pd.DataFrame(), ["SPY"]) == {}
+
+
+class TestFetchPrices:
+    @staticmethod
+    def _fetcher(batch_size: int) -> YFinanceFetcher:
+        factory, _ = _session_factory()
+        fetcher = YFinanceFetcher(AsyncMock(), factory, batch_size=batch_size)
+        fetcher._upsert_prices = AsyncMock()
+        return fetcher
+
+    @pytest.mark.asyncio
+    async def test_one_download_per_start_date_and_batch(self):
+        fetcher = self._fetcher(batch_size=2)
+        asset_ids = {"SPY": 1, "AGG": 2, "VNQ": 3, "GLD": 4}
+        last_dates = {1: date(2024, 1, 5), 2: date(2024, 1, 5), 3: date(2024, 1, 5)}
+        downloads = []
+
+        async def download(symbols, start, period):
+            downloads.append((tuple(symbols), start))
+            return split_tickers(_download_frame(symbols), symbols)
+
+        with (
+            patch.object(fetcher, "_plan_downloads", AsyncMock(return_value=(asset_ids, last_dates))),
+            patch.object(fetcher, "_download_batch", side_effect=download),
+        ):
+            summary = await fetcher.fetch(["SPY", "AGG", "VNQ", "GLD", "NEW"])
+
+        assert sorted(downloads, key=str) == sorted([
+            (("SPY", "AGG"), date(2024, 1, 6)),
+            (("VNQ",), date(2024, 1, 6)),
+            (("GLD",), None),
+        ], key=str)
+        assert sorted(summary.succeeded) == ["AGG", "GLD", "SPY", "VNQ"]
+        assert summary.failed == {"NEW": "asset not found in DB"}
+        upserted = {call.args[0] for call in fetcher._upsert_prices.await_args_list}
+        assert upserted == {1, 2, 3, 4}
+
+    @pytest.mark.asyncio
+    async def test_failed_download_fails_the_whole_batch(self):
+        fetcher = self._fetcher(batch_size=50)
+        asset_ids = {"SPY": 1, "AGG": 2}
+        download = AsyncMock(side_effect=RuntimeError("rate limited"))
+
+        with (
+            patch.object(fetcher, "_plan_downloads", AsyncMock(return_value=(asset_ids, {}))),
+            patch.object(fetcher, "_download_batch", download),
+            patch("src.app.services.data_pipeline.base.asyncio.sleep", AsyncMock()),
+        ):
+            summary = await fetcher.fetch(["SPY", "AGG"])
+
+        assert download.await_count == YFinanceFetcher.MAX_RETRIES
+        assert summary.failed == {"SPY": "rate limited", "AGG": "rate limited"}
+        fetcher._upsert_prices.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_symbols_missing_from_download_are_skipped(self):
+        fetcher = self._fetcher(batch_size=50)
+
+        with (
+            patch.object(fetcher, "_plan_downloads", AsyncMock(return_value=({"SPY": 1, "AGG": 2}, {}))),
+            patch.object(fetcher, "_download_batch", AsyncMock(return_value={"SPY": _download_frame(["SPY"])["SPY"]})),
+        ):
+            summary = await fetcher.fetch(["SPY", "AGG"])
+
+        assert sorted(summary.succeeded) == ["AGG", "SPY"]
+        fetcher._upsert_prices.assert_awaited_once()
+
+
+class TestStagingTable:
+    @staticmethod
+    def _session():
+        session = AsyncMock()
+        driver = AsyncMock()
+        raw = MagicMock(driver_connection=driver)
+        connection = AsyncMock(info={})
+        connection.get_raw_connection.return_value = raw
+        session.connection.return_value = connection
+        return session, driver
+
+    @pytest.mark.asyncio
+    async def test_copies_into_staging_then_merges(self):
+        session, driver = self._session()
+        records = [(7, date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+
+        count = await price_staging.upsert(session, records)
+
+        assert count == 1
+        driver.copy_records_to_table.assert_awaited_once_with(
+            "asset_prices_staging", records=records, columns=price_staging.columns,
+        )
+        create, merge = (call.args[0] for call in session.execute.await_args_list)
+        create_sql = str(create.compile(dialect=postgresql.dialect()))
+        assert "CREATE TEMPORARY TABLE IF NOT EXISTS asset_prices_staging" in create_sql
+        assert merge is price_staging.merge
+
+    @pytest.mark.asyncio
+    async def test_creates_staging_table_once_per_connection(self):
+        session, driver = self._session()
+        records = [(7, date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+
+        await price_staging.upsert(session, records)
+        await price_staging.upsert(session, records)
+        await indicator_staging.upsert(session, [("usd_jpy", "USD/JPY", 150.0, "JPY", date(2024, 1, 2), "yfinance")])
+
+        statements = [call.args[0] for call in session.execute.await_args_list]
+        assert statements[1:3] == [price_staging.merge, price_staging.merge]
+        assert statements[4] is indicator_staging.merge
+        creates = [str(statement.compile(dialect=postgresql.dialect())) for statement in statements[::3]]
+        assert "CREATE TEMPORARY TABLE IF NOT EXISTS asset_prices_staging" in creates[0]
+        assert "CREATE TEMPORARY TABLE IF NOT EXISTS economic_indicators_staging" in creates[1]
+        assert driver.copy_records_to_table.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_copy_recreates_table_on_retry(self):
+        session, driver = self._session()
+        records = [(7, date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+        driver.copy_records_to_table.side_effect = [RuntimeError("relation does not exist"), None]
+
+        with pytest.raises(RuntimeError):
+            await price_staging.upsert(session, records)
+        await price_staging.upsert(session, records)
+
+        create_calls = [
+            call for call in session.execute.await_args_list if call.args[0] is not price_staging.merge
+        ]
+        assert len(create_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_records_skips_database(self):
+        session, driver = self._session()
+
+        assert await price_staging.upsert(session, []) == 0
+        session.execute.assert_not_awaited()
+        driver.copy_records_to_table.assert_not_awaited()
+
+    def test_merge_updates_non_key_columns_on_conflict(self):
+        sql = str(indicator_staging.merge.compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("WITH staged AS \n(DELETE FROM economic_indicators_staging")
+        assert "ON CONFLICT ON CONSTRAINT uq_econ_indicators_type_date DO UPDATE" in sql
+        assert "value = excluded.value" in sql
+        assert "indicator_type = excluded" not in sql
+        assert "date = excluded" not in sql
+
+
+class TestFrameRecords:
+    def test_prices_match_row_by_row_conversion(self):
+        frame = _download_frame(["SPY"], days=3)["SPY"]
+        frame.loc[frame.index[1], "High"] = np.nan
+        frame.loc[frame.index[2], "Volume"] = np.nan
+
+        records = frame_records(
+            frame, price_staging.columns, PRICE_COLUMNS, constants={"asset_id": 7}, integers=("volume",),
+        )
+
+        assert records == [
+            (7, date(2024, 1, 2), 0.0, 1.0, 2.0, 3.0, None, 4),
+            (7, date(2024, 1, 3), 5.0, None, 7.0, 8.0, None, 9),
+            (7, date(2024, 1, 4), 10.0, 11.0, 12.0, 13.0, None, None),
+        ]
+        assert type(records[0][2]) is float
+        assert type(records[0][7]) is int
+
+    def test_drops_rows_missing_required_value(self):
+        series = pd.Series(
+            [4.1, ".", np.nan, 4.3], index=pd.date_range("2024-01-02", periods=4, freq="B"), dtype=object,
+        )
+        config = {"indicator_type": "us_treasury_10y", "indicator_name": "US 10Y", "source": "FRED"}
+
+        records = frame_records(
+            series.to_frame("value"), indicator_staging.columns, {"value": "value"},
+            constants={**config, "currency": None}, required="value",
+        )
+
+        assert records == [
+            ("us_treasury_10y", "US 10Y", 4.1, None, date(2024, 1, 2), "FRED"),
+            ("us_treasury_10y", "US 10Y", 4.3, None, date(2024, 1, 5), "FRED"),
+        ]
+
+    def test_missing_required_column_gives_no_records(self):
+        frame = pd.DataFrame({"Open": [1.0]}, index=pd.date_range("2024-01-02", periods=1))
+
+        assert frame_records(frame, ["date", "value"], {"value": "Close"}, required="value") == []
+
+
+class TestUpsertPrices:
+    @pytest.mark.asyncio
+    async def test_records_follow_staging_columns(self):
+        fetcher = YFinanceFetcher(AsyncMock())
+        frame = _download_frame(["SPY"], days=2)["SPY"]
+        frame.loc[frame.index[1], "Open"] = np.nan
+
+        with (
+            patch("src.app.services.data_pipeline.base.price_staging.upsert", AsyncMock(return_value=2)) as upsert,
+            patch.object(fetcher, "_refresh_latest_quote", AsyncMock()) as refresh,
+        ):
+            await fetcher._upsert_prices(7, frame)
+
+        records = upsert.await_args.args[1]
+        assert records == [
+            (7, date(2024, 1, 2), 0.0, 1.0, 2.0, 3.0, None, 4),
+            (7, date(2024, 1, 3), None, 6.0, 7.0, 8.0, None, 9),
+        ]
+        refresh.assert_awaited_once_with(7)
+        fetcher.session.commit.assert_awaited_once()
+
+
+class TestWatermarks:
+    @pytest.mark.asyncio
+    async def test_price_watermarks_in_one_grouped_query(self):
+        session = AsyncMock()
+        session.execute.return_value = _result([(1, date(2024, 1, 5)), (2, date(2024, 1, 4))])
+
+        assert await price_watermarks(session, [1, 2, 3]) == {1: date(2024, 1, 5), 2: date(2024, 1, 4)}
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "max(asset_prices.date)" in sql
+        assert "GROUP BY asset_prices.asset_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_indicator_watermarks_in_one_grouped_query(self):
+        session = AsyncMock()
+        session.execute.return_value = _result([("usd_jpy", date(2024, 1, 5))])
+
+        assert await indicator_watermarks(session, ["usd_jpy", "eur_jpy"]) == {"usd_jpy": date(2024, 1, 5)}
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY economic_indicators.indicator_type" in sql
+
+    @pytest.mark.asyncio
+    async def test_plan_downloads_query_count_is_independent_of_symbols(self):
+        symbols = [f"S{i}" for i in range(100)]
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result([(i, symbol) for i, symbol in enumerate(symbols)]),
+            _result([(0, date(2024, 1, 5))]),
+        ]
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        asset_ids, last_dates = await YFinanceFetcher(AsyncMock(), factory)._plan_downloads(symbols)
+
+        assert len(asset_ids) == 100
+        assert last_dates == {0: date(2024, 1, 5)}
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fx_pairs_plan_from_watermarks(self):
+        factory, _ = _session_factory()
+        fetcher = ExchangeRateFetcher(AsyncMock(), factory)
+        watermarks = {"usd_jpy": date(2024, 1, 5)}
+
+        with (
+            patch.object(fetcher, "_indicator_watermarks", AsyncMock(return_value=watermarks)) as lookup,
+            patch.object(ExchangeRateFetcher, "_fetch_pair", AsyncMock()) as fetch_pair,
+        ):
+            await fetcher.fetch()
+
+        lookup.assert_awaited_once_with(["usd_jpy", "eur_jpy"])
+        last_dates = {call.args[0]: call.args[2] for call in fetch_pair.await_args_list}
+        assert last_dates == {"USDJPY=X": date(2024, 1, 5), "EURJPY=X": None}
+        assert set(last_dates) == set(EXCHANGE_PAIRS)
+
+
+class TestPipelineCoordinator:
+    @pytest.mark.asyncio
+    async def test_fetchers_run_concurrently_then_covariance(self):
+        factory, _ = _session_factory()
+        coordinator = PipelineCoordinator(AsyncMock(), factory)
+        started = asyncio.Event()
+        events = []
+
+        def fake_fetch(name):
+            async def fetch():
+                events.append(f"{name} start")
+                # Every fetcher must be running before any finishes
+                if len(events) == 4:
+                    started.set()
+                await asyncio.wait_for(started.wait(), 1)
+                events.append(f"{name} end")
+                summary = FetchSummary(name)
+                summary.succeeded.append(name)
+                return summary
+            return fetch
+
+        coordinator.us_fetcher.fetch = fake_fetch("us")
+        coordinator.jp_fetcher.fetch = fake_fetch("jp")
+        coordinator.fred_fetcher.fetch = fake_fetch("fred")
+        coordinator.fx_fetcher.fetch = fake_fetch("fx")
+        coordinator.covariance_updater.update = AsyncMock(side_effect=lambda: events.append("covariance"))
+
+        summaries = await coordinator.update_all()
+
+        assert [s.source for s in summaries] == ["us", "jp", "fred", "fx"]
+        assert events[-1] == "covariance"
+        assert all(event.endswith("start") for event in events[:4])
+
+    def test_fetchers_share_one_semaphore(self):
+        coordinator = PipelineCoordinator(AsyncMock(), concurrency=3)
+
+        semaphores = {id(f.semaphore) for f in (
+            coordinator.us_fetcher, coordinator.jp_fetcher, coordinator.fred_fetcher, coordinator.fx_fetcher,
+        )}
+        assert len(semaphores) == 1
+        assert coordinator.us_fetcher.semaphore._value == 3
@@ -0,0 +1,60 @@
+"""Tests for LTTB downsampling."""
+
+import numpy as np
+import pytest
+
+from src.app.services.downsampling import lttb_indices
+
+
+def _loop_lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Reference textbook LTTB, one bucket at a time."""
+    n = len(y)
+    n_buckets = max_points - 2
+    edges = (np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    keep = [0]
+    a = 0
+    for b in range(n_buckets):
+        lo, hi = edges[b], edges[b + 1]
+        if b == n_buckets - 1:
+            cx, cy = x[-1], y[-1]
+        else:
+            cx, cy = x[hi:edges[b + 2]].mean(), y[hi:edges[b + 2]].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep.append(a)
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+class TestLttbIndices:
+    @pytest.mark.parametrize("n,max_points", [(10_000, 250), (1000, 37), (503, 500), (5, 3)])
+    def test_matches_reference(self, n, max_points):
+        rng = np.random.default_rng(n)
+        x = np.sort(rng.uniform(0, 100, n))
+        y = np.cumsum(rng.normal(size=n))
+
+        np.testing.assert_array_equal(lttb_indices(y, max_points, x), _loop_lttb(x, y, max_points))
+
+    def test_short_series_kept_whole(self):
+        np.testing.assert_array_equal(lttb_indices(np.ones(10), 10), np.arange(10))
+
+    def test_keeps_endpoints_and_count(self):
+        y = np.cumsum(np.random.default_rng(0).normal(size=2000))
+        idx = lttb_indices(y, 100)
+
+        assert len(idx) == 100
+        assert idx[0] == 0 and idx[-1] == 1999
+        assert (np.diff(idx) > 0).all()
+
+    def test_keeps_trough_every_nth_misses(self):
+        y = np.linspace(100.0, 120.0, 1000)
+        y[503] = 60.0  # one-day crash
+        assert 503 not in range(0, 1000, 1000 // 50)
+
+        assert 503 in lttb_indices(y, 50)
+
+    def test_rejects_too_few_points(self):
+        with pytest.raises(ValueError):
+            lttb_indices(np.ones(10), 2)
@@ -0,0 +1,134 @@
+"""Tests for the warm-started efficient frontier sweep."""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import EfficientFrontier
+
+from src.app.models.asset import Asset
+from src.app.services.efficient_frontier import FrontierProblem, max_return_weights, solve_frontier
+from src.app.services.portfolio_optimizer import PortfolioOptimizer, optimization_cache
+from src.app.services.risk_model import estimate_risk_model, risk_model_cache
+
+SYMBOLS = ["SPY", "AGG", "VNQ", "GLD", "EFA", "1306.T"]
+
+
+def _risk_model(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.01, (500, len(SYMBOLS))) * rng.uniform(0.5, 2.0, len(SYMBOLS))
+    return estimate_risk_model(100 * np.cumprod(1 + returns, axis=0), SYMBOLS)
+
+
+class TestMaxReturnWeights:
+    def test_fills_best_assets_first(self):
+        weights = max_return_weights(np.array([0.05, 0.20, 0.10, 0.15]), 0.4)
+        np.testing.assert_allclose(weights, [0.0, 0.4, 0.2, 0.4])
+
+    def test_uncapped_single_asset(self):
+        np.testing.assert_allclose(max_return_weights(np.array([0.1, 0.3]), 1.0), [0.0, 1.0])
+
+
+class TestSolveFrontier:
+    def test_endpoints_match_pypfopt(self):
+        model = _risk_model()
+        points = solve_frontier(model, 10, 0.3, 0.02)
+
+        ef = EfficientFrontier(model.mu, model.cov, weight_bounds=(0, 0.3))
+        ef.min_volatility()
+        _, min_vol, _ = ef.portfolio_performance()
+        assert points[0]["volatility"] == pytest.approx(min_vol, abs=1e-3)
+
+        top = max_return_weights(model.mu.to_numpy(), 0.3)
+        assert points[-1]["expected_return"] == pytest.approx(float(model.mu.to_numpy() @ top), abs=1e-4)
+
+    def test_interior_point_matches_efficient_return(self):
+        model = _risk_model()
+        points = solve_frontier(model, 9, 0.3, 0.02)
+        mid = points[4]
+
+        ef = EfficientFrontier(model.mu, model.cov, weight_bounds=(0, 0.3))
+        ef.efficient_return(mid["expected_return"])
+        _, volatility, _ = ef.portfolio_performance()
+        assert mid["volatility"] == pytest.approx(volatility, abs=1e-3)
+
+    def test_points_are_monotonic_and_feasible(self):
+        points = solve_frontier(_risk_model(1), 15, 0.3, 0.02)
+
+        assert len(points) == 15
+        assert np.all(np.diff([p["volatility"] for p in points]) >= -1e-4)
+        assert np.all(np.diff([p["expected_return"] for p in points]) >= -1e-4)
+        for point in points:
+            assert sum(point["weights"].values()) == pytest.approx(1.0, abs=5e-3)
+            assert max(point["weights"].values()) <= 0.3 + 1e-4
+
+    def test_infeasible_max_weight(self):
+        with pytest.raises(ValueError):
+            solve_frontier(_risk_model(), 5, 0.1, 0.02)
+
+
+class TestFrontierProblem:
+    def test_warm_solves_match_cold_solves(self):
+        model = _risk_model()
+        mu, cov = model.mu.to_numpy(), model.cov.to_numpy()
+        problem = FrontierProblem(mu, cov, 0.3)
+
+        high = float(mu @ max_return_weights(mu, 0.3))
+        for target in np.linspace(float(mu.mean()), high, 6)[:-1]:
+            warm = problem.solve(target)
+            cold = problem._solve_cold(target)
+            assert warm @ cov @ warm == pytest.approx(cold @ cov @ cold, rel=1e-3)
+
+    def test_unconverged_solve_falls_back(self):
+        model = _risk_model()
+        mu, cov = model.mu.to_numpy(), model.cov.to_numpy()
+        problem = FrontierProblem(mu, cov, 0.3)
+        problem.solver.update_settings(max_iter=1)
+
+        weights = problem.solve(float(mu.mean()))
+
+        assert weights is not None
+        assert float(mu @ weights) >= float(mu.mean()) - 1e-6
+
+
+class TestPortfolioOptimizerFrontier:
+    def setup_method(self):
+        optimization_cache.clear()
+        risk_model_cache.clear()
+        rng = np.random.default_rng(0)
+        prices = pd.DataFrame(
+            100 * np.cumprod(1 + rng.normal(0.0003, 0.01, (250, len(SYMBOLS))), axis=0),
+            index=pd.bdate_range("2023-01-02", periods=250),
+            columns=SYMBOLS,
+        )
+        self.optimizer = PortfolioOptimizer(session=None)
+        self.optimizer._select_assets = AsyncMock(return_value=[
+            Asset(id=i, symbol=s, name=s, asset_type="etf", market="us", currency="USD")
+            for i, s in enumerate(SYMBOLS, start=1)
+        ])
+        self.optimizer._get_price_matrix = AsyncMock(return_value=prices)
+        self.optimizer._get_risk_free_rate = AsyncMock(return_value=0.02)
+
+    def teardown_method(self):
+        optimization_cache.clear()
+        risk_model_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_frontier_is_cached(self):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            first = await self.optimizer.frontier("moderate", n_points=8)
+            second = await self.optimizer.frontier("moderate", n_points=8)
+            await self.optimizer.frontier("moderate", n_points=12)
+
+        assert first == second
+        assert len(first["points"]) == 8
+        assert first["risk_free_rate"] == 0.02
+        assert self.optimizer._get_price_matrix.await_count == 2
+
+
+class TestFrontierEndpoint:
+    @pytest.mark.asyncio
+    async def test_too_few_points(self, client):
+        response = await client.post("/api/v1/portfolios/frontier", json={"risk_tolerance": "moderate", "n_points": 1})
+        assert response.status_code == 422
@@ -0,0 +1,169 @@
+"""Tests for the low-rank factor covariance and the optimizers that consume it."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import EfficientFrontier
+
+from src.app.services.efficient_frontier import solve_frontier
+from src.app.services.factor_model import (
+    FactorCovariance,
+    fit_statistical_factors,
+    max_sharpe_weights,
+    min_variance_weights,
+)
+from src.app.services.portfolio_optimizer import STRATEGY_NAMES, solve_portfolio
+from src.app.services.risk_model import RiskModel, estimate_factor_risk_model
+from src.app.services.risk_parity import risk_contributions, solve_risk_parity
+
+
+def _returns(n_days: int = 750, n_assets: int = 30, n_factors: int = 3, seed: int = 0) -> np.ndarray:
+    """Daily returns with a known factor structure and some positive drift."""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0.0, 1.0, (n_assets, n_factors))
+    factors = rng.normal(0.0, 0.008, (n_days, n_factors))
+    noise = rng.normal(0.0, 0.01, (n_days, n_assets)) * rng.uniform(0.5, 1.5, n_assets)
+    return 0.0005 + factors @ loadings.T + noise
+
+
+def _symbols(n: int) -> list[str]:
+    return [f"S{i}" for i in range(n)]
+
+
+def _model(n_assets: int = 30, n_factors: int = 3, seed: int = 0) -> FactorCovariance:
+    return fit_statistical_factors(_returns(n_assets=n_assets, seed=seed), _symbols(n_assets), n_factors)
+
+
+def _factor_risk_model(n_assets: int = 30, seed: int = 0) -> RiskModel:
+    prices = 100 * np.cumprod(1 + _returns(n_assets=n_assets, seed=seed), axis=0)
+    return estimate_factor_risk_model(prices, _symbols(n_assets), 3)
+
+
+class TestFitStatisticalFactors:
+    def test_shapes_and_sample_variances(self):
+        returns = _returns()
+        model = fit_statistical_factors(returns, _symbols(30), 3)
+
+        assert model.loadings.shape == (30, 3)
+        assert model.factor_cov.shape == (3, 3)
+        assert model.n_factors == 3
+        np.testing.assert_allclose(model.diagonal(), returns.var(axis=0, ddof=1) * 252, rtol=1e-4)
+
+    def test_factors_match_leading_principal_components(self):
+        returns = _returns()
+        model = fit_statistical_factors(returns, _symbols(30), 3)
+
+        eigenvalues = np.linalg.eigvalsh(np.cov(returns, rowvar=False) * 252)[::-1]
+        np.testing.assert_allclose(np.sort(np.diag(model.factor_cov))[::-1], eigenvalues[:3], rtol=1e-6)
+
+    def test_close_to_sample_covariance_when_structure_is_low_rank(self):
+        returns = _returns(n_days=5000)
+        model = fit_statistical_factors(returns, _symbols(30), 3)
+
+        sample = np.cov(returns, rowvar=False) * 252
+        off_diagonal = ~np.eye(30, dtype=bool)
+        assert np.abs(model.to_frame().to_numpy() - sample)[off_diagonal].max() < 0.1 * np.abs(sample).max()
+
+    def test_factor_count_capped_by_data(self):
+        model = fit_statistical_factors(_returns(n_days=5, n_assets=8), _symbols(8), 10)
+
+        assert model.n_factors == 4
+        assert np.all(model.specific_var > 0)
+
+
+class TestFactorCovariance:
+    def test_operations_match_dense_matrix(self):
+        model = _model()
+        dense = model.to_frame().to_numpy()
+        x = np.random.default_rng(1).uniform(0, 1, 30)
+
+        assert model.variance(x) == pytest.approx(x @ dense @ x)
+        np.testing.assert_allclose(model.matvec(x), dense @ x)
+        np.testing.assert_allclose(model.diagonal(), np.diag(dense))
+
+    def test_solve_shifted_matches_dense_solve(self):
+        model = _model()
+        dense = model.to_frame().to_numpy()
+        rng = np.random.default_rng(2)
+        shift, rhs = rng.uniform(0.1, 1.0, 30), rng.normal(size=30)
+
+        np.testing.assert_allclose(model.solve_shifted(shift, rhs), np.linalg.solve(dense + np.diag(shift), rhs))
+
+    def test_subset_is_submatrix(self):
+        model = _model()
+        dense = model.to_frame()
+
+        sub = model.subset(["S7", "S2"])
+        assert sub.symbols == ["S7", "S2"]
+        np.testing.assert_allclose(sub.to_frame(), dense.loc[["S7", "S2"], ["S7", "S2"]])
+
+    def test_general_factor_covariance(self):
+        rng = np.random.default_rng(3)
+        loadings = rng.normal(size=(6, 2))
+        factor_cov = np.array([[0.04, 0.01], [0.01, 0.02]])
+        model = FactorCovariance(_symbols(6), loadings, factor_cov, np.full(6, 0.01))
+
+        np.testing.assert_allclose(model.to_frame(), loadings @ factor_cov @ loadings.T + 0.01 * np.eye(6))
+
+
+class TestFactorOptimizers:
+    def test_min_variance_matches_dense_solve(self):
+        model = _model()
+        weights = min_variance_weights(model, 0.2)
+
+        ef = EfficientFrontier(None, model.to_frame(), weight_bounds=(0, 0.2))
+        ef.min_volatility()
+        dense_weights = np.array(list(ef.weights))
+        assert weights.sum() == pytest.approx(1.0)
+        assert weights.max() <= 0.2 + 1e-6
+        assert model.variance(weights) == pytest.approx(model.variance(dense_weights), rel=1e-4)
+
+    def test_max_sharpe_matches_dense_solve(self):
+        model = _model()
+        mu = np.random.default_rng(4).uniform(0.0, 0.15, 30)
+        weights = max_sharpe_weights(mu, model, 0.02, 0.2)
+
+        ef = EfficientFrontier(pd.Series(mu, index=model.symbols), model.to_frame(), weight_bounds=(0, 0.2))
+        ef.max_sharpe(risk_free_rate=0.02)
+        _, _, dense_sharpe = ef.portfolio_performance(risk_free_rate=0.02)
+        assert weights.sum() == pytest.approx(1.0)
+        assert (mu @ weights - 0.02) / np.sqrt(model.variance(weights)) == pytest.approx(dense_sharpe, rel=1e-4)
+
+    def test_max_sharpe_needs_an_asset_above_risk_free(self):
+        with pytest.raises(ValueError):
+            max_sharpe_weights(np.full(30, 0.01), _model(), 0.02, 0.2)
+
+    def test_risk_parity_matches_dense_solve(self):
+        model = _model(n_assets=200)
+        solution = solve_risk_parity(model)
+
+        assert solution.converged
+        np.testing.assert_allclose(risk_contributions(solution.weights, model), 1 / 200, atol=1e-8)
+        dense = solve_risk_parity(model.to_frame().to_numpy())
+        np.testing.assert_allclose(solution.weights, dense.weights, atol=1e-10)
+
+    def test_frontier_matches_dense_model(self):
+        factor = _factor_risk_model()
+        dense = RiskModel(factor.mu, factor.cov.to_frame(), factor.cov.to_frame(), factor.mean_returns)
+
+        factor_points = solve_frontier(factor, 8, 0.2, 0.02)
+        dense_points = solve_frontier(dense, 8, 0.2, 0.02)
+
+        assert len(factor_points) == len(dense_points) == 8
+        for a, b in zip(factor_points, dense_points, strict=True):
+            assert a["expected_return"] == pytest.approx(b["expected_return"], abs=2e-4)
+            assert a["volatility"] == pytest.approx(b["volatility"], abs=2e-4)
+
+
+class TestSolvePortfolioWithFactorModel:
+    @pytest.mark.parametrize("strategy", list(STRATEGY_NAMES))
+    def test_every_strategy_solves_on_factor_model(self, strategy):
+        model = _factor_risk_model()
+
+        used, weights, metrics = solve_portfolio(strategy, model, 0.02, None)
+
+        assert used == strategy
+        assert sum(weights.values()) == pytest.approx(1.0)
+        w = np.array(list(weights.values()))
+        dense = model.sample_cov.to_frame().loc[list(weights), list(weights)].to_numpy()
+        assert metrics["volatility"] == pytest.approx(np.sqrt(w @ dense @ w), abs=1e-4)
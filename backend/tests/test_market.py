@@ -0,0 +1,86 @@
+"""Tests for market data queries and the cached market endpoints."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.app.api.v1.endpoints.market import market_cache
+from src.app.crud.market import get_latest_indicators
+from src.app.models.economic_indicator import EconomicIndicator
+from src.app.models.latest_quote import LatestQuote
+
+
+def _result(rows=None, scalars=None):
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalars.return_value.all.return_value = scalars or []
+    return result
+
+
+def _indicator(indicator_type: str, value: str) -> EconomicIndicator:
+    return EconomicIndicator(
+        indicator_type=indicator_type, indicator_name=indicator_type, value=Decimal(value),
+        date=date(2024, 1, 5), source="fred",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_market_cache():
+    market_cache.invalidate()
+    yield
+    market_cache.invalidate()
+
+
+class TestGetLatestIndicators:
+    @pytest.mark.asyncio
+    async def test_single_ranked_query(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(scalars=[_indicator("usd_jpy", "150.1")])
+
+        indicators = await get_latest_indicators(session)
+
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "DISTINCT" not in sql
+        assert (
+            "row_number() OVER (PARTITION BY economic_indicators.indicator_type "
+            "ORDER BY economic_indicators.date DESC)"
+        ) in sql
+        assert "WHERE anon_1.rank = " in sql
+        assert list(indicators) == ["usd_jpy"]
+
+
+class TestMarketEndpoints:
+    @pytest.mark.asyncio
+    async def test_summary_two_queries_then_cached(self, client, mock_db):
+        spy = LatestQuote(asset_id=1, close=Decimal("500"), change_pct=0.01, as_of=date(2024, 1, 5))
+        mock_db.execute.side_effect = [
+            _result(scalars=[_indicator("us_treasury_10y", "4.1"), _indicator("usd_jpy", "150.1")]),
+            _result(rows=[("SPY", spy)]),
+        ]
+
+        first = await client.get("/api/v1/market/summary")
+        second = await client.get("/api/v1/market/summary")
+
+        assert mock_db.execute.await_count == 2
+        assert first.json() == second.json()
+        body = first.json()
+        assert [b["indicator_type"] for b in body["bonds"]] == ["us_treasury_10y"]
+        assert body["forex"][0] == {"pair": "USD/JPY", "rate": 150.1, "change_pct": None, "as_of": "2024-01-05"}
+        assert body["indices"][0]["symbol"] == "SPY"
+        assert second.headers["Cache-Control"] == "public, max-age=3600"
+
+    @pytest.mark.asyncio
+    async def test_indicators_in_fixed_order(self, client, mock_db):
+        # The query returns rows in no particular order
+        mock_db.execute.return_value = _result(scalars=[
+            _indicator("eur_jpy", "160.2"), _indicator("us_treasury_10y", "4.1"), _indicator("usd_jpy", "150.1"),
+        ])
+
+        response = await client.get("/api/v1/market/indicators")
+
+        mock_db.execute.assert_awaited_once()
+        assert [i["indicator_type"] for i in response.json()] == ["us_treasury_10y", "usd_jpy", "eur_jpy"]
@@ -0,0 +1,117 @@
+"""Tests for the vectorized Monte Carlo path engine."""
+
+import numpy as np
+import pytest
+
+from src.app.services.monte_carlo import (
+    PERCENTILES,
+    bootstrap_paths,
+    parametric_paths,
+    percentile_bands,
+    project_bootstrap,
+    project_parametric,
+)
+
+
+def _history(n_days: int = 1000, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0003, 0.01, n_days)
+
+
+class TestParametricPaths:
+    def test_matches_lognormal_moments(self):
+        log_growth = parametric_paths(0.07, 0.15, 10, 100_000, seed=1)
+        drift = 0.07 - 0.5 * 0.15**2
+
+        assert log_growth.shape == (100_000, 10)
+        np.testing.assert_allclose(log_growth.mean(axis=0), drift * np.arange(1, 11), atol=0.01)
+        np.testing.assert_allclose(log_growth.std(axis=0), 0.15 * np.sqrt(np.arange(1, 11)), rtol=0.02)
+        # Arithmetic mean of the value grows at the arithmetic mean return
+        assert np.exp(log_growth[:, -1]).mean() == pytest.approx(np.exp(0.07 * 10), rel=0.02)
+
+    def test_seed_is_deterministic(self):
+        first = parametric_paths(0.05, 0.1, 5, 1000, 42)
+
+        np.testing.assert_array_equal(first, parametric_paths(0.05, 0.1, 5, 1000, 42))
+        assert not np.array_equal(first, parametric_paths(0.05, 0.1, 5, 1000, 43))
+
+    def test_small_chunks_fill_every_path(self):
+        log_growth = parametric_paths(0.05, 0.1, 3, 1001, seed=0, chunk_elements=10)
+
+        assert np.isfinite(log_growth).all()
+        assert len(np.unique(log_growth[:, 0])) == 1001
+
+    def test_zero_volatility_is_deterministic_growth(self):
+        log_growth = parametric_paths(0.05, 0.0, 4, 10, seed=0)
+
+        np.testing.assert_allclose(log_growth, np.tile(0.05 * np.arange(1, 5), (10, 1)))
+
+
+class TestBootstrapPaths:
+    def test_block_of_whole_history_replays_a_rotation_of_it(self):
+        history = _history(504)
+
+        log_growth = bootstrap_paths(history, 2, 3, block_days=504, seed=0)
+
+        np.testing.assert_allclose(log_growth[:, 1], history.sum())
+        rotations = [np.roll(history, -s)[:252].sum() for s in range(504)]
+        assert all(np.isclose(rotations, value).any() for value in log_growth[:, 0])
+
+    def test_matches_day_by_day_resampling(self):
+        history = _history(300)
+        block_days, n_paths = 100, 50
+
+        log_growth = bootstrap_paths(history, 3, n_paths, block_days=block_days, seed=3)
+
+        # Same draws, replayed one day at a time with wrap-around
+        starts = np.random.default_rng(3).integers(0, 300, size=(n_paths, 8))
+        days = (starts[:, :, None] + np.arange(block_days)).reshape(n_paths, -1) % 300
+        daily = np.cumsum(history[days], axis=1)
+        np.testing.assert_allclose(log_growth, daily[:, [251, 503, 755]])
+
+    def test_constant_history_grows_deterministically(self):
+        log_growth = bootstrap_paths(np.full(500, 0.001), 5, 100, block_days=20, seed=0)
+
+        np.testing.assert_allclose(log_growth, np.tile(0.001 * 252 * np.arange(1, 6), (100, 1)))
+
+    def test_mean_growth_matches_history(self):
+        history = _history(2520)
+        log_growth = bootstrap_paths(history, 10, 20_000, block_days=20, seed=5)
+
+        assert log_growth[:, -1].mean() == pytest.approx(history.mean() * 2520, abs=0.02)
+
+    def test_seed_and_chunking(self):
+        history = _history()
+
+        first = bootstrap_paths(history, 5, 2000, block_days=20, seed=9)
+        np.testing.assert_array_equal(first, bootstrap_paths(history, 5, 2000, block_days=20, seed=9))
+        assert np.isfinite(bootstrap_paths(history, 5, 2000, block_days=20, seed=9, chunk_elements=500)).all()
+
+    def test_history_shorter_than_block_rejected(self):
+        with pytest.raises(ValueError):
+            bootstrap_paths(_history(10), 1, 10, block_days=20)
+
+
+class TestPercentileBands:
+    def test_bands_are_ordered_per_year(self):
+        bands = project_parametric(0.06, 0.15, 1_000_000, 5, 10_000, seed=0)
+
+        assert [b["year"] for b in bands] == [1, 2, 3, 4, 5]
+        for band in bands:
+            values = [band[f"p{p}"] for p in PERCENTILES]
+            assert values == sorted(values)
+            assert 0 < band["probability_of_loss"] < 1
+        assert bands[-1]["p95"] - bands[-1]["p5"] > bands[0]["p95"] - bands[0]["p5"]
+
+    def test_loss_probability_and_percentiles(self):
+        log_growth = np.log(np.array([[0.5], [0.9], [1.1], [1.2], [2.0]]))
+
+        (band,) = percentile_bands(log_growth, 100.0)
+
+        assert band["p50"] == 110.0
+        assert band["probability_of_loss"] == 0.4
+        assert band["mean"] == 114.0
+
+    def test_bootstrap_projection_is_reproducible(self):
+        history = _history()
+
+        assert project_bootstrap(history, 20, 1e6, 3, 1000, 7) == project_bootstrap(history, 20, 1e6, 3, 1000, 7)
@@ -1,10 +1,22 @@
 """Tests for portfolio optimizer service."""
 
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import numpy as np
 import pandas as pd
 import pytest
 
-from src.app.services.portfolio_optimizer import PortfolioOptimizer
+from src.app.models.asset import Asset
+from src.app.services.covariance import IncrementalCovariance, covariance_store
+from src.app.services.factor_model import FactorCovariance
+from src.app.services.portfolio_optimizer import (
+    PortfolioOptimizer,
+    optimization_cache,
+    risk_parity_warm_starts,
+    solve_portfolio,
+)
+from src.app.services.risk_model import risk_model_cache
 
 
 class TestPortfolioOptimizerPureMethods:
@@ -60,7 +72,9 @@ class TestPortfolioOptimizerPureMethods:
             index=dates,
         )
         weights = {"A": 0.6, "B": 0.4}
-        metrics = self.optimizer._calculate_metrics(weights, returns, risk_free_rate=0.04)
+        metrics = self.optimizer._calculate_metrics(
+            weights, returns.mean() * 252, returns.cov() * 252, risk_free_rate=0.04,
+        )
 
         assert "expected_return" in metrics
         assert "volatility" in metrics
@@ -70,7 +84,7 @@ class TestPortfolioOptimizerPureMethods:
     def test_calculate_metrics_missing_symbols(self):
         returns = pd.DataFrame({"A": [0.01, -0.02, 0.03]})
         weights = {"X": 0.5, "Y": 0.5}
-        metrics = self.optimizer._calculate_metrics(weights, returns, 0.04)
+        metrics = self.optimizer._calculate_metrics(weights, returns.mean() * 252, returns.cov() * 252, 0.04)
         assert metrics["expected_return"] is None
 
     def test_optimize_hrp(self):
@@ -84,7 +98,7 @@ class TestPortfolioOptimizerPureMethods:
             },
             index=dates,
         )
-        weights = self.optimizer._optimize_hrp(returns)
+        weights = self.optimizer._optimize_hrp(returns.cov())
         assert len(weights) == 3
         assert abs(sum(w for w in weights.values() if w > 0) - 1.0) < 0.01
 
@@ -98,8 +112,346 @@ class TestPortfolioOptimizerPureMethods:
             },
             index=dates,
         )
-        weights = self.optimizer._optimize_risk_parity(returns)
+        weights = self.optimizer._optimize_risk_parity(returns.cov())
         assert len(weights) == 2
         assert abs(sum(weights.values()) - 1.0) < 0.01
         # Lower-vol asset should get higher weight
         assert weights["A"] > weights["B"]
+
+
+class TestPortfolioOptimizerCache:
+    """optimize() caches weights/metrics and rebuilds per-request fields."""
+
+    def setup_method(self):
+        optimization_cache.clear()
+        self.optimizer = PortfolioOptimizer(session=None)
+        self.optimizer._compute_allocation = AsyncMock(return_value={
+            "strategy": "min_volatility",
+            "metrics": {"expected_return": 0.05, "volatility": 0.08, "sharpe_ratio": 0.2},
+            "holdings": [
+                ({"symbol": "AGG", "name_ja": None, "asset_type": "bond", "market": "us"}, 2 / 3),
+                ({"symbol": "SPY", "name_ja": None, "asset_type": "etf", "market": "us"}, 1 / 3),
+            ],
+        })
+
+    def teardown_method(self):
+        optimization_cache.clear()
+
+    async def _optimize(self, **kwargs):
+        params = {"risk_score": 2, "risk_tolerance": "conservative", "investment_horizon": "long"}
+        params.update(kwargs)
+        return await self.optimizer.optimize(**params)
+
+    @pytest.mark.asyncio
+    async def test_amounts_recomputed_per_request(self):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            first = await self._optimize(investment_amount=3_000_000)
+            second = await self._optimize(risk_score=3, investment_amount=900_000, currency="USD")
+
+        self.optimizer._compute_allocation.assert_awaited_once()
+        assert [a["amount"] for a in first["allocations"]] == [2_000_000, 1_000_000]
+        assert [a["amount"] for a in second["allocations"]] == [600_000, 300_000]
+        assert [a["weight"] for a in second["allocations"]] == [0.6667, 0.3333]
+        assert second["risk_profile"]["risk_score"] == 3
+        assert second["currency"] == "USD"
+
+    @pytest.mark.asyncio
+    async def test_constraint_order_does_not_matter(self):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            await self._optimize(constraints={"include_markets": ["jp", "us"], "max_single_asset_weight": 0.3})
+            await self._optimize(constraints={"max_single_asset_weight": 0.3, "include_markets": ["us", "jp"]})
+            await self._optimize(constraints={"max_single_asset_weight": 0.2, "include_markets": ["us", "jp"]})
+
+        assert self.optimizer._compute_allocation.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_new_market_data_version_recomputes(self):
+        refresh = AsyncMock(side_effect=[1, 2])
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", refresh):
+            await self._optimize()
+            await self._optimize()
+
+        assert self.optimizer._compute_allocation.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_covariance_method_is_part_of_key(self):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)), \
+                patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=None)):
+            await self._optimize()
+            await self._optimize(covariance_method="ewma")
+            await self._optimize(covariance_method="ewma")
+
+        assert self.optimizer._compute_allocation.await_count == 2
+        assert self.optimizer._compute_allocation.await_args.args[-1] == "ewma"
+
+    @pytest.mark.asyncio
+    async def test_new_covariance_state_recomputes_ewma_at_same_price_version(self):
+        # The pipeline commits prices first; a worker may reload the covariance state later
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)), \
+                patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=None)):
+            with patch.object(covariance_store, "_updated_at", "old"):
+                await self._optimize(covariance_method="ewma")
+                await self._optimize(covariance_method="ewma")
+                await self._optimize()
+            with patch.object(covariance_store, "_updated_at", "new"):
+                await self._optimize(covariance_method="ewma")
+                await self._optimize()
+
+        assert self.optimizer._compute_allocation.await_count == 3
+
+
+class TestIncrementalRiskModel:
+    """The ewma path falls back to Ledoit-Wolf when the pipeline state can't serve the universe."""
+
+    def _prices(self):
+        index = pd.bdate_range("2024-01-01", periods=5)
+        return pd.DataFrame({"SPY": np.linspace(100, 104, 5), "AGG": np.linspace(50, 51, 5)}, index=index)
+
+    def _assets(self):
+        return [
+            Asset(id=1, symbol="SPY", name="SPY", asset_type="etf", market="us", currency="USD"),
+            Asset(id=2, symbol="AGG", name="AGG", asset_type="bond", market="us", currency="USD"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_state_returns_none(self):
+        optimizer = PortfolioOptimizer(session=None)
+        with patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=None)):
+            assert await optimizer._incremental_risk_model(self._prices(), self._assets()) is None
+
+    @pytest.mark.asyncio
+    async def test_uncovered_universe_returns_none(self):
+        state = IncrementalCovariance([1], halflife=20.0)
+        optimizer = PortfolioOptimizer(session=None)
+        with patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=state)):
+            assert await optimizer._incremental_risk_model(self._prices(), self._assets()) is None
+
+    @pytest.mark.asyncio
+    async def test_covered_universe_uses_state(self):
+        prices = self._prices()
+        rng = np.random.default_rng(1)
+        history = 100 * np.cumprod(1 + rng.normal(0, 0.01, (30, 2)), axis=0)
+        state = IncrementalCovariance([2, 1], halflife=20.0)
+        state.update_many(list(range(30)), history)
+        optimizer = PortfolioOptimizer(session=None)
+        with patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=state)):
+            model = await optimizer._incremental_risk_model(prices, self._assets())
+
+        assert model.symbols == ["SPY", "AGG"]
+        np.testing.assert_allclose(model.cov.to_numpy(), state.ewma_covariance([1, 2]), rtol=1e-6)
+
+
+class TestPortfolioOptimizerCompare:
+    """compare() solves every strategy over one asset selection and price load."""
+
+    def setup_method(self):
+        optimization_cache.clear()
+        risk_model_cache.clear()
+        risk_parity_warm_starts.clear()
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2023-01-02", periods=250)
+        symbols = ["SPY", "AGG", "VNQ", "GLD", "1306.T"]
+        prices = pd.DataFrame(
+            100 * np.cumprod(1 + rng.normal(0.0003, 0.01, (250, 5)), axis=0), index=index, columns=symbols,
+        )
+        self.optimizer = PortfolioOptimizer(session=None)
+        self.optimizer._select_assets = AsyncMock(return_value=[
+            Asset(id=i, symbol=s, name=s, asset_type="etf", market="us", currency="USD")
+            for i, s in enumerate(symbols, start=1)
+        ])
+        self.optimizer._get_price_matrix = AsyncMock(return_value=prices)
+        self.optimizer._get_risk_free_rate = AsyncMock(return_value=0.02)
+
+    def teardown_method(self):
+        optimization_cache.clear()
+        risk_model_cache.clear()
+        risk_parity_warm_starts.clear()
+
+    async def _compare(self, strategies):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            return await self.optimizer.compare(
+                risk_score=5, risk_tolerance="moderate", investment_horizon="long",
+                strategies=strategies, investment_amount=1_000_000,
+            )
+
+    @pytest.mark.asyncio
+    async def test_single_data_load_for_all_strategies(self):
+        strategies = ["min_volatility", "hrp", "max_sharpe", "risk_parity", "equal_weight"]
+        results = await self._compare(strategies)
+
+        assert [r["strategy"] for r in results] == strategies
+        self.optimizer._select_assets.assert_awaited_once()
+        self.optimizer._get_price_matrix.assert_awaited_once()
+        self.optimizer._get_risk_free_rate.assert_awaited_once()
+        for result in results:
+            assert abs(sum(a["weight"] for a in result["allocations"]) - 1.0) < 1e-3
+            assert result["risk_profile"] == {"risk_score": 5, "risk_tolerance": "moderate"}
+
+    @pytest.mark.asyncio
+    async def test_cached_strategies_are_not_resolved(self):
+        await self._compare(["hrp"])
+        self.optimizer._compute_allocations = AsyncMock(wraps=self.optimizer._compute_allocations)
+
+        results = await self._compare(["hrp", "equal_weight", "hrp"])
+
+        assert [r["strategy"] for r in results] == ["hrp", "equal_weight"]
+        assert self.optimizer._compute_allocations.await_args.args[1] == ["equal_weight"]
+
+    @pytest.mark.asyncio
+    async def test_shares_cache_with_optimize(self):
+        await self._compare(["min_volatility"])
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            result = await self.optimizer.optimize(
+                risk_score=5, risk_tolerance="moderate", investment_horizon="long", strategy="min_volatility",
+            )
+
+        assert result["strategy"] == "min_volatility"
+        self.optimizer._get_price_matrix.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_factor_covariance_method(self):
+        strategies = ["min_volatility", "hrp", "max_sharpe", "risk_parity", "equal_weight"]
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)):
+            results = await self.optimizer.compare(
+                risk_score=5, risk_tolerance="moderate", investment_horizon="long",
+                strategies=strategies, covariance_method="factor",
+            )
+
+        assert [r["strategy"] for r in results] == strategies
+        (model,) = risk_model_cache._models._data.values()
+        assert isinstance(model.cov, FactorCovariance)
+        for result in results:
+            assert abs(sum(a["weight"] for a in result["allocations"]) - 1.0) < 1e-3
+            assert result["metrics"]["volatility"] > 0
+
+    @pytest.mark.asyncio
+    async def test_resampled_draws_spread_over_pool_jobs(self):
+        run = AsyncMock(side_effect=lambda func, *args: func(*args))
+        with patch("src.app.services.portfolio_optimizer.compute_executor.run", run), \
+                patch("src.app.services.portfolio_optimizer.settings.RESAMPLED_SAMPLES", 120):
+            (result,) = await self._compare(["resampled"])
+
+            (model,) = risk_model_cache._models._data.values()
+            _, inline_weights, _ = solve_portfolio("resampled", model, 0.02, None)
+
+        assert result["strategy"] == "resampled"
+        jobs = [call.args[0].__name__ for call in run.await_args_list]
+        assert jobs == ["estimate_risk_model"] + ["resampled_min_variance"] * 3
+        weights = {a["asset"]["symbol"]: a["weight"] for a in result["allocations"]}
+        assert weights == {s: round(w, 4) for s, w in inline_weights.items()}
+
+    @pytest.mark.asyncio
+    async def test_resampled_falls_back_to_equal_weight(self):
+        with patch("src.app.services.portfolio_optimizer.average_weights", side_effect=ValueError("no draws")):
+            (result,) = await self._compare(["resampled"])
+
+        assert result["strategy"] == "equal_weight"
+        assert [a["weight"] for a in result["allocations"]] == [0.2] * 5
+
+    @pytest.mark.asyncio
+    async def test_risk_parity_warm_starts_from_previous_version(self):
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(side_effect=[1, 2])):
+            await self.optimizer.compare(
+                risk_score=5, risk_tolerance="moderate", investment_horizon="long", strategies=["risk_parity"],
+            )
+            with patch.object(PortfolioOptimizer, "_optimize_risk_parity", autospec=True,
+                              side_effect=PortfolioOptimizer._optimize_risk_parity) as solver:
+                await self.optimizer.compare(
+                    risk_score=5, risk_tolerance="moderate", investment_horizon="long", strategies=["risk_parity"],
+                )
+
+        warm_start = solver.call_args.args[2]
+        assert set(warm_start) == {"SPY", "AGG", "VNQ", "GLD", "1306.T"}
+        assert sum(warm_start.values()) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_ewma_risk_parity_warm_starts_across_covariance_states(self):
+        kwargs = dict(
+            risk_score=5, risk_tolerance="moderate", investment_horizon="long", strategies=["risk_parity"],
+            covariance_method="ewma",
+        )
+        with patch("src.app.services.portfolio_optimizer.price_store.refresh", AsyncMock(return_value=1)), \
+                patch("src.app.services.portfolio_optimizer.covariance_store.get", AsyncMock(return_value=None)):
+            with patch.object(covariance_store, "_updated_at", "old"):
+                await self.optimizer.compare(**kwargs)
+            with patch.object(covariance_store, "_updated_at", "new"), \
+                    patch.object(PortfolioOptimizer, "_optimize_risk_parity", autospec=True,
+                                 side_effect=PortfolioOptimizer._optimize_risk_parity) as solver:
+                await self.optimizer.compare(**kwargs)
+
+        assert solver.call_args.args[2] is not None
+
+
+class TestCompareEndpoint:
+    @pytest.mark.asyncio
+    async def test_unknown_strategy_rejected(self, client):
+        response = await client.post("/api/v1/portfolios/compare", json={
+            "risk_score": 5, "risk_tolerance": "moderate", "investment_horizon": "long",
+            "strategies": ["hrp", "magic"],
+        })
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_empty_strategies_rejected(self, client):
+        response = await client.post("/api/v1/portfolios/compare", json={
+            "risk_score": 5, "risk_tolerance": "moderate", "investment_horizon": "long", "strategies": [],
+        })
+        assert response.status_code == 422
+
+
+class TestGenerateEndpointCoalescing:
+    """Identical concurrent /generate requests share one optimization."""
+
+    REQUEST = {"risk_score": 5, "risk_tolerance": "moderate", "investment_horizon": "long"}
+
+    @staticmethod
+    def _portfolio(**_):
+        return {
+            "name": "バランス型ポートフォリオ",
+            "strategy": "hrp",
+            "risk_profile": {"risk_score": 5, "risk_tolerance": "moderate"},
+            "metrics": {"expected_return": 0.05, "volatility": 0.1, "sharpe_ratio": 0.3},
+            "allocations": [],
+            "currency": "JPY",
+        }
+
+    async def _slow_optimize(self, *args, **kwargs):
+        await asyncio.sleep(0.02)
+        return self._portfolio()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_optimize_once(self, client):
+        optimize = AsyncMock(side_effect=self._slow_optimize)
+        with patch.object(PortfolioOptimizer, "optimize", optimize):
+            responses = await asyncio.gather(*(
+                client.post("/api/v1/portfolios/generate", json=self.REQUEST) for _ in range(5)
+            ))
+
+        assert [r.status_code for r in responses] == [200] * 5
+        assert optimize.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_shared(self, client):
+        optimize = AsyncMock(side_effect=self._slow_optimize)
+        with patch.object(PortfolioOptimizer, "optimize", optimize):
+            await asyncio.gather(
+                client.post("/api/v1/portfolios/generate", json=self.REQUEST),
+                client.post("/api/v1/portfolios/generate", json={**self.REQUEST, "investment_amount": 100}),
+            )
+
+        assert optimize.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_error_reaches_every_request(self, client):
+        async def fail(*args, **kwargs):
+            await asyncio.sleep(0.02)
+            raise ValueError("対象資産が不足しています。")
+
+        optimize = AsyncMock(side_effect=fail)
+        with patch.object(PortfolioOptimizer, "optimize", optimize):
+            responses = await asyncio.gather(*(
+                client.post("/api/v1/portfolios/generate", json=self.REQUEST) for _ in range(3)
+            ))
+
+        assert [r.status_code for r in responses] == [400] * 3
+        assert optimize.await_count == 1
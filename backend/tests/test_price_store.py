@@ -0,0 +1,188 @@
+"""Tests for the in-process price matrix store."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.app.services.price_store import PriceMatrixStore
+
+
+def _result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _price_rows():
+    """(asset_id, date, close, adj_close) rows ordered by asset_id, date."""
+    return [
+        (1, date(2024, 1, 2), Decimal("100"), Decimal("99")),
+        (1, date(2024, 1, 3), Decimal("101"), None),
+        (1, date(2024, 1, 4), Decimal("102"), Decimal("0")),
+        (2, date(2024, 1, 3), Decimal("50"), Decimal("50")),
+        (2, date(2024, 1, 5), Decimal("51"), Decimal("51")),
+    ]
+
+
+class TestPriceMatrixStore:
+    @pytest.mark.asyncio
+    async def test_get_prices_builds_matrix(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+
+        df = await store.get_prices(session, {1: "A", 2: "B"})
+
+        assert list(df.columns) == ["A", "B"]
+        assert len(df) == 4
+        # adj_close preferred; missing or zero falls back to close
+        assert df["A"].tolist()[:3] == [99.0, 101.0, 102.0]
+        assert np.isnan(df.loc["2024-01-02", "B"])
+        assert df.loc["2024-01-05", "B"] == 51.0
+
+    @pytest.mark.asyncio
+    async def test_second_request_hits_memory(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+
+        await store.get_prices(session, {1: "A", 2: "B"})
+        await store.get_prices(session, {1: "A"}, date(2024, 1, 3), date(2024, 1, 4))
+
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_slice_drops_dates_without_requested_assets(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+        await store.get_prices(session, {1: "A", 2: "B"})
+
+        df = await store.get_prices(session, {2: "B"})
+        assert df.index.strftime("%Y-%m-%d").tolist() == ["2024-01-03", "2024-01-05"]
+
+        df = await store.get_prices(session, {1: "A"}, start_date=date(2024, 1, 3))
+        assert df.index.strftime("%Y-%m-%d").tolist() == ["2024-01-03", "2024-01-04"]
+
+    @pytest.mark.asyncio
+    async def test_contiguous_slice_is_a_view(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+
+        df = await store.get_prices(session, {1: "A", 2: "B"})
+        assert np.shares_memory(df.to_numpy(), store._matrix)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_only_changed_assets(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+        await store.get_prices(session, {1: "A", 2: "B"})
+
+        store.invalidate([2])
+        session.execute.return_value = _result([
+            (2, date(2024, 1, 3), Decimal("50"), Decimal("50")),
+            (2, date(2024, 1, 5), Decimal("51"), Decimal("51")),
+            (2, date(2024, 1, 8), Decimal("52"), Decimal("52")),
+        ])
+        df = await store.get_prices(session, {1: "A", 2: "B"})
+
+        load_stmt = session.execute.await_args.args[0]
+        assert load_stmt.compile().params["asset_id_1"] == [2]
+        assert df.loc["2024-01-08", "B"] == 52.0
+        assert df.loc["2024-01-02", "A"] == 99.0
+
+    @pytest.mark.asyncio
+    async def test_refresh_without_changes_keeps_version(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+        await store.get_prices(session, {1: "A", 2: "B"})
+
+        store.refresh_seconds = 0
+        prices = _result([(1, date(2024, 1, 4)), (2, date(2024, 1, 5)), (3, None)])
+        indicators = _result([("us_treasury_10y", date(2024, 1, 5))])
+        session.execute.side_effect = [prices, indicators, prices, indicators]
+        version = await store.refresh(session)
+
+        assert await store.refresh(session) == version
+        assert not store._stale
+
+    def test_invalidate_bumps_version(self):
+        store = PriceMatrixStore(refresh_seconds=3600)
+        store.invalidate([1])
+        assert store.version == 1
+
+    @pytest.mark.asyncio
+    async def test_watermark_check_detects_new_rows(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+        await store.get_prices(session, {1: "A", 2: "B"})
+        version = store.version
+
+        store.refresh_seconds = 0
+        session.execute.side_effect = [
+            # watermark query: asset 1 unchanged, asset 2 gained a row
+            _result([(1, date(2024, 1, 4)), (2, date(2024, 1, 8))]),
+            _result([]),
+            _result([
+                (2, date(2024, 1, 3), Decimal("50"), Decimal("50")),
+                (2, date(2024, 1, 5), Decimal("51"), Decimal("51")),
+                (2, date(2024, 1, 8), Decimal("52"), Decimal("52")),
+            ]),
+        ]
+        df = await store.get_prices(session, {1: "A", 2: "B"})
+
+        assert df.loc["2024-01-08", "B"] == 52.0
+        assert store.version > version
+        load_stmt = session.execute.await_args.args[0]
+        assert load_stmt.compile().params["asset_id_1"] == [2]
+
+    @pytest.mark.asyncio
+    async def test_watermark_query_is_a_per_asset_max(self):
+        session = AsyncMock()
+        session.execute.return_value = _result([])
+        store = PriceMatrixStore(refresh_seconds=0)
+
+        await store.refresh(session)
+
+        sql = str(session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "max(asset_prices.date)" in sql
+        assert "WHERE asset_prices.asset_id = assets.id" in sql
+        assert "count" not in sql
+        assert "GROUP BY" not in sql
+
+    @pytest.mark.asyncio
+    async def test_new_indicator_observation_bumps_version_only(self):
+        session = AsyncMock()
+        session.execute.return_value = _result(_price_rows())
+        store = PriceMatrixStore(refresh_seconds=3600)
+        await store.get_prices(session, {1: "A", 2: "B"})
+
+        store.refresh_seconds = 0
+        prices = _result([(1, date(2024, 1, 4)), (2, date(2024, 1, 5))])
+        session.execute.side_effect = [
+            prices, _result([("us_treasury_10y", date(2024, 1, 4))]),
+            prices, _result([("us_treasury_10y", date(2024, 1, 5))]),
+        ]
+        version = await store.refresh(session)
+
+        assert await store.refresh(session) == version + 1
+        assert not store._stale
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY economic_indicators.indicator_type" in sql
+
+    @pytest.mark.asyncio
+    async def test_unknown_assets_return_empty(self):
+        session = AsyncMock()
+        session.execute.return_value = _result([])
+        store = PriceMatrixStore(refresh_seconds=3600)
+
+        df = await store.get_prices(session, {99: "X"})
+        assert df.empty
@@ -0,0 +1,136 @@
+"""Tests for the resampled (Michaud) minimum-variance solver."""
+
+import numpy as np
+import pytest
+
+from src.app.services.efficient_frontier import FrontierProblem
+from src.app.services.factor_model import FactorCovariance, fit_statistical_factors
+from src.app.services.resampling import (
+    _matrix_root,
+    average_weights,
+    resample_covariance,
+    resampled_min_variance,
+    sample_chunks,
+    solve_resampled,
+)
+
+
+def _returns(n_days: int = 1000, n_assets: int = 8, seed: int = 0) -> np.ndarray:
+    """Daily returns with one common factor and a spread of volatilities."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0, 0.006, (n_days, 1))
+    return 0.0003 + market * rng.uniform(0.5, 1.5, n_assets) + rng.normal(0.0, 0.01, (n_days, n_assets))
+
+
+def _cov(n_assets: int = 8, seed: int = 0) -> np.ndarray:
+    return np.cov(_returns(n_assets=n_assets, seed=seed), rowvar=False) * 252
+
+
+class TestResampleCovariance:
+    def test_draws_average_to_the_covariance(self):
+        cov = _cov()
+        rng = np.random.default_rng(1)
+        draws = np.array([resample_covariance(cov, _matrix_root(cov), 99, rng) for _ in range(4000)])
+
+        np.testing.assert_allclose(draws.mean(axis=0), cov, atol=0.02 * np.abs(cov).max())
+        # Wishart: Var(Sᵢⱼ) = (Σᵢⱼ² + ΣᵢᵢΣⱼⱼ) / df
+        expected_var = (cov**2 + np.outer(np.diag(cov), np.diag(cov))) / 99
+        np.testing.assert_allclose(draws.var(axis=0), expected_var, rtol=0.15)
+
+    def test_fewer_observations_than_assets(self):
+        cov = _cov()
+        rng = np.random.default_rng(2)
+        draw = resample_covariance(cov, _matrix_root(cov), 4, rng)
+
+        assert np.linalg.matrix_rank(draw) == 4
+        draws = np.array([resample_covariance(cov, _matrix_root(cov), 4, rng) for _ in range(20000)])
+        np.testing.assert_allclose(draws.mean(axis=0), cov, atol=0.05 * np.abs(cov).max())
+
+    def test_factor_model_keeps_loadings(self):
+        model = fit_statistical_factors(_returns(n_assets=12), [f"S{i}" for i in range(12)], 3)
+        rng = np.random.default_rng(3)
+        draws = [resample_covariance(model, _matrix_root(model.factor_cov), 249, rng) for _ in range(2000)]
+
+        assert all(isinstance(d, FactorCovariance) and d.loadings is model.loadings for d in draws)
+        np.testing.assert_allclose(np.mean([d.specific_var for d in draws], axis=0), model.specific_var, rtol=0.02)
+        np.testing.assert_allclose(
+            np.mean([d.factor_cov for d in draws], axis=0), model.factor_cov, atol=0.02 * model.factor_cov.max(),
+        )
+
+
+class TestFrontierProblemUpdate:
+    @pytest.mark.parametrize("factor", [False, True])
+    def test_update_matches_fresh_problem(self, factor):
+        symbols = [f"S{i}" for i in range(8)]
+        mu = np.linspace(0.02, 0.09, 8)
+        if factor:
+            first = fit_statistical_factors(_returns(seed=0), symbols, 2)
+            second = FactorCovariance(symbols, first.loadings, first.factor_cov * 1.5, first.specific_var[::-1].copy())
+        else:
+            first, second = _cov(seed=0), _cov(seed=1)
+
+        problem = FrontierProblem(mu, first, 0.4)
+        problem.solve(-np.inf)
+        problem.update_covariance(second)
+
+        np.testing.assert_allclose(problem.solve(-np.inf), FrontierProblem(mu, second, 0.4).solve(-np.inf), atol=1e-4)
+
+
+class TestResampledMinVariance:
+    def test_weights_are_a_feasible_average(self):
+        cov = _cov()
+        weights = solve_resampled(np.zeros(8), cov, 0.3, 100, 250)
+
+        assert weights.sum() == pytest.approx(1.0)
+        assert weights.min() >= 0
+        assert weights.max() <= 0.3 + 1e-6
+
+    def test_deterministic_for_a_seed(self):
+        cov = _cov()
+
+        first = solve_resampled(np.zeros(8), cov, 0.3, 60, 250, seed=7)
+        np.testing.assert_array_equal(first, solve_resampled(np.zeros(8), cov, 0.3, 60, 250, seed=7))
+        assert not np.allclose(first, solve_resampled(np.zeros(8), cov, 0.3, 60, 250, seed=8))
+
+    def test_chunks_combine_to_sequential_result(self):
+        cov = _cov()
+        chunks = sample_chunks(120, seed=3)
+
+        assert [count for count, _ in chunks] == [50, 50, 20]
+        results = [resampled_min_variance(np.zeros(8), cov, 0.3, count, 250, seed) for count, seed in chunks]
+        np.testing.assert_allclose(average_weights(results, 120), solve_resampled(np.zeros(8), cov, 0.3, 120, 250, 3))
+
+    def test_converges_to_point_estimate_with_long_history(self):
+        cov = _cov()
+        point = FrontierProblem(np.zeros(8), cov, 0.3).solve(-np.inf)
+
+        short = solve_resampled(np.zeros(8), cov, 0.3, 100, 60)
+        long = solve_resampled(np.zeros(8), cov, 0.3, 100, 100_000)
+
+        assert np.abs(long - point).sum() < 0.05
+        assert np.abs(short - point).sum() > np.abs(long - point).sum()
+
+    def test_more_stable_than_point_estimate_across_windows(self):
+        # Four pairs of near-substitute assets: the point estimate shifts weight within a pair on noise
+        rng = np.random.default_rng(0)
+        returns = np.repeat(rng.normal(0.0, 0.01, (1100, 4)), 2, axis=1) + rng.normal(0.0, 0.002, (1100, 8))
+        before = np.cov(returns[:1000], rowvar=False) * 252
+        after = np.cov(returns[100:], rowvar=False) * 252
+
+        def point(cov):
+            return FrontierProblem(np.zeros(8), cov, 0.5).solve(-np.inf)
+
+        def resampled(cov):
+            return solve_resampled(np.zeros(8), cov, 0.5, 500, 1000)
+
+        point_turnover = np.abs(point(after) - point(before)).sum()
+        resampled_turnover = np.abs(resampled(after) - resampled(before)).sum()
+        assert resampled_turnover < 0.9 * point_turnover
+
+    def test_needs_two_observations(self):
+        with pytest.raises(ValueError):
+            resampled_min_variance(np.zeros(8), _cov(), 0.3, 10, 1)
+
+    def test_no_solved_draws_raises(self):
+        with pytest.raises(ValueError):
+            average_weights([(np.zeros(8), 0)], 50)
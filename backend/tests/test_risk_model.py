@@ -0,0 +1,111 @@
+"""Tests for risk-model estimation and caching."""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import CovarianceShrinkage, expected_returns
+
+from src.app.services.factor_model import FactorCovariance
+from src.app.services.portfolio_optimizer import solve_portfolio
+from src.app.services.risk_model import RiskModelCache, estimate_risk_model
+
+
+def _prices(n_days: int = 300, symbols=("A", "B", "C", "D"), seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.01, (n_days, len(symbols)))
+    index = pd.bdate_range("2022-01-03", periods=n_days)
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=index, columns=list(symbols))
+
+
+def _estimate(prices: pd.DataFrame):
+    return estimate_risk_model(prices.to_numpy(), prices.columns.tolist())
+
+
+def _inline_run():
+    """compute_executor.run stand-in that counts calls and runs the job inline."""
+    return AsyncMock(side_effect=lambda func, *args: func(*args))
+
+
+class TestEstimateRiskModel:
+    def test_matches_pypfopt_from_prices(self):
+        prices = _prices()
+        model = _estimate(prices)
+        frame = prices.reset_index(drop=True)
+        returns = frame.pct_change().dropna()
+
+        np.testing.assert_allclose(model.mu, expected_returns.mean_historical_return(frame))
+        np.testing.assert_allclose(model.cov, CovarianceShrinkage(frame).ledoit_wolf())
+        np.testing.assert_allclose(model.sample_cov, returns.cov() * 252)
+        np.testing.assert_allclose(model.mean_returns, returns.mean() * 252)
+        assert model.symbols == ["A", "B", "C", "D"]
+
+    @pytest.mark.parametrize("strategy", ["min_volatility", "hrp", "max_sharpe", "risk_parity", "equal_weight"])
+    def test_every_strategy_solves_from_model(self, strategy):
+        used, weights, metrics = solve_portfolio(strategy, _estimate(_prices()), 0.01, None)
+
+        assert used == strategy
+        assert abs(sum(weights.values()) - 1.0) < 1e-9
+        assert metrics["volatility"] > 0
+
+
+class TestRiskModelCache:
+    @pytest.mark.asyncio
+    async def test_reused_for_same_universe_window_and_version(self):
+        cache = RiskModelCache(4)
+        prices = _prices()
+        run = _inline_run()
+
+        with patch("src.app.services.risk_model.compute_executor.run", run):
+            first = await cache.get_or_estimate(prices, 1)
+            second = await cache.get_or_estimate(prices.copy(), 1)
+
+        assert second is first
+        assert run.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_new_version_window_or_universe_recomputes(self):
+        cache = RiskModelCache(4)
+        prices = _prices()
+        run = _inline_run()
+
+        with patch("src.app.services.risk_model.compute_executor.run", run):
+            await cache.get_or_estimate(prices, 1)
+            await cache.get_or_estimate(prices, 2)
+            await cache.get_or_estimate(prices.iloc[10:], 2)
+            await cache.get_or_estimate(prices[["A", "B"]], 2)
+
+        assert run.await_count == 4
+        assert len(cache) == 4
+
+    @pytest.mark.asyncio
+    async def test_factor_method_cached_separately(self):
+        cache = RiskModelCache(4)
+        prices = _prices()
+        run = _inline_run()
+
+        with patch("src.app.services.risk_model.compute_executor.run", run):
+            dense = await cache.get_or_estimate(prices, 1)
+            factor = await cache.get_or_estimate(prices, 1, "factor")
+            again = await cache.get_or_estimate(prices, 1, "factor")
+
+        assert run.await_count == 2
+        assert again is factor
+        assert isinstance(dense.cov, pd.DataFrame)
+        assert isinstance(factor.cov, FactorCovariance)
+        assert factor.symbols == dense.symbols == ["A", "B", "C", "D"]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        cache = RiskModelCache(2)
+        prices = _prices()
+        run = _inline_run()
+
+        with patch("src.app.services.risk_model.compute_executor.run", run):
+            await cache.get_or_estimate(prices, 1)
+            await cache.get_or_estimate(prices, 2)
+            await cache.get_or_estimate(prices, 3)
+            await cache.get_or_estimate(prices, 1)
+
+        assert run.await_count == 4
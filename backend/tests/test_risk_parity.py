@@ -0,0 +1,74 @@
+"""Tests for the Newton equal-risk-contribution solver."""
+
+import numpy as np
+import pytest
+
+from src.app.services.risk_parity import risk_contributions, solve_risk_parity
+
+
+def _factor_cov(n_assets: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(size=(n_assets, 3))
+    return loadings @ np.diag([0.04, 0.01, 0.005]) @ loadings.T + np.diag(rng.uniform(0.01, 0.09, n_assets))
+
+
+class TestSolveRiskParity:
+    def test_equal_risk_contributions(self):
+        cov = _factor_cov(20)
+        solution = solve_risk_parity(cov, tol=1e-10)
+
+        assert solution.converged
+        assert solution.residual <= 1e-10
+        np.testing.assert_allclose(risk_contributions(solution.weights, cov), 1 / 20, atol=1e-10)
+        assert solution.weights.sum() == pytest.approx(1.0)
+        assert np.all(solution.weights > 0)
+
+    def test_diagonal_covariance_is_inverse_volatility(self):
+        vols = np.array([0.1, 0.2, 0.4])
+        solution = solve_risk_parity(np.diag(vols**2))
+
+        expected = (1 / vols) / (1 / vols).sum()
+        np.testing.assert_allclose(solution.weights, expected, atol=1e-8)
+
+    def test_custom_budgets(self):
+        cov = _factor_cov(4)
+        budgets = np.array([0.4, 0.3, 0.2, 0.1])
+        solution = solve_risk_parity(cov, budgets=budgets)
+
+        np.testing.assert_allclose(risk_contributions(solution.weights, cov), budgets, atol=1e-8)
+
+    def test_warm_start_takes_fewer_iterations(self):
+        cov = _factor_cov(50)
+        cold = solve_risk_parity(cov)
+        # Yesterday's solution on a slightly different covariance
+        previous = solve_risk_parity(cov * (1 + 0.02 * np.eye(50)))
+        warm = solve_risk_parity(cov, x0=previous.weights)
+
+        assert warm.converged
+        assert warm.iterations < cold.iterations
+        np.testing.assert_allclose(warm.weights, cold.weights, atol=1e-8)
+
+    def test_warm_start_with_missing_assets(self):
+        cov = _factor_cov(5)
+        x0 = np.array([0.3, np.nan, 0.0, 0.2, 0.25])
+        solution = solve_risk_parity(cov, x0=x0)
+
+        assert solution.converged
+        np.testing.assert_allclose(solution.weights, solve_risk_parity(cov).weights, atol=1e-8)
+
+    def test_iteration_limit_reports_not_converged(self):
+        solution = solve_risk_parity(_factor_cov(30), tol=1e-14, max_iter=1)
+
+        assert solution.iterations == 1
+        assert not solution.converged
+        assert solution.residual > 1e-14
+
+    def test_zero_variance_rejected(self):
+        with pytest.raises(ValueError):
+            solve_risk_parity(np.diag([0.04, 0.0]))
+
+    def test_large_universe(self):
+        solution = solve_risk_parity(_factor_cov(1000))
+
+        assert solution.converged
+        assert solution.iterations <= 10
@@ -0,0 +1,124 @@
+"""Tests for the Monte Carlo simulator service and endpoint."""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.schemas.simulation import MAX_SIMULATION_PATHS
+from src.app.services.monte_carlo import project_parametric
+from src.app.services.risk_model import risk_model_cache
+from src.app.services.simulator import PortfolioSimulator
+
+ALLOCATIONS = [{"symbol": "A", "weight": 0.6}, {"symbol": "B", "weight": 0.4}]
+
+
+class TestPortfolioSimulator:
+    def setup_method(self):
+        risk_model_cache.clear()
+        dates = pd.bdate_range("2018-01-01", periods=1500)
+        rng = np.random.default_rng(11)
+        self.prices = pd.DataFrame(
+            100 * np.cumprod(1 + rng.normal(0.0004, 0.01, size=(1500, 3)), axis=0),
+            index=dates,
+            columns=["A", "B", "C"],
+        )
+        self.simulator = PortfolioSimulator(session=None)
+        self.simulator._get_price_matrix = AsyncMock(return_value=self.prices)
+
+    def teardown_method(self):
+        risk_model_cache.clear()
+
+    async def _run(self, **kwargs):
+        with patch("src.app.services.simulator.price_store.refresh", AsyncMock(return_value=1)):
+            return await self.simulator.run(ALLOCATIONS, horizon_years=5, n_paths=2000, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_parametric_uses_portfolio_moments(self):
+        result = await self._run(seed=1)
+
+        returns = self.prices[["A", "B"]].pct_change().dropna() @ np.array([0.6, 0.4])
+        assert result["method"] == "parametric"
+        assert [b["year"] for b in result["bands"]] == [1, 2, 3, 4, 5]
+        assert result["assumptions"]["expected_return"] == pytest.approx(returns.mean() * 252, abs=1e-4)
+        assert result["assumptions"]["volatility"] == pytest.approx(returns.std() * np.sqrt(252), rel=0.05)
+        assert result["assumptions"]["history_end"] == "2023-09-29"
+        assert len(risk_model_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_bootstrap_matches_history(self):
+        result = await self._run(method="bootstrap", block_days=10, seed=2)
+
+        returns = self.prices[["A", "B"]].pct_change().dropna() @ np.array([0.6, 0.4])
+        assert result["method"] == "bootstrap"
+        assert result["assumptions"]["volatility"] == pytest.approx(returns.std() * np.sqrt(252), abs=1e-4)
+        assert result["bands"][0]["p5"] < 1_000_000 < result["bands"][0]["p95"]
+
+    @pytest.mark.asyncio
+    async def test_seed_makes_results_repeatable(self):
+        first = await self._run(method="bootstrap", seed=3)
+        second = await self._run(method="bootstrap", seed=3)
+
+        assert first == second
+        assert first["seed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_factor_covariance(self):
+        result = await self._run(covariance_method="factor", seed=4)
+
+        assert result["assumptions"]["volatility"] > 0
+        assert len(result["bands"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbols_rejected(self):
+        with pytest.raises(ValueError):
+            await self.simulator.run([{"symbol": "UNKNOWN", "weight": 1.0}])
+
+    @pytest.mark.asyncio
+    async def test_short_history_rejected(self):
+        self.simulator._get_price_matrix = AsyncMock(return_value=self.prices.iloc[:30])
+
+        with pytest.raises(ValueError):
+            await self.simulator.run(ALLOCATIONS)
+
+
+class TestSimulateEndpoint:
+    @pytest.mark.asyncio
+    async def test_returns_bands(self, client):
+        result = {
+            "method": "parametric",
+            "n_paths": 1000,
+            "horizon_years": 3,
+            "initial_investment": 1_000_000,
+            "seed": 1,
+            "assumptions": {
+                "expected_return": 0.05, "volatility": 0.12, "history_start": "2015-01-05", "history_end": "2024-12-30",
+            },
+            "bands": project_parametric(0.05, 0.12, 1_000_000, 3, 1000, 1),
+        }
+        run = AsyncMock(return_value=result)
+        with patch.object(PortfolioSimulator, "run", run):
+            response = await client.post("/api/v1/portfolios/simulate", json={
+                "allocations": [{"symbol": "SPY", "weight": 1.0}], "horizon_years": 3, "n_paths": 1000, "seed": 1,
+            })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [b["year"] for b in body["bands"]] == [1, 2, 3]
+        assert body["disclaimer"]
+        assert run.await_args.kwargs["seed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_too_many_paths(self, client):
+        response = await client.post("/api/v1/portfolios/simulate", json={
+            "allocations": [{"symbol": "SPY", "weight": 1.0}], "n_paths": MAX_SIMULATION_PATHS + 1,
+        })
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_unknown_method(self, client):
+        response = await client.post("/api/v1/portfolios/simulate", json={
+            "allocations": [{"symbol": "SPY", "weight": 1.0}], "method": "magic",
+        })
+        assert response.status_code == 422
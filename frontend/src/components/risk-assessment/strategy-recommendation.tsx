@@ -21,6 +21,7 @@ const STRATEGY_LABELS: Record<string, string> = {
   max_sharpe: "積極型",
   risk_parity: "リスクパリティ",
   equal_weight: "均等配分",
+  resampled: "リサンプリング安定型",
 };
 
 const TOLERANCE_LABELS: Record<string, string> = {